@@ -0,0 +1,296 @@
+"""
+Shared fixtures for the benchmark suite.
+
+Each benchmark runs through the ``bench`` fixture, which times the call with
+pytest-benchmark, measures peak memory of one extra call, and compares both
+against ``baselines.json``. A benchmark fails when throughput drops, or peak
+memory grows, by more than ``--regression-threshold`` (default 25%).
+
+Throughput is compared relative to a short reference workload timed just
+before every round: each round scores reference time / round time, and the
+median score is checked against the baseline's. Pairing each round with its
+own reference absorbs both the machine's speed and load that comes and goes
+during the session, which a single calibration at the start could not; on a
+busy single-core runner the median score varies by about 10% between runs,
+against about 30% for raw ops/s. Baselines are still best recorded, with
+``--update-baselines``, on the machine that enforces them.
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import io
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from curb_sign_parser.providers.base import LLMProvider
+from curb_sign_parser.providers.registry import register_provider
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+# Peak memory growth below this is allocator and thread-scheduling noise
+MEMORY_SLACK_MB = 10.0
+
+# Rounds for benchmarks that don't fix their own: enough to fill about a
+# second, within these bounds
+MIN_ROUNDS = 5
+MAX_ROUNDS = 200
+ROUNDS_SECONDS = 1.0
+
+def pytest_addoption(parser):
+    group = parser.getgroup("curb-sign-parser benchmarks")
+    group.addoption(
+        "--update-baselines", action="store_true",
+        help="Record this run's throughput and peak memory as the new baselines"
+    )
+    group.addoption(
+        "--regression-threshold", type=float, default=0.25,
+        help="Allowed fractional throughput drop / peak memory growth (default 0.25)"
+    )
+
+def _proc_status_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's peak RSS counter for this process (Linux only)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+def _release_free_memory() -> None:
+    """Return freed heap pages to the OS so reused memory shows up in RSS again."""
+    gc.collect()
+    Image.core.clear_cache()
+    libc_name = ctypes.util.find_library("c")
+    if libc_name:
+        libc = ctypes.CDLL(libc_name)
+        if hasattr(libc, "malloc_trim"):
+            libc.malloc_trim(0)
+
+def peak_memory_mb(func, *args, **kwargs) -> float:
+    """
+    Additional memory in MB used at the peak of one call.
+
+    On Linux this is resident memory, which includes Pillow's pixel buffers;
+    elsewhere it falls back to tracemalloc, which only sees Python and NumPy
+    allocations.
+    """
+    _release_free_memory()
+    if sys.platform.startswith("linux") and _reset_peak_rss():
+        before = _proc_status_kb("VmRSS")
+        func(*args, **kwargs)
+        return max(0.0, (_proc_status_kb("VmHWM") - before) / 1024)
+
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024 / 1024
+
+_REFERENCE_MATRIX = np.random.default_rng(0).random((64, 64))
+
+def reference_workload(repeat: int = 3) -> float:
+    """Seconds for a fixed sub-millisecond mixed Python/NumPy workload (fastest of ``repeat``)."""
+    best = float("inf")
+    for _ in range(repeat):
+        matrix = _REFERENCE_MATRIX
+        start = time.perf_counter()
+        total = 0
+        for i in range(5_000):
+            total += i % 7
+        for _ in range(5):
+            matrix = np.tanh(matrix @ matrix.T / 64)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+@pytest.fixture(scope="session")
+def baselines(request):
+    """
+    Stored baselines, keyed by benchmark name.
+
+    Each entry holds raw ops/s for reference, and the median relative score
+    that the gate actually compares.
+    """
+    data = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    yield data
+    if request.config.getoption("--update-baselines"):
+        BASELINES_PATH.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+@pytest.fixture
+def bench(request, benchmark, baselines):
+    """
+    Benchmark ``func(*args, **kwargs)`` and enforce the stored baseline.
+
+    Pass ``rounds`` for slow calls to run a fixed number of rounds instead of
+    sizing them from one timed call. The reference workload runs in each
+    round's setup, outside the timed region.
+    """
+    def run(func, *args, rounds=None, **kwargs):
+        if rounds is None:
+            start = time.perf_counter()
+            func(*args, **kwargs)
+            elapsed = time.perf_counter() - start + reference_workload()
+            rounds = min(MAX_ROUNDS, max(MIN_ROUNDS, int(ROUNDS_SECONDS / elapsed)))
+
+        reference_times = []
+
+        def time_reference():
+            reference_times.append(reference_workload())
+
+        result = benchmark.pedantic(
+            func, args=args, kwargs=kwargs, setup=time_reference,
+            rounds=rounds, iterations=1, warmup_rounds=1
+        )
+
+        if benchmark.disabled:
+            return result
+
+        # Raw ops/s from the fastest round, reported alongside the score
+        ops_per_sec = 1.0 / benchmark.stats.stats.min
+        # The first reference belongs to the warmup round
+        relative = statistics.median(
+            ref / duration
+            for ref, duration in zip(reference_times[1:], benchmark.stats.stats.data)
+        )
+        peak_mb = peak_memory_mb(func, *args, **kwargs)
+        benchmark.extra_info.update(
+            ops_per_sec=ops_per_sec, peak_mb=peak_mb, relative_score=relative
+        )
+
+        name = request.node.name
+        if request.config.getoption("--update-baselines"):
+            baselines[name] = {
+                "ops_per_sec": round(ops_per_sec, 3),
+                "peak_mb": round(peak_mb, 1),
+                "relative_score": float(f"{relative:.4g}"),
+            }
+            return result
+
+        baseline = baselines.get(name)
+        if baseline is None:
+            return result
+
+        threshold = request.config.getoption("--regression-threshold")
+        failures = []
+        min_relative = baseline["relative_score"] * (1 - threshold)
+        if relative < min_relative:
+            failures.append(
+                f"relative throughput {relative:.4g} is below {min_relative:.4g} "
+                f"(baseline {baseline['relative_score']:.4g}; {ops_per_sec:.3f} ops/s, "
+                f"baseline {baseline['ops_per_sec']} ops/s)"
+            )
+        max_peak = baseline["peak_mb"] * (1 + threshold) + MEMORY_SLACK_MB
+        if peak_mb > max_peak:
+            failures.append(
+                f"peak memory {peak_mb:.1f}MB exceeds {max_peak:.1f}MB "
+                f"(baseline {baseline['peak_mb']}MB)"
+            )
+        if failures:
+            pytest.fail(f"{name} regressed: " + "; ".join(failures))
+        return result
+
+    return run
+
+def make_sign_image(megapixels: float) -> Image.Image:
+    """Synthetic sign photo: smooth background gradient with a bordered sign panel."""
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    pixels[..., 0] = (x * 0.6 + y * 0.2).astype(np.uint8)
+    pixels[..., 1] = (x * 0.3 + y * 0.5).astype(np.uint8)
+    pixels[..., 2] = (255 - y * 0.7).astype(np.uint8)
+    img = Image.fromarray(pixels)
+
+    draw = ImageDraw.Draw(img)
+    left, top = width // 4, height // 5
+    right, bottom = width * 3 // 4, height * 4 // 5
+    draw.rectangle([left, top, right, bottom], fill="white", outline="red", width=max(4, width // 100))
+    line_height = (bottom - top) // 8
+    for row in range(1, 7):
+        y0 = top + row * line_height
+        draw.rectangle(
+            [left + width // 20, y0, right - width // 20 - row * width // 60, y0 + line_height // 3],
+            fill="black"
+        )
+    return img
+
+@pytest.fixture(scope="session")
+def encoded_images():
+    """Encode each (format, megapixels) pair once per session."""
+    cache = {}
+
+    def get(fmt: str, megapixels: float) -> bytes:
+        key = (fmt, megapixels)
+        if key not in cache:
+            if fmt == "HEIF":
+                import pillow_heif
+                pillow_heif.register_heif_opener()
+            buffer = io.BytesIO()
+            make_sign_image(megapixels).save(buffer, format=fmt)
+            cache[key] = buffer.getvalue()
+        return cache[key]
+
+    return get
+
+class LatencyProvider(LLMProvider):
+    """Offline provider returning a canned response after a fixed delay."""
+
+    response = "{}"
+
+    def __init__(self, api_key: str, latency: float = 0.05, **kwargs):
+        super().__init__(api_key, **kwargs)
+        self.latency = latency
+
+    @property
+    def max_image_size(self) -> int:
+        return 5 * 1024 * 1024
+
+    def process_image(self, image_data: bytes) -> str:
+        time.sleep(self.latency)
+        return self.response
+
+register_provider("bench-latency", LatencyProvider)
+
+def synthetic_response(policies: int) -> dict:
+    """Large LLM response mixing the legacy and current field layouts."""
+    days = ["MONDAY", "TUE", "wednesday", "THU", "FRI", "SAT", "sun"]
+    result = []
+    for i in range(policies):
+        policy = {
+            "time_spans": [
+                {"days": days[: 1 + i % 7], "start_time": f"{7 + i % 5:02d}:00", "end_time": "18:00"},
+                {"days": ["SAT", "SUN"], "start_time": None, "end_time": None},
+            ]
+        }
+        if i % 3:
+            policy["rules"] = [
+                {"activity": "parking", "max_stay": 60 * (1 + i % 4)},
+                {
+                    "activity": "paid_parking",
+                    "payment": {"rate": 2.5 + i % 3, "rate_unit": "hour"},
+                    "user_classes": ["permit"] if i % 5 == 0 else []
+                },
+            ]
+        else:
+            policy["activity"] = "no_parking"
+        result.append(policy)
+    return {"policies": result}
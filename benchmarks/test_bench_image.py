@@ -0,0 +1,30 @@
+import pytest
+
+from curb_sign_parser.processors.image_processor import ImageProcessor
+
+FORMATS = ["JPEG", "PNG", "HEIF", "WEBP"]
+MEGAPIXELS = [1, 12, 48]
+
+
+@pytest.mark.parametrize("megapixels", MEGAPIXELS)
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_process_image(bench, encoded_images, fmt, megapixels):
+    """Preprocess one photo: decode, resize to 2048px, re-encode as JPEG."""
+    data = encoded_images(fmt, megapixels)
+    processor = ImageProcessor()
+
+    rounds = {12: 5, 48: 5}.get(megapixels)
+    image_bytes, _ = bench(processor.process_image, data, rounds=rounds)
+
+    assert image_bytes[:2] == b"\xff\xd8"
+
+
+@pytest.mark.parametrize("megapixels", [12])
+def test_process_image_adaptive(bench, encoded_images, megapixels):
+    """Preprocess with adaptive quality search against a 500KB budget."""
+    data = encoded_images("JPEG", megapixels)
+    processor = ImageProcessor(adaptive=True, target_size=500 * 1024)
+
+    image_bytes, _ = bench(processor.process_image, data, rounds=5)
+
+    assert len(image_bytes) <= 500 * 1024
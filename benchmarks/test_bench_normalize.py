@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from curb_sign_parser import CurbSignParser
+from curb_sign_parser.models.data_models import SignData
+from curb_sign_parser.normalization import build_sign_data
+
+from conftest import synthetic_response
+
+LOCATION = {"type": "Point", "coordinates": [-73.985, 40.758]}
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return CurbSignParser(api_key="bench", provider="bench-latency")
+
+
+@pytest.fixture(scope="module")
+def response():
+    return synthetic_response(policies=1000)
+
+
+def test_normalize_time_spans(bench, parser, response):
+    spans = [span for policy in response["policies"] for span in policy["time_spans"]]
+    result = bench(parser._normalize_time_spans, spans)
+    assert len(result) == len(spans)
+
+
+def test_normalize_rules(bench, parser, response):
+    rules = [rule for policy in response["policies"] for rule in policy.get("rules", [policy])]
+    result = bench(lambda: [parser._normalize_rules(rule) for rule in rules])
+    assert len(result) == len(rules)
+
+
+def test_to_cds(bench, parser, response):
+    result = bench(parser._to_cds, response, LOCATION)
+    assert len(result["policies"]) == 1000
+
+
+def test_sign_data_construction(bench, parser, response):
+    cds_data = parser._to_cds(response, LOCATION)
+    result = bench(lambda: SignData(**cds_data))
+    assert len(result.policies) == 1000
+
+
+def test_build_sign_data(bench, parser, response):
+    """JSON parse, normalization and validation of a 1000-policy response."""
+    llm_response = json.dumps(response)
+    result = bench(parser._build_sign_data, llm_response, LOCATION)
+    assert len(result.policies) == 1000
+
+
+def test_trusted_sign_data_construction(bench, parser, response):
+    cds_data = parser._to_cds(response, LOCATION)
+    result = bench(build_sign_data, cds_data)
+    assert len(result.policies) == 1000
@@ -0,0 +1,25 @@
+import pytest
+
+from curb_sign_parser import CurbSignParser
+
+# Simulated provider round trip
+LATENCY = 0.05
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return CurbSignParser(api_key="bench", provider="bench-latency", latency=LATENCY)
+
+
+def test_parse_sign(bench, parser, encoded_images):
+    """One image end to end: preprocessing plus a mocked provider call."""
+    data = encoded_images("JPEG", 12)
+    result = bench(parser.parse_sign, data, rounds=5)
+    assert result.policies == []
+
+
+def test_parse_batch(bench, parser, encoded_images):
+    """32 images on 8 workers; throughput should approach workers / latency."""
+    images = [encoded_images("JPEG", 1)] * 32
+    results = bench(parser.parse_batch, images, max_workers=8, rounds=3)
+    assert len(results) == 32
@@ -5,20 +5,8 @@ A Python package for parsing parking sign images into CDS-compliant structured d
 various multi-modal LLM providers.
 """
 
-from .models.data_models import (
-    CurbPolicy,
-    Location,
-    Rate,
-    RateUnitPeriod,
-    RegulationType,
-    Rule,
-    SignData,
-    TimeSpan,
-)
-from .parser import CurbSignParser
-from .providers.base import LLMProvider
-from .providers.claude import ClaudeProvider
-from .providers.gpt4 import GPT4VisionProvider
+from typing import TYPE_CHECKING
+
 from .utils.exceptions import (
     APIError,
     ConfigurationError,
@@ -30,6 +18,90 @@ from .utils.exceptions import (
     ValidationError,
 )
 
+if TYPE_CHECKING:
+    from .async_parser import AsyncCurbSignParser
+    from .feed import FeedBuilder
+    from .models.compact import CompactCorpus
+    from .models.data_models import (
+        CurbPolicy,
+        Location,
+        Rate,
+        RateUnitPeriod,
+        RegulationType,
+        Rule,
+        SignData,
+        TimeSpan,
+    )
+    from .models.usage import TokenUsage
+    from .parser import CurbSignParser
+    from .processors.image_processor import PerceptualHashIndex
+    from .providers.base import LLMProvider, RetryPolicy
+    from .providers.claude import ClaudeProvider
+    from .providers.gpt4 import GPT4VisionProvider
+    from .providers.rate_limit import AdaptiveConcurrency, RateLimiter
+    from .providers.transport import TransportConfig
+    from .query.spatial_index import RegulationIndex, RegulationMatch
+    from .storage.columnar import ColumnarReader, write_parquet
+    from .storage.result_cache import CacheStats, ResultCache
+    from .storage.segment_store import SegmentStore, StoreStats
+    from .utils.instrumentation import (
+        CallbackInstrumentation,
+        Instrumentation,
+        MetricsInstrumentation,
+        OpenTelemetryInstrumentation,
+    )
+
+# Public names imported on first access (PEP 562), so ``import curb_sign_parser``
+# doesn't load Pillow, NumPy, pydantic or any provider SDK until they're used
+_LAZY_IMPORTS = {
+    "CurbSignParser": ".parser",
+    "AsyncCurbSignParser": ".async_parser",
+    "RegulationType": ".models.data_models",
+    "RateUnitPeriod": ".models.data_models",
+    "Rate": ".models.data_models",
+    "TimeSpan": ".models.data_models",
+    "Rule": ".models.data_models",
+    "CurbPolicy": ".models.data_models",
+    "Location": ".models.data_models",
+    "SignData": ".models.data_models",
+    "CompactCorpus": ".models.compact",
+    "TokenUsage": ".models.usage",
+    "FeedBuilder": ".feed",
+    "PerceptualHashIndex": ".processors.image_processor",
+    "RegulationIndex": ".query.spatial_index",
+    "RegulationMatch": ".query.spatial_index",
+    "ResultCache": ".storage.result_cache",
+    "CacheStats": ".storage.result_cache",
+    "ColumnarReader": ".storage.columnar",
+    "write_parquet": ".storage.columnar",
+    "SegmentStore": ".storage.segment_store",
+    "StoreStats": ".storage.segment_store",
+    "LLMProvider": ".providers.base",
+    "RetryPolicy": ".providers.base",
+    "ClaudeProvider": ".providers.claude",
+    "GPT4VisionProvider": ".providers.gpt4",
+    "TransportConfig": ".providers.transport",
+    "RateLimiter": ".providers.rate_limit",
+    "AdaptiveConcurrency": ".providers.rate_limit",
+    "Instrumentation": ".utils.instrumentation",
+    "CallbackInstrumentation": ".utils.instrumentation",
+    "MetricsInstrumentation": ".utils.instrumentation",
+    "OpenTelemetryInstrumentation": ".utils.instrumentation",
+}
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 __version__ = "0.1.0"
 __author__ = "Hersh Gupta"
 __email__ = "h.v.gupta@outlook.com"
@@ -37,6 +109,7 @@ __email__ = "h.v.gupta@outlook.com"
 # Public API
 __all__ = [
     "CurbSignParser",
+    "AsyncCurbSignParser",
     # Data Models
     "RegulationType",
     "RateUnitPeriod",
@@ -46,10 +119,35 @@ __all__ = [
     "CurbPolicy",
     "Location",
     "SignData",
+    "CompactCorpus",
+    "TokenUsage",
+    # CDS feeds
+    "FeedBuilder",
+    # Image processing
+    "PerceptualHashIndex",
+    # Queries
+    "RegulationIndex",
+    "RegulationMatch",
+    # Storage
+    "ResultCache",
+    "CacheStats",
+    "ColumnarReader",
+    "write_parquet",
+    "SegmentStore",
+    "StoreStats",
     # Providers
     "LLMProvider",
     "ClaudeProvider",
     "GPT4VisionProvider",
+    "TransportConfig",
+    "RetryPolicy",
+    "RateLimiter",
+    "AdaptiveConcurrency",
+    # Instrumentation
+    "Instrumentation",
+    "CallbackInstrumentation",
+    "MetricsInstrumentation",
+    "OpenTelemetryInstrumentation",
     # Exceptions
     "CurbSignParserError",
     "ImageProcessingError",
@@ -0,0 +1,230 @@
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+from .models.data_models import CurbPolicy, SignData
+from .normalization import build_policy, now_ms
+from .parser import BaseCurbSignParser, ImageSource, IncrementalPolicyParser, ParseResult
+from .processors.image_processor import describe_source
+from .utils.exceptions import ParsingError
+
+logger = logging.getLogger(__name__)
+
+class AsyncCurbSignParser(BaseCurbSignParser):
+    """asyncio-native parser for extracting curb rules from sign images."""
+
+    def __init__(
+        self,
+        api_key: str,
+        provider: str = 'claude',
+        executor: Optional[Executor] = None,
+        **kwargs
+    ):
+        """
+        Initialize the async parser.
+
+        Args:
+            api_key: Provider API key
+            provider: Provider name
+            executor: Executor used for CPU-bound image preprocessing
+                (defaults to the event loop's default executor)
+            **kwargs: Extra provider options
+        """
+        super().__init__(api_key, provider=provider, **kwargs)
+        self.executor = executor
+
+    async def parse_sign(self, image_path: ImageSource) -> SignData:
+        """Process image and extract curb rules without blocking the event loop."""
+        try:
+            logger.info(f"Starting to process image: {describe_source(image_path)}")
+
+            with self.instrumentation.span('parse_sign'):
+                # Image decoding and encoding are CPU-bound; keep them off the loop
+                loop = asyncio.get_running_loop()
+                image_bytes, location_data = await loop.run_in_executor(
+                    self.executor, self.image_processor.process_image, image_path
+                )
+
+                logger.info(f"Location data extracted: {location_data}")
+
+                image_hash, duplicate = None, None
+                if self.duplicate_index is not None:
+                    image_hash, duplicate = await loop.run_in_executor(
+                        self.executor, self._find_duplicate, image_bytes, location_data
+                    )
+                    if duplicate is not None:
+                        return duplicate
+
+                if self.stream:
+                    try:
+                        policies = [policy async for policy in self._stream_policies(image_bytes)]
+                    except ParsingError as e:
+                        logger.error(f"Failed to parse streamed LLM response as JSON: {e}")
+                        policies = []
+                    sign_data = self._build_streamed_sign_data(policies, location_data)
+                    self._remember_duplicate(image_hash, sign_data, location_data)
+                    return sign_data
+
+                # Cache access is blocking disk I/O, so it also goes through the executor
+                cache_key, llm_response = None, None
+                if self.cache is not None:
+                    cache_key, llm_response = await loop.run_in_executor(
+                        self.executor, self._cache_lookup, image_bytes
+                    )
+                if llm_response is None:
+                    llm_response = await self.provider.process_image_async(image_bytes)
+                    if cache_key is not None:
+                        await loop.run_in_executor(
+                            self.executor, self._cache_store, cache_key, llm_response
+                        )
+                else:
+                    logger.info("Using cached LLM response")
+                logger.info(f"Raw LLM response: {llm_response[:500]}...")
+
+                sign_data = self._build_sign_data(llm_response, location_data)
+                self._remember_duplicate(image_hash, sign_data, location_data)
+                return sign_data
+
+        except Exception as e:
+            logger.error(f"Error processing sign: {e}", exc_info=True)
+            raise
+
+    async def iter_policies(self, image_path: ImageSource) -> AsyncIterator[CurbPolicy]:
+        """
+        Stream the policies on a sign as the provider generates them.
+
+        Async counterpart of ``CurbSignParser.iter_policies``; closing the
+        iterator early aborts generation.
+        """
+        loop = asyncio.get_running_loop()
+        image_bytes, _ = await loop.run_in_executor(
+            self.executor, self.image_processor.process_image, image_path
+        )
+        async for policy in self._stream_policies(image_bytes):
+            yield build_policy(policy)
+
+    async def _stream_policies(self, image_bytes: bytes) -> AsyncIterator[dict]:
+        """Yield normalized CDS policies from a streamed (or cached) response."""
+        loop = asyncio.get_running_loop()
+        cache_key, llm_response = None, None
+        if self.cache is not None:
+            cache_key, llm_response = await loop.run_in_executor(
+                self.executor, self._cache_lookup, image_bytes
+            )
+        if llm_response is not None:
+            logger.info("Using cached LLM response")
+            chunks = None
+        else:
+            chunks = self.provider.stream_image_async(image_bytes)
+
+        decoder = IncrementalPolicyParser()
+        published_date = now_ms()
+        try:
+            if chunks is None:
+                for source_policy in decoder.feed(llm_response):
+                    yield self._normalize_policy(source_policy, published_date)
+            else:
+                async for chunk in chunks:
+                    for source_policy in decoder.feed(chunk):
+                        yield self._normalize_policy(source_policy, published_date)
+            for source_policy in decoder.close():
+                yield self._normalize_policy(source_policy, published_date)
+        finally:
+            # Closing the provider stream before it finishes aborts generation
+            if chunks is not None:
+                await chunks.aclose()
+
+        if cache_key is not None and llm_response is None:
+            await loop.run_in_executor(self.executor, self._cache_store, cache_key, decoder.text)
+
+    async def parse_iter(
+        self,
+        image_paths: Iterable[ImageSource],
+        max_concurrency: int = 100
+    ) -> AsyncIterator[Tuple[ImageSource, ParseResult]]:
+        """
+        Parse many images concurrently, yielding results as they complete.
+
+        At most ``max_concurrency`` images are in flight at once and
+        ``image_paths`` is consumed lazily. A failure on one image is yielded
+        as the exception instance instead of aborting the remaining work.
+
+        Args:
+            image_paths: Iterable of image paths
+            max_concurrency: Maximum number of concurrent parses
+
+        Returns:
+            AsyncIterator[Tuple[path, SignData | Exception]]: Results in completion order
+        """
+        async for _, path, result in self._iter_indexed(image_paths, max_concurrency):
+            yield path, result
+
+    async def parse_batch(
+        self,
+        image_paths: Iterable[ImageSource],
+        max_concurrency: int = 100
+    ) -> List[ParseResult]:
+        """
+        Parse many images concurrently and return results in input order.
+
+        Args:
+            image_paths: Iterable of image paths
+            max_concurrency: Maximum number of concurrent parses
+
+        Returns:
+            List[SignData | Exception]: One entry per input image; failed images
+            are represented by the exception that was raised
+        """
+        results = {}
+        async for idx, _, result in self._iter_indexed(image_paths, max_concurrency):
+            results[idx] = result
+        return [results[idx] for idx in range(len(results))]
+
+    async def _iter_indexed(
+        self,
+        image_paths: Iterable[ImageSource],
+        max_concurrency: int
+    ) -> AsyncIterator[Tuple[int, ImageSource, ParseResult]]:
+        """Run parse_sign over a bounded window of in-flight tasks."""
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        sources = enumerate(image_paths)
+        pending = {}
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(pending) < max_concurrency:
+                    try:
+                        idx, path = next(sources)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[asyncio.ensure_future(self.parse_sign(path))] = (idx, path)
+
+                if not pending:
+                    break
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    idx, path = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = e
+                    yield idx, path, result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def aclose(self) -> None:
+        """Close the provider's async client."""
+        await self.provider.aclose()
+
+    async def __aenter__(self) -> "AsyncCurbSignParser":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
@@ -0,0 +1,299 @@
+"""
+Command line interface for batch parsing sign images.
+
+Reads images from a directory, glob pattern, CSV or JSONL manifest and
+streams one NDJSON record per image as results complete. Completed images
+are appended to a checkpoint file so an interrupted run can be resumed.
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .parser import CurbSignParser
+from .processors.image_processor import ImageProcessor
+from .providers.registry import available_providers
+from .providers.transport import TransportConfig
+from .storage.result_cache import ResultCache
+
+logger = logging.getLogger(__name__)
+
+# Environment variables holding the API keys of the built-in providers; other
+# registered providers take their key from --api-key
+API_KEY_ENV = {
+    'claude': 'ANTHROPIC_API_KEY',
+    'gpt4': 'OPENAI_API_KEY',
+}
+
+IMAGE_SUFFIXES = {f".{ext}" for ext in ImageProcessor.SUPPORTED_FORMATS}
+
+def iter_directory(root: Path) -> Iterator[str]:
+    """Yield image files below ``root`` in a stable order, one directory at a time."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if Path(name).suffix.lower() in IMAGE_SUFFIXES:
+                yield os.path.join(dirpath, name)
+
+def iter_csv(manifest: Path) -> Iterator[str]:
+    """Yield paths from a CSV manifest's ``path`` column (or its first column)."""
+    with open(manifest, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        lowered = [h.strip().lower() for h in header]
+        if 'path' in lowered:
+            column = lowered.index('path')
+        else:
+            column = 0
+            # Without a recognizable header the first row is already data
+            if Path(header[0].strip()).suffix.lower() in IMAGE_SUFFIXES:
+                yield _resolve(manifest, header[0])
+        for row in reader:
+            if len(row) > column and row[column].strip():
+                yield _resolve(manifest, row[column])
+
+def iter_jsonl(manifest: Path) -> Iterator[str]:
+    """Yield the ``path`` field of each record in a JSONL manifest."""
+    with open(manifest) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield _resolve(manifest, json.loads(line)['path'])
+
+def _resolve(manifest: Path, path: str) -> str:
+    """Resolve manifest entries relative to the manifest's directory."""
+    path = path.strip()
+    if os.path.isabs(path):
+        return path
+    return str(manifest.parent / path)
+
+def iter_sources(spec: str) -> Iterator[str]:
+    """
+    Lazily enumerate image paths from an input specification.
+
+    Args:
+        spec: Directory, glob pattern, ``.csv`` manifest or ``.jsonl`` manifest
+
+    Returns:
+        Iterator[str]: Image paths
+    """
+    path = Path(spec)
+    if path.is_dir():
+        return iter_directory(path)
+    suffix = path.suffix.lower()
+    if path.is_file() and suffix == '.csv':
+        return iter_csv(path)
+    if path.is_file() and suffix in ('.jsonl', '.ndjson'):
+        return iter_jsonl(path)
+    if path.is_file():
+        return iter([spec])
+    return glob.iglob(spec, recursive=True)
+
+def truncate_partial_line(path: Path) -> int:
+    """
+    Cut a file back to just after its last newline.
+
+    A run killed mid-write leaves a partial last line; appending to it would
+    merge it with the next record.
+
+    Returns:
+        int: Number of bytes removed
+    """
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        keep = 0
+        while position > 0:
+            step = min(position, 64 * 1024)
+            f.seek(position - step)
+            newline = f.read(step).rfind(b'\n')
+            if newline != -1:
+                keep = position - step + newline + 1
+                break
+            position -= step
+        if keep < end:
+            f.truncate(keep)
+        return end - keep
+
+def _digest(path: str) -> int:
+    """Compact 64-bit fingerprint of a source path."""
+    return int.from_bytes(hashlib.blake2b(path.encode('utf-8'), digest_size=8).digest(), 'big')
+
+class Checkpoint:
+    """
+    Append-only record of completed images.
+
+    Completed paths are loaded as a sorted array of 64-bit digests, so resume
+    bookkeeping costs 8 bytes per finished image and nothing per pending one.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        digests: List[int] = []
+        if path.exists():
+            truncate_partial_line(path)
+            with open(path) as f:
+                digests = [_digest(line.rstrip('\n')) for line in f if line.strip()]
+        self._done = np.unique(np.array(digests, dtype=np.uint64))
+        self._file: IO[str] = open(path, 'a')
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def __contains__(self, source: str) -> bool:
+        digest = np.uint64(_digest(source))
+        i = np.searchsorted(self._done, digest)
+        return bool(i < len(self._done) and self._done[i] == digest)
+
+    def mark_done(self, source: str) -> None:
+        self._file.write(f"{source}\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='curb-sign-parser',
+        description="Parse parking sign images into CDS JSON, streaming NDJSON results."
+    )
+    parser.add_argument('input', help="Directory, glob pattern, CSV manifest or JSONL manifest")
+    parser.add_argument('-o', '--output', default='-', help="NDJSON output file (default: stdout)")
+    parser.add_argument('--checkpoint', help="Checkpoint file used to resume interrupted runs")
+    parser.add_argument('--provider', default='claude', choices=available_providers())
+    parser.add_argument('--model', help="Provider model name")
+    parser.add_argument('--api-key', help="Provider API key (default: from environment)")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent provider requests")
+    parser.add_argument('--max-in-flight', type=int, help="Maximum submitted but unfinished images")
+    parser.add_argument(
+        '--processes', type=int,
+        help="Preprocess images on this many processes (default: in the worker threads)"
+    )
+    parser.add_argument('--connect-timeout', type=float, default=10.0, help="Seconds to establish a connection")
+    parser.add_argument('--read-timeout', type=float, default=60.0, help="Seconds to wait for response data")
+    parser.add_argument('--http2', action='store_true', help="Use HTTP/2 (requires h2)")
+    parser.add_argument('--cache', help="SQLite result cache path")
+    parser.add_argument('-v', '--verbose', action='count', default=0)
+    return parser
+
+def run(
+    parser: CurbSignParser,
+    sources: Iterable[str],
+    output: IO[str],
+    checkpoint: Optional[Checkpoint] = None,
+    workers: int = 8,
+    max_in_flight: Optional[int] = None,
+    processes: Optional[int] = None
+) -> int:
+    """
+    Parse ``sources`` and stream NDJSON records to ``output``.
+
+    Returns:
+        int: Number of images that failed
+    """
+    if checkpoint is not None:
+        sources = (source for source in sources if source not in checkpoint)
+
+    if processes:
+        results = parser.parse_pipelined(sources, processes=processes, max_workers=workers)
+    else:
+        results = parser.parse_iter(sources, max_workers=workers, max_in_flight=max_in_flight)
+
+    failures = 0
+    for source, result in results:
+        if isinstance(result, Exception):
+            failures += 1
+            record = {
+                "source": source,
+                "error": {"type": type(result).__name__, "message": str(result)}
+            }
+        else:
+            record = {"source": source, "sign_data": result.model_dump(mode='json')}
+
+        output.write(json.dumps(record, separators=(',', ':')) + "\n")
+        output.flush()
+
+        # Only record success once the result line is written; failures are retried on resume
+        if checkpoint is not None and not isinstance(result, Exception):
+            checkpoint.mark_done(source)
+
+    return failures
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.WARNING - 10 * min(args.verbose, 2),
+        stream=sys.stderr
+    )
+
+    env_var = API_KEY_ENV.get(args.provider)
+    api_key = args.api_key or (os.getenv(env_var) if env_var else None)
+    if not api_key:
+        hint = f" or set {env_var}" if env_var else ""
+        print(f"error: no API key; pass --api-key{hint}", file=sys.stderr)
+        return 2
+
+    provider_kwargs = {'model': args.model} if args.model else {}
+    provider_kwargs['transport'] = TransportConfig.for_concurrency(
+        args.workers,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+        http2=args.http2
+    )
+    cache = ResultCache(args.cache) if args.cache else None
+    parser = CurbSignParser(api_key=api_key, provider=args.provider, cache=cache, **provider_kwargs)
+    parser.provider.warmup(connections=args.workers)
+
+    checkpoint = Checkpoint(Path(args.checkpoint)) if args.checkpoint else None
+    if checkpoint is not None and len(checkpoint):
+        print(f"Resuming: {len(checkpoint)} images already done", file=sys.stderr)
+
+    # Append on resume so earlier results are kept
+    if args.output == '-':
+        output = sys.stdout
+    else:
+        if checkpoint is not None and os.path.exists(args.output):
+            removed = truncate_partial_line(Path(args.output))
+            if removed:
+                print(f"Discarded a partial {removed}-byte record at the end of {args.output}", file=sys.stderr)
+        output = open(args.output, 'a' if checkpoint is not None else 'w')
+
+    try:
+        failures = run(
+            parser,
+            iter_sources(args.input),
+            output,
+            checkpoint=checkpoint,
+            workers=args.workers,
+            max_in_flight=args.max_in_flight,
+            processes=args.processes
+        )
+    except KeyboardInterrupt:
+        print("Interrupted; rerun with the same --checkpoint to resume", file=sys.stderr)
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if checkpoint is not None:
+            checkpoint.close()
+        if cache is not None:
+            cache.close()
+
+    if failures:
+        print(f"{failures} images failed", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Content-addressed policies and CDS feed assembly across many signs.
+
+Every policy is identified by a UUIDv5 of its canonical content (time spans,
+rules, priority and operators; not its ID or publication date), so the same
+regulation gets the same ``curb_policy_id`` on every sign and in every run.
+``FeedBuilder`` interns identical policies and time spans as it collects
+signs and emits a CDS Policies feed that lists each policy once, plus a
+Curbs feed of zones referencing them by ID.
+"""
+
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .models.data_models import CurbPolicy, SignData, TimeSpan
+
+# Namespace of content-derived curb_policy_id and curb_zone_id values
+POLICY_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'https://github.com/hersh-gupta/curb-sign-parser/curb-policy')
+ZONE_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, 'https://github.com/hersh-gupta/curb-sign-parser/curb-zone')
+
+CONTENT_FIELDS = ('priority', 'time_spans', 'rules', 'data_source_operator_id')
+
+_RULE_FIELDS = frozenset(('activity', 'max_stay', 'rate', 'user_classes'))
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+_DAY_ORDER = {day: i for i, day in enumerate(('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun'))}
+
+# IDs of recently hashed policy dictionaries, keyed by ``_memo_key``
+_ID_MEMO: Dict[Any, str] = {}
+_MEMO_LIMIT = 65536
+
+def _strip(value: Any) -> Any:
+    """Drop None values and empty lists, which carry no regulation."""
+    if isinstance(value, dict):
+        return {k: _strip(v) for k, v in value.items() if v is not None and v != []}
+    if isinstance(value, list):
+        return [_strip(v) for v in value]
+    return value
+
+def _canonical_span(span: Dict[str, Any]) -> Dict[str, Any]:
+    days = span.get('days_of_week')
+    if days:
+        span = dict(span, days_of_week=sorted(set(days), key=lambda day: (_DAY_ORDER.get(day, 7), day)))
+    return span
+
+def canonical_policy(policy: Union[CurbPolicy, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    The content of a policy in canonical form.
+
+    Args:
+        policy: CurbPolicy, or a CDS policy dictionary such as
+            ``normalize_policy`` output
+
+    Returns:
+        dict: Content fields without None values, with day lists in week order
+        and time spans, user classes and operators sorted (their order
+        carries no meaning; rule order does and is kept)
+    """
+    if isinstance(policy, CurbPolicy):
+        policy = policy.model_dump(mode='json', include=set(CONTENT_FIELDS))
+    content = _strip({field: policy.get(field) for field in CONTENT_FIELDS})
+
+    if 'time_spans' in content:
+        spans = [_canonical_span(span) for span in content['time_spans']]
+        content['time_spans'] = sorted(spans, key=lambda span: json.dumps(span, sort_keys=True))
+    for rule in content.get('rules', ()):
+        if 'user_classes' in rule:
+            rule['user_classes'] = sorted(rule['user_classes'])
+        if isinstance(rule.get('rate'), dict) and isinstance(rule['rate'].get('rate'), int):
+            rule['rate']['rate'] = float(rule['rate']['rate'])
+    if 'data_source_operator_id' in content:
+        content['data_source_operator_id'] = sorted(content['data_source_operator_id'])
+    return content
+
+def _content_key(policy: Union[CurbPolicy, Dict[str, Any]]) -> str:
+    return json.dumps(canonical_policy(policy), sort_keys=True, separators=(',', ':'))
+
+def _memo_key(policy: Dict[str, Any]) -> Any:
+    """
+    Hashable key of a policy dictionary, or None if it has unexpected shape.
+
+    Equal keys imply equal canonical content (the key is stricter: it also
+    depends on ordering), so it can stand in for the canonical JSON. Spans
+    and rules are keyed field by field, which is much cheaper than walking
+    them generically, so a span or rule with fields outside the CDS set
+    gets no key. Scalars are keyed with their type, since ``1 == 1.0 ==
+    True`` in Python but not in JSON; other field values must be plain
+    scalars, and lists and dictionary keys must be strings (``''.join``
+    checks that without a Python-level loop).
+    """
+    try:
+        span_keys = []
+        for span in policy.get('time_spans') or ():
+            days = tuple(span['days_of_week'])
+            start = span['time_of_day_start']
+            end = span['time_of_day_end']
+            if len(span) != 3 or start.__class__ is not str or end.__class__ is not str:
+                return None
+            ''.join(days)
+            span_keys.append((days, start, end))
+
+        rule_keys = []
+        for rule in policy.get('rules') or ():
+            if not rule.keys() <= _RULE_FIELDS:
+                return None
+            activity = rule.get('activity')
+            max_stay = rule.get('max_stay')
+            types = (type(activity), type(max_stay))
+            rate = rule.get('rate')
+            if rate is not None:
+                ''.join(rate)
+                types += tuple(map(type, rate.values()))
+                rate = tuple(rate.items())
+            if not _SCALAR_TYPES.issuperset(types):
+                return None
+            user_classes = rule.get('user_classes')
+            if user_classes is not None:
+                user_classes = tuple(user_classes)
+                ''.join(user_classes)
+            rule_keys.append((activity, max_stay, rate, user_classes, types))
+
+        operators = policy.get('data_source_operator_id')
+        if operators:
+            operators = tuple(operators)
+            ''.join(operators)
+        priority = policy.get('priority')
+        if type(priority) not in _SCALAR_TYPES:
+            return None
+        key = (priority, type(priority), tuple(span_keys), tuple(rule_keys), operators or None)
+        hash(key)
+    except (AttributeError, KeyError, TypeError):
+        return None
+    return key
+
+def policy_id(policy: Union[CurbPolicy, Dict[str, Any]]) -> str:
+    """Content-hash ``curb_policy_id`` of a policy (UUIDv5 of its canonical JSON)."""
+    key = _memo_key(policy) if isinstance(policy, dict) else None
+    if key is not None:
+        cached = _ID_MEMO.get(key)
+        if cached is not None:
+            return cached
+
+    value = str(uuid.uuid5(POLICY_NAMESPACE, _content_key(policy)))
+    if key is not None:
+        if len(_ID_MEMO) >= _MEMO_LIMIT:
+            _ID_MEMO.clear()
+        _ID_MEMO[key] = value
+    return value
+
+class FeedBuilder:
+    """
+    Collects parsed signs into a deduplicated CDS Policies/Curbs feed.
+
+    Each distinct policy is kept once under its content-hash ID, and
+    identical time spans are shared between policies, so the feed and the
+    collected policies grow with the number of distinct regulations rather
+    than the number of signs. Policies returned by ``add`` and ``policies``
+    are shared: treat them as read-only.
+    """
+
+    def __init__(self, version: str = '1.0', time_zone: Optional[str] = None, currency: str = 'USD'):
+        """
+        Initialize an empty feed.
+
+        Args:
+            version: CDS version reported in the feeds
+            time_zone: IANA time zone of the signs' local times
+            currency: Currency of rates
+        """
+        self.version = version
+        self.time_zone = time_zone
+        self.currency = currency
+        self.policies: Dict[str, CurbPolicy] = {}
+        self.zones: List[Dict[str, Any]] = []
+        self._spans: Dict[Tuple[Tuple[str, ...], str, str], TimeSpan] = {}
+
+    def _intern_span(self, span: TimeSpan) -> TimeSpan:
+        key = (tuple(span.days_of_week), span.time_of_day_start, span.time_of_day_end)
+        return self._spans.setdefault(key, span)
+
+    def intern(self, policy: CurbPolicy) -> CurbPolicy:
+        """
+        The shared instance of a policy, added to the feed if new.
+
+        Args:
+            policy: Policy from any sign; its ID is replaced by the content hash
+
+        Returns:
+            CurbPolicy: The first policy seen with the same content
+        """
+        key = policy_id(policy)
+        shared = self.policies.get(key)
+        if shared is None:
+            time_spans = None
+            if policy.time_spans is not None:
+                time_spans = [self._intern_span(span) for span in policy.time_spans]
+            shared = self.policies[key] = policy.model_copy(
+                update={'curb_policy_id': key, 'time_spans': time_spans}
+            )
+        return shared
+
+    def add(self, sign: SignData, zone_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Add a sign as a curb zone.
+
+        Args:
+            sign: Parsed sign
+            zone_id: ``curb_zone_id`` to use (default: derived from the
+                sign's location and policies, so re-adding it is idempotent)
+
+        Returns:
+            dict: The CDS curb zone, referencing the sign's policies by ID
+        """
+        policy_ids = list(dict.fromkeys(self.intern(policy).curb_policy_id for policy in sign.policies))
+        geometry = None
+        if sign.location is not None:
+            geometry = {'type': sign.location.type, 'coordinates': sign.location.coordinates}
+        if zone_id is None:
+            zone_id = str(uuid.uuid5(
+                ZONE_NAMESPACE, json.dumps([geometry, sorted(policy_ids)], separators=(',', ':'))
+            ))
+
+        zone = {
+            'curb_zone_id': zone_id,
+            'geometry': {'type': 'Feature', 'properties': {}, 'geometry': geometry},
+            'curb_policy_ids': policy_ids,
+            'published_date': sign.last_updated,
+            'last_updated_date': sign.last_updated,
+        }
+        self.zones.append(zone)
+        return zone
+
+    def _envelope(self, key: str, items: List[Any], last_updated: Optional[int]) -> Dict[str, Any]:
+        feed: Dict[str, Any] = {
+            'version': self.version,
+            'last_updated': last_updated if last_updated is not None else int(datetime.now().timestamp() * 1000),
+            'currency': self.currency,
+            'data': {key: items},
+        }
+        if self.time_zone is not None:
+            feed['time_zone'] = self.time_zone
+        return feed
+
+    def policies_feed(self, last_updated: Optional[int] = None) -> Dict[str, Any]:
+        """CDS Policies response listing every distinct policy once, sorted by ID."""
+        policies = [
+            self.policies[key].model_dump(mode='json', exclude_none=True) for key in sorted(self.policies)
+        ]
+        return self._envelope('policies', policies, last_updated)
+
+    def curbs_feed(self, last_updated: Optional[int] = None) -> Dict[str, Any]:
+        """CDS Curbs response with one zone per added sign."""
+        return self._envelope('zones', list(self.zones), last_updated)
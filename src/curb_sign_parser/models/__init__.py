@@ -2,6 +2,7 @@
 Data models for the Curb Sign Parser following CDS standards.
 """
 
+from .batch import BatchItem, BatchJob
 from .data_models import (
     CurbPolicy,
     Location,
@@ -12,6 +13,7 @@ from .data_models import (
     SignData,
     TimeSpan,
 )
+from .usage import TokenUsage
 
 __all__ = [
     "RegulationType",
@@ -21,5 +23,8 @@ __all__ = [
     "Rule",
     "CurbPolicy",
     "Location",
-    "SignData"
+    "SignData",
+    "BatchItem",
+    "BatchJob",
+    "TokenUsage",
 ]
@@ -0,0 +1,16 @@
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class BatchItem(BaseModel):
+    """One image in a submitted batch"""
+    source: str
+    location: Optional[dict] = None
+    error: Optional[str] = None  # Set when preprocessing failed and the image wasn't submitted
+
+class BatchJob(BaseModel):
+    """Handle for a provider batch, serializable between submit and collect"""
+    batch_id: Optional[str] = None
+    provider: str
+    items: Dict[str, BatchItem] = Field(default_factory=dict)  # Keyed by custom ID
@@ -0,0 +1,444 @@
+"""
+Compact, array-backed storage for large corpora of parsed signs.
+
+``CompactCorpus`` packs many ``SignData`` records into NumPy structured
+arrays: time spans become a 7-bit day mask plus start/end minutes of the
+day, strings are interned, and canonical UUID policy IDs are stored as 16
+raw bytes. Rows are laid out contiguously (CSR-style offsets link signs to
+policies and policies to rules and time spans), so scans over every span or
+rule in a city-wide corpus are plain array operations.
+
+Conversion is lossless: ``corpus[i] == original`` for every record. Spans
+that don't fit the compact encoding (unknown day names, days out of
+canonical order, times not in ``HH:MM``) are kept as ``TimeSpan`` objects
+on the side, as are the rare signs with values outside the column types.
+"""
+
+import re
+import sys
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..normalization import ALL_DAYS
+from .data_models import CurbPolicy, RateUnitPeriod, SignData, TimeSpan
+
+# Bit ``i`` of a day mask is ``ALL_DAYS[i]`` (mon = 1 ... sun = 64)
+DAY_BITS = {day: 1 << i for i, day in enumerate(ALL_DAYS)}
+ALL_DAYS_MASK = (1 << len(ALL_DAYS)) - 1
+
+# Day mask of spans stored as TimeSpan objects in ``CompactCorpus.irregular_spans``
+IRREGULAR_SPAN = 0x80
+
+# Policy flags
+HAS_PRIORITY = 0x01
+NO_TIME_SPANS = 0x02
+# Rule flags
+HAS_MAX_STAY = 0x01
+HAS_RATE = 0x02
+
+NONE_CODE = -1      # String or tuple code of a missing value
+UUID_CODE = -2      # Policy ID stored in the ``uuid`` column
+
+SIGN_DTYPE = np.dtype([
+    ('version', '<i4'),
+    ('time_zone', '<i4'),
+    ('currency', '<i4'),
+    ('author', '<i4'),
+    ('license_url', '<i4'),
+    ('location_type', '<i4'),
+    ('last_updated', '<i8'),
+    ('lon', '<f8'),
+    ('lat', '<f8'),
+])
+POLICY_DTYPE = np.dtype([
+    ('policy_id', '<i4'),
+    ('uuid', 'S16'),
+    ('published_date', '<i8'),
+    ('priority', '<i8'),
+    ('operator_ids', '<i4'),
+    ('flags', 'u1'),
+])
+RULE_DTYPE = np.dtype([
+    ('activity', '<i4'),
+    ('max_stay', '<i8'),
+    ('user_classes', '<i4'),
+    ('rate', '<f8'),
+    ('rate_unit', '<i4'),
+    ('rate_unit_period', 'u1'),
+    ('flags', 'u1'),
+])
+SPAN_DTYPE = np.dtype([
+    ('day_mask', 'u1'),
+    ('start', '<u2'),
+    ('end', '<u2'),
+])
+
+_HHMM = re.compile(r'([01]\d|2[0-3]):([0-5]\d)')
+_INT64 = (-2 ** 63, 2 ** 63)
+_PERIODS = list(RateUnitPeriod)
+_PERIOD_CODES = {period: i for i, period in enumerate(_PERIODS)}
+_MINUTE_TIMES = [f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(24 * 60)]
+_MASK_DAYS = [tuple(day for day in ALL_DAYS if mask & DAY_BITS[day]) for mask in range(ALL_DAYS_MASK + 1)]
+
+def days_to_mask(days: Sequence[str]) -> Optional[int]:
+    """
+    Encode days as a 7-bit mask.
+
+    Args:
+        days: Lowercase CDS day abbreviations
+
+    Returns:
+        Optional[int]: The mask, or None unless the days are known, unique and
+        in ``ALL_DAYS`` order (only then does ``mask_to_days`` restore them)
+    """
+    mask = 0
+    for day in days:
+        mask |= DAY_BITS.get(day, IRREGULAR_SPAN)
+    if mask & IRREGULAR_SPAN or _MASK_DAYS[mask] != tuple(days):
+        return None
+    return mask
+
+def mask_to_days(mask: int) -> List[str]:
+    """Decode a 7-bit day mask into day abbreviations in week order."""
+    return list(_MASK_DAYS[mask & ALL_DAYS_MASK])
+
+def time_to_minutes(value: str) -> Optional[int]:
+    """Minute of the day of an ``HH:MM`` time, or None for any other string."""
+    match = _HHMM.fullmatch(value)
+    if match is None:
+        return None
+    return int(match.group(1)) * 60 + int(match.group(2))
+
+def minutes_to_time(minutes: int) -> str:
+    """Format a minute of the day as ``HH:MM``."""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+class _NotCompact(Exception):
+    """Raised while encoding a sign with values outside the column types."""
+
+class Interner:
+    """Assigns stable integer codes to hashable values."""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.codes: Dict[Any, int] = {}
+
+    def __call__(self, value: Any) -> int:
+        if value is None:
+            return NONE_CODE
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+def _int64(value: int) -> int:
+    if not _INT64[0] <= value < _INT64[1]:
+        raise _NotCompact
+    return value
+
+def uuid_bytes(value: str) -> Optional[bytes]:
+    """The 16 raw bytes of a canonical lowercase UUID string, else None."""
+    if len(value) != 36:
+        return None
+    try:
+        parsed = uuid.UUID(value)
+    except ValueError:
+        return None
+    return parsed.bytes if str(parsed) == value else None
+
+class _CorpusBuilder:
+    """Accumulates encoded rows; see ``CompactCorpus.from_sign_data``."""
+
+    def __init__(self):
+        self.strings = Interner()
+        self.tuples = Interner()
+        self.signs: List[tuple] = []
+        self.policies: List[tuple] = []
+        self.rules: List[tuple] = []
+        self.spans: List[tuple] = []
+        self.policy_offsets = [0]
+        self.rule_offsets = [0]
+        self.span_offsets = [0]
+        self.irregular_spans: Dict[int, TimeSpan] = {}
+        self.fallback: Dict[int, SignData] = {}
+
+    def add(self, sign: SignData) -> None:
+        try:
+            sign_row, policies, rules, spans, irregular = self._encode(sign)
+        except _NotCompact:
+            self.fallback[len(self.signs)] = sign.model_copy(deep=True)
+            self.signs.append((NONE_CODE,) * 6 + (0, np.nan, np.nan))
+            self.policy_offsets.append(len(self.policies))
+            return
+
+        for offset, span in irregular:
+            self.irregular_spans[len(self.spans) + offset] = span.model_copy(deep=True)
+        for policy_row, rule_count, span_count in policies:
+            self.policies.append(policy_row)
+            self.rule_offsets.append(self.rule_offsets[-1] + rule_count)
+            self.span_offsets.append(self.span_offsets[-1] + span_count)
+        self.rules.extend(rules)
+        self.spans.extend(spans)
+        self.signs.append(sign_row)
+        self.policy_offsets.append(len(self.policies))
+
+    def _encode(self, sign: SignData):
+        strings, tuples = self.strings, self.tuples
+        location = sign.location
+        if location is None:
+            location_row = (NONE_CODE, np.nan, np.nan)
+        elif len(location.coordinates) == 2:
+            location_row = (strings(location.type), *location.coordinates)
+        else:
+            raise _NotCompact
+
+        sign_row = (
+            strings(sign.version), strings(sign.time_zone), strings(sign.currency),
+            strings(sign.author), strings(sign.license_url),
+            location_row[0], _int64(sign.last_updated), location_row[1], location_row[2]
+        )
+
+        policies, rules, spans, irregular = [], [], [], []
+        for policy in sign.policies:
+            flags = 0
+            raw_uuid = uuid_bytes(policy.curb_policy_id)
+            if policy.priority is not None:
+                flags |= HAS_PRIORITY
+            if policy.time_spans is None:
+                flags |= NO_TIME_SPANS
+            operator_ids = policy.data_source_operator_id
+            policies.append(((
+                UUID_CODE if raw_uuid is not None else strings(policy.curb_policy_id),
+                raw_uuid or b'',
+                _int64(policy.published_date),
+                _int64(policy.priority) if policy.priority is not None else 0,
+                tuples(tuple(operator_ids)) if operator_ids is not None else NONE_CODE,
+                flags
+            ), len(policy.rules), len(policy.time_spans or ())))
+
+            for rule in policy.rules:
+                flags = 0
+                if rule.max_stay is not None:
+                    flags |= HAS_MAX_STAY
+                rate = rule.rate
+                if rate is not None:
+                    flags |= HAS_RATE
+                user_classes = rule.user_classes
+                rules.append((
+                    strings(rule.activity),
+                    _int64(rule.max_stay) if rule.max_stay is not None else 0,
+                    tuples(tuple(user_classes)) if user_classes is not None else NONE_CODE,
+                    rate.rate if rate is not None else np.nan,
+                    strings(rate.rate_unit) if rate is not None else NONE_CODE,
+                    _PERIOD_CODES[rate.rate_unit_period] if rate is not None else 0,
+                    flags
+                ))
+
+            for span in policy.time_spans or ():
+                mask = days_to_mask(span.days_of_week)
+                start = time_to_minutes(span.time_of_day_start)
+                end = time_to_minutes(span.time_of_day_end)
+                if mask is None or start is None or end is None:
+                    irregular.append((len(spans), span))
+                    spans.append((IRREGULAR_SPAN, 0, 0))
+                else:
+                    spans.append((mask, start, end))
+
+        return sign_row, policies, rules, spans, irregular
+
+    def build(self) -> 'CompactCorpus':
+        return CompactCorpus(
+            signs=np.array(self.signs, dtype=SIGN_DTYPE),
+            policies=np.array(self.policies, dtype=POLICY_DTYPE),
+            rules=np.array(self.rules, dtype=RULE_DTYPE),
+            spans=np.array(self.spans, dtype=SPAN_DTYPE),
+            policy_offsets=np.array(self.policy_offsets, dtype=np.int64),
+            rule_offsets=np.array(self.rule_offsets, dtype=np.int64),
+            span_offsets=np.array(self.span_offsets, dtype=np.int64),
+            strings=self.strings.values,
+            string_tuples=self.tuples.values,
+            irregular_spans=self.irregular_spans,
+            fallback=self.fallback
+        )
+
+class CompactCorpus:
+    """
+    Many ``SignData`` records packed into structured arrays.
+
+    Policies of sign ``i`` are rows ``policy_offsets[i]:policy_offsets[i + 1]``
+    of ``policies``; rules and time spans of policy ``j`` are found the same
+    way through ``rule_offsets`` and ``span_offsets``. String columns hold
+    codes into ``strings`` (``NONE_CODE`` for None), and ``user_classes`` and
+    ``operator_ids`` hold codes into ``string_tuples``.
+    """
+
+    __slots__ = (
+        'signs', 'policies', 'rules', 'spans',
+        'policy_offsets', 'rule_offsets', 'span_offsets',
+        'strings', 'string_tuples', 'irregular_spans', 'fallback'
+    )
+
+    def __init__(
+        self,
+        signs: np.ndarray,
+        policies: np.ndarray,
+        rules: np.ndarray,
+        spans: np.ndarray,
+        policy_offsets: np.ndarray,
+        rule_offsets: np.ndarray,
+        span_offsets: np.ndarray,
+        strings: List[str],
+        string_tuples: List[Tuple[str, ...]],
+        irregular_spans: Optional[Dict[int, TimeSpan]] = None,
+        fallback: Optional[Dict[int, SignData]] = None
+    ):
+        self.signs = signs
+        self.policies = policies
+        self.rules = rules
+        self.spans = spans
+        self.policy_offsets = policy_offsets
+        self.rule_offsets = rule_offsets
+        self.span_offsets = span_offsets
+        self.strings = strings
+        self.string_tuples = string_tuples
+        self.irregular_spans = irregular_spans or {}
+        self.fallback = fallback or {}
+
+    @classmethod
+    def from_sign_data(cls, signs: Iterable[SignData]) -> 'CompactCorpus':
+        """
+        Pack parsed signs into a corpus.
+
+        Args:
+            signs: Records to pack; the corpus keeps no reference to them
+
+        Returns:
+            CompactCorpus: Corpus whose item ``i`` equals the ``i``-th record
+        """
+        builder = _CorpusBuilder()
+        for sign in signs:
+            builder.add(sign)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.signs)
+
+    def __iter__(self) -> Iterator[SignData]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> SignData:
+        """Rebuild the ``SignData`` of one sign."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Sign index out of range: {index}")
+
+        fallback = self.fallback.get(index)
+        if fallback is not None:
+            return fallback.model_copy(deep=True)
+        return SignData.__pydantic_validator__.validate_python(self.to_dict(index))
+
+    def to_dict(self, index: int) -> Dict[str, Any]:
+        """
+        Rebuild one sign as a CDS dictionary, without constructing models.
+
+        Args:
+            index: Sign position (must not be a ``fallback`` sign)
+
+        Returns:
+            dict: Keyword arguments for ``SignData``
+        """
+        strings = self.strings
+
+        def string(code: int) -> Optional[str]:
+            return strings[code] if code != NONE_CODE else None
+
+        version, time_zone, currency, author, license_url, location_type, \
+            last_updated, lon, lat = self.signs[index].item()
+        sign: Dict[str, Any] = {
+            'version': string(version),
+            'time_zone': string(time_zone),
+            'last_updated': last_updated,
+            'currency': string(currency),
+            'author': string(author),
+            'license_url': string(license_url),
+            'location': {'type': strings[location_type], 'coordinates': [lon, lat]}
+            if location_type != NONE_CODE else None,
+        }
+
+        first, last = self.policy_offsets[index:index + 2].tolist()
+        sign['policies'] = [
+            self._policy_dict(row, first + offset)
+            for offset, row in enumerate(self.policies[first:last].tolist())
+        ]
+        return sign
+
+    def policy(self, index: int) -> CurbPolicy:
+        """Rebuild the ``CurbPolicy`` in row ``index`` of ``policies``."""
+        row = self.policies[index].item()
+        return CurbPolicy.__pydantic_validator__.validate_python(self._policy_dict(row, index))
+
+    def _policy_dict(self, row: tuple, index: int) -> Dict[str, Any]:
+        strings, tuples = self.strings, self.string_tuples
+        policy_id, raw_uuid, published_date, priority, operator_ids, flags = row
+
+        rules = []
+        first, last = self.rule_offsets[index:index + 2].tolist()
+        for activity, max_stay, user_classes, rate, rate_unit, period, rule_flags in \
+                self.rules[first:last].tolist():
+            rules.append({
+                'activity': strings[activity],
+                'max_stay': max_stay if rule_flags & HAS_MAX_STAY else None,
+                'user_classes': list(tuples[user_classes]) if user_classes != NONE_CODE else None,
+                'rate': {
+                    'rate': rate,
+                    'rate_unit': strings[rate_unit],
+                    'rate_unit_period': _PERIODS[period],
+                } if rule_flags & HAS_RATE else None,
+            })
+
+        time_spans = None
+        if not flags & NO_TIME_SPANS:
+            first, last = self.span_offsets[index:index + 2].tolist()
+            time_spans = []
+            for offset, (mask, start, end) in enumerate(self.spans[first:last].tolist()):
+                if mask == IRREGULAR_SPAN:
+                    time_spans.append(self.irregular_spans[first + offset].model_copy(deep=True))
+                else:
+                    time_spans.append({
+                        'days_of_week': list(_MASK_DAYS[mask]),
+                        'time_of_day_start': _MINUTE_TIMES[start],
+                        'time_of_day_end': _MINUTE_TIMES[end],
+                    })
+
+        return {
+            'curb_policy_id': str(uuid.UUID(bytes=raw_uuid.ljust(16, b'\0')))
+            if policy_id == UUID_CODE else strings[policy_id],
+            'published_date': published_date,
+            'priority': priority if flags & HAS_PRIORITY else None,
+            'time_spans': time_spans,
+            'rules': rules,
+            'data_source_operator_id': list(tuples[operator_ids]) if operator_ids != NONE_CODE else None,
+        }
+
+    def to_sign_data(self) -> List[SignData]:
+        """Rebuild every sign."""
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the corpus, including interned strings."""
+        arrays = (
+            self.signs, self.policies, self.rules, self.spans,
+            self.policy_offsets, self.rule_offsets, self.span_offsets
+        )
+        total = sum(array.nbytes for array in arrays)
+        total += sys.getsizeof(self.strings) + sum(sys.getsizeof(s) for s in self.strings)
+        total += sys.getsizeof(self.string_tuples) + sum(
+            sys.getsizeof(t) + sum(sys.getsizeof(s) for s in t) for t in self.string_tuples
+        )
+        return total
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class TokenUsage(BaseModel):
+    """Token counts reported by a provider for one or more requests"""
+    requests: int = 0
+    input_tokens: int = 0  # Uncached input tokens
+    output_tokens: int = 0
+    cache_creation_input_tokens: int = 0  # Input tokens written to the prompt cache
+    cache_read_input_tokens: int = 0  # Input tokens served from the prompt cache
+
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(**{
+            name: getattr(self, name) + getattr(other, name)
+            for name in TokenUsage.model_fields
+        })
@@ -0,0 +1,471 @@
+"""
+Table-driven normalization of LLM responses into CDS structures.
+
+Lookup tables for day names and ranges, times of day, activities and rate
+units are built once per process, and normalized day lists and time spans are
+memoized, since archived responses repeat the same few schedules over and
+over. ``build_sign_data`` then hands the result straight to the compiled
+``SignData`` validator.
+"""
+
+import logging
+import math
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .feed import policy_id
+from .models.data_models import CurbPolicy, RateUnitPeriod, SignData
+
+logger = logging.getLogger(__name__)
+
+ALL_DAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+DEFAULT_START = '00:00'
+DEFAULT_END = '23:59'
+
+# Entries kept in each memo of normalized day lists and time spans
+_MEMO_LIMIT = 65536
+
+_DAY_NAMES = {
+    'mon': ('mon', 'monday', 'mo'),
+    'tue': ('tue', 'tuesday', 'tues', 'tu'),
+    'wed': ('wed', 'wednesday', 'weds', 'we'),
+    'thu': ('thu', 'thursday', 'thur', 'thurs', 'th'),
+    'fri': ('fri', 'friday', 'fr'),
+    'sat': ('sat', 'saturday', 'sa'),
+    'sun': ('sun', 'sunday', 'su'),
+}
+_DAY_GROUPS = {
+    ALL_DAYS[:5]: ('weekday', 'weekdays'),
+    ALL_DAYS[5:]: ('weekend', 'weekends'),
+    ALL_DAYS: ('daily', 'everyday', 'alldays', 'all', 'any'),
+}
+
+_ACTIVITY_ALIASES = {
+    'parking': ('park', 'parking_allowed'),
+    'no_parking': ('noparking', 'parking_prohibited', 'no_parking_anytime'),
+    'no_stopping': ('nostopping', 'stopping_prohibited', 'no_stopping_anytime'),
+    'paid_parking': ('pay_parking', 'pay_to_park', 'metered', 'metered_parking', 'meter_parking'),
+    'time_limited': ('time_limit', 'time_limited_parking', 'limited_parking'),
+    'loading': ('loading_zone', 'loading_only'),
+    'passenger_loading': ('passenger_loading_zone', 'passenger_loading_only'),
+    'commercial_loading': ('commercial_loading_zone', 'commercial_loading_only', 'truck_loading'),
+}
+
+_RATE_UNITS = {
+    'minute': ('minute', 'minutes', 'min', 'mins'),
+    'hour': ('hour', 'hours', 'hr', 'hrs', 'h', 'hourly'),
+    'day': ('day', 'days', 'd', 'daily'),
+    'week': ('week', 'weeks', 'wk', 'weekly'),
+    'month': ('month', 'months', 'mo', 'monthly'),
+    'year': ('year', 'years', 'yr', 'yearly'),
+}
+
+_DAY_SEPARATORS = re.compile(r'\s*(?:-|–|—|\bto\b|\bthru\b|\bthrough\b)\s*')
+_DAY_LIST_SEPARATORS = re.compile(r'\s*(?:,|/|&|\band\b)\s*')
+_NOT_ALNUM = re.compile(r'[^a-z0-9]+')
+_DURATION = re.compile(r'(\d+(?:\.\d+)?)\s*(m|min|mins|minutes?|h|hr|hrs|hours?)?')
+_AMOUNT = re.compile(r'-?\d+(?:\.\d+)?')
+
+def _build_day_table() -> Dict[str, Tuple[str, ...]]:
+    """Single days, groups and every ``a-b`` range (wrapping past Sunday)."""
+    table: Dict[str, Tuple[str, ...]] = {}
+    for day, names in _DAY_NAMES.items():
+        for name in names:
+            table[name] = (day,)
+    for days, names in _DAY_GROUPS.items():
+        for name in names:
+            table[name] = days
+
+    for first, first_names in _DAY_NAMES.items():
+        for last, last_names in _DAY_NAMES.items():
+            start, stop = ALL_DAYS.index(first), ALL_DAYS.index(last)
+            days = tuple(ALL_DAYS[(start + i) % 7] for i in range((stop - start) % 7 + 1))
+            for a in first_names:
+                for b in last_names:
+                    table[f"{a}-{b}"] = days
+
+    # Exact spellings LLMs commonly use, so they skip canonicalization
+    for key in list(table):
+        if '-' not in key:
+            table[key.upper()] = table[key]
+            table[key.title()] = table[key]
+    return table
+
+def _build_time_table() -> Dict[str, str]:
+    """24-hour ``H:MM``/``HH:MM`` and 12-hour ``H[:MM]am/pm`` spellings."""
+    table = {'noon': '12:00', 'midday': '12:00', 'midnight': '00:00'}
+    for hour in range(24):
+        for minute in range(60):
+            value = f"{hour:02d}:{minute:02d}"
+            table[value] = value
+            table[f"{hour}:{minute:02d}"] = value
+
+            suffix = 'am' if hour < 12 else 'pm'
+            hour12 = hour % 12 or 12
+            table[f"{hour12}:{minute:02d}{suffix}"] = value
+            table[f"{hour12:02d}:{minute:02d}{suffix}"] = value
+            if minute == 0:
+                table[f"{hour12}{suffix}"] = value
+    return table
+
+def _invert(aliases: Dict[str, Tuple[str, ...]]) -> Dict[str, str]:
+    table = {}
+    for canonical, names in aliases.items():
+        table[canonical] = canonical
+        for name in names:
+            table[name] = canonical
+    return table
+
+_DAY_TABLE = _build_day_table()
+_TIME_TABLE = _build_time_table()
+_END_TIMES = {'midnight': DEFAULT_END, '12am': DEFAULT_END, '12:00am': DEFAULT_END}
+_ACTIVITY_TABLE = _invert(_ACTIVITY_ALIASES)
+_RATE_UNIT_TABLE = _invert(_RATE_UNITS)
+_RATE_PERIODS = {period.value: period.value for period in RateUnitPeriod}
+_POLICY_VALIDATOR = CurbPolicy.__pydantic_validator__
+_SIGN_DATA_VALIDATOR = SignData.__pydantic_validator__
+_DAYS_MEMO: Dict[Any, Tuple[str, ...]] = {}
+_SPAN_MEMO: Dict[Any, Tuple[Tuple[str, ...], str, str]] = {}
+
+def now_ms() -> int:
+    """Current time in epoch milliseconds, as CDS timestamps are stored."""
+    return int(datetime.now().timestamp() * 1000)
+
+def _lookup_day(day: str) -> Optional[Tuple[str, ...]]:
+    days = _DAY_TABLE.get(day)
+    if days is None:
+        key = _DAY_SEPARATORS.sub('-', day.strip().lower()).replace('.', '').replace(' ', '')
+        days = _DAY_TABLE.get(key)
+    return days
+
+def _expand_days(days: Any) -> Tuple[str, ...]:
+    if isinstance(days, str):
+        days = _DAY_LIST_SEPARATORS.split(days)
+
+    result: Dict[str, None] = {}
+    for day in days:
+        if not isinstance(day, str):
+            continue
+        expanded = _lookup_day(day)
+        if expanded is None:
+            result[day.lower()] = None
+        else:
+            result.update(dict.fromkeys(expanded))
+    return tuple(result) if result else ALL_DAYS
+
+def _memo_key(value: Any) -> Any:
+    """Hashable key for a raw JSON value, or None if it can't be memoized."""
+    if isinstance(value, list):
+        value = tuple(value)
+    try:
+        hash(value)
+    except TypeError:
+        return None
+    return value
+
+def _remember(memo: Dict[Any, Any], key: Any, value: Any) -> None:
+    # Bounded so adversarial inputs can't grow the memo without limit
+    if len(memo) >= _MEMO_LIMIT:
+        memo.clear()
+    memo[key] = value
+
+def normalize_days(days: Any) -> List[str]:
+    """
+    Normalize days to lowercase three-letter abbreviations.
+
+    Accepts full or abbreviated names in any case, ranges such as
+    ``"Mon-Fri"`` or ``"monday through friday"``, and groups such as
+    ``"weekdays"``. Unrecognized names are passed through lowercased; no
+    days at all means every day.
+
+    Args:
+        days: List of day names, or a single string such as ``"MON-FRI, SAT"``
+
+    Returns:
+        List[str]: Days in the order given, without duplicates
+    """
+    if not days:
+        return list(ALL_DAYS)
+    key = _memo_key(days)
+    normalized = _DAYS_MEMO.get(key) if key is not None else None
+    if normalized is None:
+        normalized = _expand_days(days)
+        if key is not None:
+            _remember(_DAYS_MEMO, key, normalized)
+    return list(normalized)
+
+def normalize_time(value: Any, default: str, end: bool = False) -> str:
+    """
+    Normalize a time of day to ``HH:MM``.
+
+    Args:
+        value: Time such as ``"9:00"``, ``"9am"``, ``"6:30 p.m."`` or ``"noon"``
+        default: Returned when no time is given
+        end: Whether this is an end time; midnight then means end of day
+
+    Returns:
+        str: Normalized time; unrecognized strings are passed through unchanged
+    """
+    if not value or not isinstance(value, str):
+        return default
+    key = value if value in _TIME_TABLE else value.strip().lower().replace(' ', '').replace('.', '')
+    if end and key in _END_TIMES:
+        return _END_TIMES[key]
+    return _TIME_TABLE.get(key, value)
+
+def normalize_activity(activity: Any) -> str:
+    """Map an activity name onto the CDS activity it denotes (default ``parking``)."""
+    if not activity or not isinstance(activity, str):
+        return 'parking'
+    hit = _ACTIVITY_TABLE.get(activity)
+    if hit is not None:
+        return hit
+    key = _NOT_ALNUM.sub('_', activity.lower()).strip('_')
+    return _ACTIVITY_TABLE.get(key, key or 'parking')
+
+def _to_minutes(value: Any) -> Optional[int]:
+    """Parse a duration in minutes from ``120``, ``"120"`` or ``"2 hours"``."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(round(value)) if math.isfinite(value) else None
+    if isinstance(value, str):
+        match = _DURATION.fullmatch(value.strip().lower())
+        if match:
+            amount = float(match.group(1))
+            unit = match.group(2) or 'min'
+            return int(round(amount * 60 if unit.startswith('h') else amount))
+    return None
+
+def _to_amount(value: Any) -> Optional[float]:
+    """Parse a price from ``2.5`` or ``"$2.50"``."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) else None
+    if isinstance(value, str):
+        match = _AMOUNT.search(value.replace(',', ''))
+        if match:
+            return float(match.group())
+    return None
+
+def normalize_rate(payment: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Normalize a rate; returns None if it has no usable amount."""
+    amount = _to_amount(payment.get('rate', 0))
+    if amount is None:
+        logger.warning(f"Dropping rate with unparseable amount: {payment.get('rate')!r}")
+        return None
+
+    unit = payment.get('rate_unit') or 'hour'
+    unit = str(unit).strip().lower().lstrip('/').replace('per ', '')
+    period = str(payment.get('rate_unit_period') or 'rolling').strip().lower()
+    return {
+        'rate': amount,
+        'rate_unit': _RATE_UNIT_TABLE.get(unit, unit),
+        'rate_unit_period': _RATE_PERIODS.get(period, RateUnitPeriod.ROLLING.value)
+    }
+
+def normalize_rule(rule: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize one rule (or a legacy regulation) to CDS format."""
+    # Values already in CDS form are copied with plain table lookups; only
+    # the rest go through the parsers. This runs once per rule, so the fast
+    # paths are inlined rather than calling the field normalizers.
+    try:
+        normalized: Dict[str, Any] = {'activity': _ACTIVITY_TABLE[rule['activity']]}
+    except (KeyError, TypeError):
+        normalized = {'activity': normalize_activity(rule.get('activity'))}
+
+    if 'max_stay' in rule:
+        max_stay = rule['max_stay']
+        if max_stay.__class__ is int:
+            normalized['max_stay'] = max_stay
+        else:
+            minutes = _to_minutes(max_stay)
+            if minutes is not None:
+                normalized['max_stay'] = minutes
+            elif max_stay is not None:
+                logger.warning(f"Dropping unparseable max_stay: {max_stay!r}")
+
+    if 'payment' in rule or 'rate' in rule:
+        payment = rule.get('payment')
+        if payment is None:
+            payment = rule.get('rate')
+        try:
+            amount = payment['rate']
+            if type(amount) is not float or not math.isfinite(amount):
+                raise TypeError(amount)
+            normalized['rate'] = {
+                'rate': amount,
+                'rate_unit': _RATE_UNIT_TABLE[payment.get('rate_unit', 'hour')],
+                'rate_unit_period': _RATE_PERIODS[payment.get('rate_unit_period', 'rolling')]
+            }
+        except (KeyError, TypeError):
+            if isinstance(payment, dict):
+                rate = normalize_rate(payment)
+                if rate is not None:
+                    normalized['rate'] = rate
+
+    if 'user_classes' in rule:
+        user_classes = rule['user_classes']
+        # Shared with the source, as before; validation copies it anyway
+        if user_classes.__class__ is list:
+            normalized['user_classes'] = user_classes
+        elif isinstance(user_classes, str):
+            normalized['user_classes'] = [user_classes]
+        elif isinstance(user_classes, list):
+            normalized['user_classes'] = list(user_classes)
+
+    return normalized
+
+def _normalize_span(days: Any, start: Any, end: Any) -> Tuple[Tuple[str, ...], str, str]:
+    key = (_memo_key(days), start, end)
+    try:
+        normalized = _SPAN_MEMO.get(key)
+    except TypeError:
+        key, normalized = None, None
+    if normalized is None:
+        normalized = (
+            _expand_days(days) if days else ALL_DAYS,
+            normalize_time(start, DEFAULT_START),
+            normalize_time(end, DEFAULT_END, end=True)
+        )
+        if key is not None and key[0] is not None:
+            _remember(_SPAN_MEMO, key, normalized)
+    return normalized
+
+def normalize_time_spans(time_spans: Any) -> List[Dict[str, Any]]:
+    """Normalize time spans to CDS format, skipping entries that aren't objects."""
+    if not time_spans or not isinstance(time_spans, list):
+        return []
+
+    normalized = []
+    for span in time_spans:
+        if not isinstance(span, dict):
+            continue
+        days = span.get('days')
+        if days is None:
+            days = span.get('days_of_week')
+        start = span.get('start_time')
+        if start is None:
+            start = span.get('time_of_day_start')
+        end = span.get('end_time')
+        if end is None:
+            end = span.get('time_of_day_end')
+
+        days, start, end = _normalize_span(days, start, end)
+        normalized.append({
+            'days_of_week': list(days),
+            'time_of_day_start': start,
+            'time_of_day_end': end
+        })
+    return normalized
+
+def normalize_policy(source_policy: Dict[str, Any], published_date: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Map one parsed policy (or legacy regulation) onto a CDS policy.
+
+    Args:
+        source_policy: Policy object from the LLM response
+        published_date: Timestamp shared by every policy of one response
+
+    Returns:
+        dict: CDS policy whose ``curb_policy_id`` is a hash of its content,
+        so identical policies on different signs share one ID
+    """
+    policy: Dict[str, Any] = {
+        'curb_policy_id': None,
+        'published_date': published_date if published_date is not None else now_ms(),
+        'time_spans': normalize_time_spans(source_policy.get('time_spans'))
+    }
+
+    priority = source_policy.get('priority')
+    if isinstance(priority, int) and not isinstance(priority, bool):
+        policy['priority'] = priority
+
+    if 'rules' in source_policy:
+        rules = source_policy['rules'] if isinstance(source_policy['rules'], list) else []
+        policy['rules'] = [normalize_rule(r) for r in rules if isinstance(r, dict)]
+    else:
+        # Convert old regulation format to rule
+        policy['rules'] = [normalize_rule(source_policy)]
+
+    policy['curb_policy_id'] = policy_id(policy)
+    return policy
+
+def normalize_location(location_data: Any) -> Optional[Dict[str, Any]]:
+    """Validate a GeoJSON point; returns None unless it has two numeric coordinates."""
+    if not isinstance(location_data, dict):
+        return None
+    coordinates = location_data.get('coordinates')
+    if not isinstance(coordinates, (list, tuple)) or len(coordinates) != 2:
+        return None
+    try:
+        coordinates = [float(c) for c in coordinates]
+    except (TypeError, ValueError):
+        return None
+    return {'type': str(location_data.get('type') or 'Point'), 'coordinates': coordinates}
+
+def cds_document(
+    policies: List[Dict[str, Any]],
+    location_data: Optional[dict],
+    last_updated: Optional[int] = None
+) -> Dict[str, Any]:
+    """Wrap normalized policies in the CDS sign structure."""
+    cds_data: Dict[str, Any] = {
+        'version': '1.0',
+        'currency': 'USD',
+        'last_updated': last_updated if last_updated is not None else now_ms(),
+        'policies': policies
+    }
+
+    location = normalize_location(location_data)
+    if location:
+        cds_data['location'] = location
+
+    return cds_data
+
+def to_cds(data: Any, location_data: Optional[dict] = None) -> Dict[str, Any]:
+    """
+    Map a parsed LLM response onto the CDS sign structure.
+
+    Args:
+        data: Decoded LLM response
+        location_data: Location metadata extracted from the image
+
+    Returns:
+        dict: CDS sign data, ready for ``build_sign_data``
+    """
+    timestamp = now_ms()
+    source_policies: Any = []
+    if isinstance(data, dict):
+        if 'regulations' in data:
+            source_policies = data['regulations']
+        elif 'policies' in data:
+            source_policies = data['policies']
+    if not isinstance(source_policies, list):
+        source_policies = []
+
+    policies = [
+        normalize_policy(source_policy, timestamp)
+        for source_policy in source_policies if isinstance(source_policy, dict)
+    ]
+    return cds_document(policies, location_data, timestamp)
+
+def build_policy(policy: Dict[str, Any]) -> CurbPolicy:
+    """Construct a CurbPolicy from ``normalize_policy`` output."""
+    return _POLICY_VALIDATOR.validate_python(policy)
+
+def build_sign_data(cds_data: Dict[str, Any]) -> SignData:
+    """
+    Construct SignData from ``to_cds`` / ``cds_document`` output.
+
+    Runs the models' compiled pydantic-core validators directly. With
+    pydantic v2 this is about three times faster than ``model_construct``,
+    whose pure-Python field assignment costs more than validating data that
+    already has the declared types.
+    """
+    return _SIGN_DATA_VALIDATOR.validate_python(cds_data)
@@ -1,165 +1,673 @@
 import json
 import logging
-from datetime import datetime
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple, Union
 
-from .models.data_models import SignData
-from .processors.image_processor import ImageProcessor
-from .providers.claude import ClaudeProvider
-from .providers.gpt4 import GPT4VisionProvider
+from .models.batch import BatchItem, BatchJob
+from .models.data_models import CurbPolicy, Location, SignData
+from .normalization import (
+    build_policy,
+    build_sign_data,
+    cds_document,
+    normalize_days,
+    normalize_policy,
+    normalize_rule,
+    normalize_time_spans,
+    now_ms,
+    to_cds,
+)
+from .pipeline import iter_pipelined
+from .processors.image_processor import (
+    ImageInput,
+    ImageProcessor,
+    PerceptualHashIndex,
+    compute_dhash,
+    describe_source,
+)
+from .providers.registry import get_provider_class
+from .utils.exceptions import ImageProcessingError, ParsingError, ProviderError
+from .utils.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+
+if TYPE_CHECKING:
+    from .storage.result_cache import ResultCache
 
 logger = logging.getLogger(__name__)
 
-class CurbSignParser:
-    """Parser for extracting curb rules from sign images."""
+ImageSource = ImageInput
+ParseResult = Union[SignData, Exception]
+
+# Scanner states: what the next token may be
+_VALUE, _VALUE_OR_CLOSE, _KEY, _KEY_OR_CLOSE, _COLON, _COMMA_OR_CLOSE, _DONE = range(7)
+
+class IncrementalPolicyParser:
+    """
+    Incremental JSON scanner for streamed LLM responses.
+
+    Feed it the response text chunk by chunk. Each object directly inside the
+    top-level ``policies`` (or legacy ``regulations``) array is decoded and
+    returned as soon as its closing brace arrives. JSON structure is checked
+    as the text arrives, and ParsingError is raised as soon as the text can no
+    longer be the start of a valid JSON document, so the caller can abort
+    generation instead of paying for the rest of it.
+    """
+
+    POLICY_KEYS = ('policies', 'regulations')
+
+    _TOKEN = re.compile(r'[{}\[\]:,"]|[^\s{}\[\]:,"]+')
+    _STRING_SPECIAL = re.compile(r'["\\]')
+    _SCALAR = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null')
+    _NUMBER_PREFIX = re.compile(r'-?\d*(?:\.\d*)?(?:[eE][+-]?\d*)?')
+
+    def __init__(self):
+        self.text = ''
+        self._pos = 0
+        self._stack: List[str] = []
+        self._state = _VALUE
+        self._in_string = False
+        self._string_is_key = False
+        self._string_start = 0
+        self._key: Optional[str] = None
+        self._policy_depth: Optional[int] = None
+        self._policies_done = False
+        self._policy_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[dict]:
+        """
+        Add a chunk of response text.
+
+        Returns:
+            List[dict]: Policies completed by this chunk, in order
+
+        Raises:
+            ParsingError: If the text so far cannot be valid JSON
+        """
+        self.text += chunk
+        return self._scan(final=False)
+
+    def close(self) -> List[dict]:
+        """
+        Signal the end of the response.
+
+        Returns:
+            List[dict]: Policies completed by the final token, if any
 
-    PROVIDERS = {
-        'claude': ClaudeProvider,
-        'gpt4': GPT4VisionProvider
-    }
+        Raises:
+            ParsingError: If the response is not one complete JSON value
+        """
+        policies = self._scan(final=True)
+        if self._in_string or self._state != _DONE:
+            self._fail(len(self.text), "response ended before the JSON document was complete")
+        return policies
+
+    def _fail(self, pos: int, reason: str) -> None:
+        snippet = self.text[max(0, pos - 20):pos + 20]
+        raise ParsingError(f"LLM response is not valid JSON at offset {pos} ({reason}): {snippet!r}")
+
+    def _value_done(self) -> None:
+        self._state = _COMMA_OR_CLOSE if self._stack else _DONE
+
+    def _scan(self, final: bool) -> List[dict]:
+        text = self.text
+        end = len(text)
+        pos = self._pos
+        policies = []
+
+        while pos < end:
+            if self._in_string:
+                match = self._STRING_SPECIAL.search(text, pos)
+                if match is None:
+                    pos = end
+                    break
+                if match.group() == '\\':
+                    # Skip the escaped character, waiting for it if it hasn't arrived
+                    if match.end() >= end:
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                pos = match.end()
+                self._in_string = False
+                if self._string_is_key:
+                    if len(self._stack) == 1:
+                        try:
+                            self._key = json.loads(text[self._string_start:pos])
+                        except json.JSONDecodeError as e:
+                            self._fail(self._string_start + e.pos, e.msg)
+                    self._state = _COLON
+                else:
+                    self._value_done()
+                continue
+
+            match = self._TOKEN.search(text, pos)
+            if match is None:
+                pos = end
+                break
+            token = match.group()
+            state = self._state
+
+            if token not in '{}[]:,"':
+                # Bare scalar; one ending the buffer may continue in the next chunk
+                if match.end() == end and not final:
+                    if state not in (_VALUE, _VALUE_OR_CLOSE) or not (
+                        self._NUMBER_PREFIX.fullmatch(token)
+                        or any(word.startswith(token) for word in ('true', 'false', 'null'))
+                    ):
+                        self._fail(match.start(), "unexpected token")
+                    pos = match.start()
+                    break
+                if state not in (_VALUE, _VALUE_OR_CLOSE) or not self._SCALAR.fullmatch(token):
+                    self._fail(match.start(), "unexpected token")
+                self._value_done()
+            elif token == '"':
+                if state not in (_VALUE, _VALUE_OR_CLOSE, _KEY, _KEY_OR_CLOSE):
+                    self._fail(match.start(), "unexpected string")
+                self._in_string = True
+                self._string_is_key = state in (_KEY, _KEY_OR_CLOSE)
+                self._string_start = match.start()
+            elif token in '{[':
+                if state not in (_VALUE, _VALUE_OR_CLOSE):
+                    self._fail(match.start(), f"unexpected {token!r}")
+                depth = len(self._stack)
+                if (token == '[' and depth == 1 and self._key in self.POLICY_KEYS
+                        and self._policy_depth is None and not self._policies_done):
+                    self._policy_depth = 2
+                elif token == '{' and depth == self._policy_depth:
+                    self._policy_start = match.start()
+                self._stack.append(token)
+                self._state = _KEY_OR_CLOSE if token == '{' else _VALUE_OR_CLOSE
+            elif token in '}]':
+                opener = '{' if token == '}' else '['
+                allowed = (_KEY_OR_CLOSE if token == '}' else _VALUE_OR_CLOSE, _COMMA_OR_CLOSE)
+                if not self._stack or self._stack[-1] != opener or state not in allowed:
+                    self._fail(match.start(), f"unexpected {token!r}")
+                self._stack.pop()
+                depth = len(self._stack)
+                if self._policy_start is not None and depth == self._policy_depth:
+                    try:
+                        policies.append(json.loads(text[self._policy_start:match.end()]))
+                    except json.JSONDecodeError as e:
+                        self._fail(self._policy_start + e.pos, e.msg)
+                    self._policy_start = None
+                elif self._policy_depth is not None and depth < self._policy_depth:
+                    self._policy_depth = None
+                    self._policies_done = True
+                self._value_done()
+            elif token == ':':
+                if state != _COLON:
+                    self._fail(match.start(), "unexpected ':'")
+                self._state = _VALUE
+            else:
+                if state != _COMMA_OR_CLOSE:
+                    self._fail(match.start(), "unexpected ','")
+                self._state = _KEY if self._stack[-1] == '{' else _VALUE
+            pos = match.end()
+
+        self._pos = pos
+        return policies
+
+class BaseCurbSignParser:
+    """Shared provider setup and response normalization for sign parsers."""
 
     def __init__(
         self,
         api_key: str,
         provider: str = 'claude',
+        cache: Optional['ResultCache'] = None,
+        duplicate_index: Optional[PerceptualHashIndex] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        stream: bool = False,
         **kwargs
     ):
-        if provider not in self.PROVIDERS:
-            raise ValueError(
-                f"Unsupported provider: {provider}. "
-                f"Supported providers: {', '.join(self.PROVIDERS.keys())}"
-            )
+        """
+        Initialize the parser.
+
+        Args:
+            api_key: Provider API key
+            provider: Provider name registered under the
+                ``curb_sign_parser.providers`` entry point group
+            cache: Optional persistent cache of LLM responses
+            duplicate_index: Optional perceptual-hash index; near-duplicate
+                images reuse an earlier result instead of calling the provider
+            instrumentation: Receives timed spans for each parsing stage
+            stream: Stream provider responses, decoding each policy as it
+                arrives and aborting generation as soon as the response
+                cannot be valid JSON
+            **kwargs: Extra provider options
+        """
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        self.stream = stream
+        self.provider = get_provider_class(provider)(
+            api_key, instrumentation=self.instrumentation, **kwargs
+        )
+        self.image_processor = ImageProcessor(
+            max_size=self.provider.max_image_size,
+            instrumentation=self.instrumentation
+        )
+        self.cache = cache
+        self.duplicate_index = duplicate_index
 
-        self.provider = self.PROVIDERS[provider](api_key, **kwargs)
-        self.image_processor = ImageProcessor(max_size=self.provider.max_image_size)
-
-    def _normalize_days(self, days):
-        """Normalize day format to lowercase three-letter abbreviations."""
-        day_mapping = {
-            'MONDAY': 'mon', 'MON': 'mon', 'monday': 'mon',
-            'TUESDAY': 'tue', 'TUE': 'tue', 'tuesday': 'tue',
-            'WEDNESDAY': 'wed', 'WED': 'wed', 'wednesday': 'wed',
-            'THURSDAY': 'thu', 'THU': 'thu', 'thursday': 'thu',
-            'FRIDAY': 'fri', 'FRI': 'fri', 'friday': 'fri',
-            'SATURDAY': 'sat', 'SAT': 'sat', 'saturday': 'sat',
-            'SUNDAY': 'sun', 'SUN': 'sun', 'sunday': 'sun'
-        }
-        return [day_mapping.get(d, d.lower()) for d in days] if days else ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
-
-    def _normalize_time_spans(self, time_spans):
-        """Normalize time spans to CDS format."""
-        if not time_spans:
-            return []
-
-        normalized = []
-        for span in time_spans:
-            normalized_span = {
-                "days_of_week": self._normalize_days(span.get("days", [])),
-                "time_of_day_start": span.get("start_time", "00:00") or "00:00",
-                "time_of_day_end": span.get("end_time", "23:59") or "23:59"
-            }
-            normalized.append(normalized_span)
-        return normalized
-
-    def _normalize_rules(self, rule):
-        """Normalize rules to CDS format."""
-        normalized = {
-            "activity": rule.get("activity", "parking"),
-        }
-
-        if "max_stay" in rule:
-            normalized["max_stay"] = rule["max_stay"]
-
-        if "payment" in rule:
-            payment = rule["payment"]
-            if isinstance(payment, dict):
-                normalized["rate"] = {
-                    "rate": float(payment.get("rate", 0)),
-                    "rate_unit": payment.get("rate_unit", "hour"),
-                    "rate_unit_period": payment.get("rate_unit_period", "rolling")
-                }
-
-        if "user_classes" in rule:
-            normalized["user_classes"] = rule["user_classes"]
-
-        return normalized
-
-    def parse_sign(self, image_path: str) -> SignData:
-        """Process image and extract curb rules."""
+    def _cache_lookup(self, image_bytes: bytes) -> Tuple[Optional[str], Optional[str]]:
+        """Return the cache key and cached LLM response for processed image bytes."""
+        if self.cache is None:
+            return None, None
+        key = self.cache.make_key(image_bytes, self.provider)
+        return key, self.cache.get(key)
+
+    def _cache_store(self, key: Optional[str], llm_response: str) -> None:
+        """Cache an LLM response, skipping responses that aren't valid JSON."""
+        if key is None:
+            return
         try:
-            logger.info(f"Starting to process image: {image_path}")
+            json.loads(llm_response)
+        except json.JSONDecodeError:
+            logger.warning("Not caching LLM response that is not valid JSON")
+            return
+        self.cache.put(key, llm_response)
 
-            # Process image and get location data
-            processed_data = self.image_processor.process_image(image_path)
-            image_bytes, location_data = processed_data
+    def _find_duplicate(
+        self,
+        image_bytes: bytes,
+        location_data: Optional[dict]
+    ) -> Tuple[Optional[int], Optional[SignData]]:
+        """Return the image's perceptual hash and any near-duplicate result."""
+        if self.duplicate_index is None:
+            return None, None
 
-            logger.info(f"Location data extracted: {location_data}")
+        image_hash = compute_dhash(image_bytes)
+        coordinates = location_data.get("coordinates") if location_data else None
+        match = self.duplicate_index.query(image_hash, coordinates)
+        if match is None:
+            return image_hash, None
 
-            # Get LLM analysis
-            llm_response = self.provider.process_image(image_bytes)
-            logger.info(f"Raw LLM response: {llm_response[:500]}...")
+        sign_data, distance = match
+        logger.info(f"Reusing result from near-duplicate image (distance {distance})")
+        location = Location(**location_data) if location_data else None
+        return image_hash, sign_data.model_copy(update={"location": location}, deep=True)
 
-            try:
+    def _remember_duplicate(
+        self,
+        image_hash: Optional[int],
+        sign_data: SignData,
+        location_data: Optional[dict]
+    ) -> None:
+        """Record a freshly parsed result for future near-duplicate lookups."""
+        if image_hash is None or not sign_data.policies:
+            return
+        coordinates = location_data.get("coordinates") if location_data else None
+        self.duplicate_index.add(image_hash, sign_data, coordinates)
+
+    # Kept as methods for callers of the pre-``normalization`` API; aliased
+    # rather than wrapped so per-rule calls don't pay an extra frame
+    _normalize_days = staticmethod(normalize_days)
+    _normalize_time_spans = staticmethod(normalize_time_spans)
+    _normalize_rules = staticmethod(normalize_rule)
+
+    def _normalize_policy(self, source_policy: dict, published_date: Optional[int] = None) -> dict:
+        """Map one parsed policy (or legacy regulation) onto a CDS policy."""
+        return normalize_policy(source_policy, published_date)
+
+    def _cds_document(self, policies: List[dict], location_data: Optional[dict]) -> dict:
+        """Wrap normalized policies in the CDS sign structure."""
+        return cds_document(policies, location_data)
+
+    _to_cds = staticmethod(to_cds)
+
+    def _build_sign_data(self, llm_response: str, location_data: Optional[dict]) -> SignData:
+        """Normalize a raw LLM response into CDS-compliant SignData."""
+        try:
+            with self.instrumentation.span('json_parse', chars=len(llm_response)):
                 data = json.loads(llm_response)
-                logger.info(f"Parsed JSON data: {json.dumps(data, indent=2)}")
-
-                # Initialize basic structure
-                cds_data = {
-                    "version": "1.0",
-                    "currency": "USD",
-                    "last_updated": int(datetime.now().timestamp() * 1000),
-                    "policies": []
-                }
-
-                # Add location if available
-                if location_data:
-                    cds_data["location"] = location_data
-
-                # Convert regulations/policies
-                source_policies = []
-                if "regulations" in data:
-                    source_policies = data["regulations"]
-                elif "policies" in data:
-                    source_policies = data["policies"]
-
-                # Process each policy/regulation
-                for idx, source_policy in enumerate(source_policies):
-                    policy = {
-                        "curb_policy_id": str(idx),
-                        "published_date": int(datetime.now().timestamp() * 1000)
-                    }
-
-                    # Handle time spans
-                    if "time_spans" in source_policy:
-                        policy["time_spans"] = self._normalize_time_spans(source_policy["time_spans"])
-
-                    # Handle rules
-                    if "rules" in source_policy:
-                        policy["rules"] = [self._normalize_rules(r) for r in source_policy["rules"]]
-                    else:
-                        # Convert old regulation format to rule
-                        policy["rules"] = [self._normalize_rules(source_policy)]
-
-                    # Add time spans if missing
-                    if "time_spans" not in policy:
-                        time_spans = source_policy.get("time_spans", [])
-                        policy["time_spans"] = self._normalize_time_spans(time_spans)
-
-                    cds_data["policies"].append(policy)
-
-                logger.info(f"Final CDS data structure: {json.dumps(cds_data, indent=2)}")
-
-                return SignData(**cds_data)
-
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse LLM response as JSON: {e}")
-                logger.debug(f"Raw response: {llm_response}")
-                return SignData(
-                    version="1.0",
-                    currency="USD",
-                    policies=[],
-                    last_updated=int(datetime.now().timestamp() * 1000)
-                )
+            # Guarded so the payload is only re-serialized when debug logging is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Parsed JSON data: {json.dumps(data, indent=2)}")
+
+            with self.instrumentation.span('normalize'):
+                cds_data = self._to_cds(data, location_data)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Final CDS data structure: {json.dumps(cds_data, indent=2)}")
+
+            with self.instrumentation.span('validate'):
+                return build_sign_data(cds_data)
+
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse LLM response as JSON: {e}")
+            logger.debug(f"Raw response: {llm_response}")
+            return SignData(
+                version="1.0",
+                currency="USD",
+                policies=[],
+                last_updated=now_ms()
+            )
+
+
+    def _build_streamed_sign_data(self, policies: Iterable[dict], location_data: Optional[dict]) -> SignData:
+        """Collect streamed CDS policies into SignData."""
+        try:
+            policies = list(policies)
+        except ParsingError as e:
+            # Same outcome as an unparseable non-streamed response
+            logger.error(f"Failed to parse streamed LLM response as JSON: {e}")
+            policies = []
+
+        with self.instrumentation.span('validate'):
+            return build_sign_data(self._cds_document(policies, location_data))
+
+
+class CurbSignParser(BaseCurbSignParser):
+    """Parser for extracting curb rules from sign images."""
+
+    def parse_sign(self, image_path: ImageSource) -> SignData:
+        """
+        Process image and extract curb rules.
+
+        Args:
+            image_path: Image path, encoded bytes, binary file object or PIL image
+
+        Returns:
+            SignData: CDS-compliant sign data
+        """
+        try:
+            logger.info(f"Starting to process image: {describe_source(image_path)}")
+
+            with self.instrumentation.span('parse_sign'):
+                # Process image and get location data
+                processed_data = self.image_processor.process_image(image_path)
+                image_bytes, location_data = processed_data
+
+                logger.info(f"Location data extracted: {location_data}")
+
+                return self.parse_processed(image_bytes, location_data)
 
         except Exception as e:
             logger.error(f"Error processing sign: {e}", exc_info=True)
             raise
+
+    def parse_processed(self, image_bytes: bytes, location_data: Optional[dict] = None) -> SignData:
+        """
+        Extract curb rules from an already processed image.
+
+        Args:
+            image_bytes: JPEG bytes as returned by ImageProcessor.process_image
+            location_data: Location metadata returned alongside the image
+
+        Returns:
+            SignData: CDS-compliant sign data
+        """
+        image_hash, duplicate = self._find_duplicate(image_bytes, location_data)
+        if duplicate is not None:
+            return duplicate
+
+        if self.stream:
+            sign_data = self._build_streamed_sign_data(self._stream_policies(image_bytes), location_data)
+            self._remember_duplicate(image_hash, sign_data, location_data)
+            return sign_data
+
+        # Get LLM analysis, reusing a cached response when available
+        cache_key, llm_response = self._cache_lookup(image_bytes)
+        if llm_response is None:
+            llm_response = self.provider.process_image(image_bytes)
+            self._cache_store(cache_key, llm_response)
+        else:
+            logger.info("Using cached LLM response")
+        logger.info(f"Raw LLM response: {llm_response[:500]}...")
+
+        sign_data = self._build_sign_data(llm_response, location_data)
+        self._remember_duplicate(image_hash, sign_data, location_data)
+        return sign_data
+
+    def iter_policies(self, image_path: ImageSource) -> Iterator[CurbPolicy]:
+        """
+        Stream the policies on a sign as the provider generates them.
+
+        Each policy is normalized and yielded as soon as its JSON object is
+        complete, before the rest of the response has arrived. Closing the
+        iterator early aborts generation.
+
+        Args:
+            image_path: Image path, encoded bytes, binary file object or PIL image
+
+        Returns:
+            Iterator[CurbPolicy]: Policies in response order
+
+        Raises:
+            ParsingError: If the response turns out not to be valid JSON;
+                generation is aborted as soon as that is detected
+        """
+        image_bytes, _ = self.image_processor.process_image(image_path)
+        for policy in self._stream_policies(image_bytes):
+            yield build_policy(policy)
+
+    def _stream_policies(self, image_bytes: bytes) -> Iterator[dict]:
+        """Yield normalized CDS policies from a streamed (or cached) response."""
+        cache_key, llm_response = self._cache_lookup(image_bytes)
+        if llm_response is not None:
+            logger.info("Using cached LLM response")
+            chunks = iter([llm_response])
+        else:
+            chunks = self.provider.stream_image(image_bytes)
+
+        decoder = IncrementalPolicyParser()
+        published_date = now_ms()
+        try:
+            for chunk in chunks:
+                for source_policy in decoder.feed(chunk):
+                    yield self._normalize_policy(source_policy, published_date)
+            for source_policy in decoder.close():
+                yield self._normalize_policy(source_policy, published_date)
+        finally:
+            # Closing the provider stream before it finishes aborts generation
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+
+        if llm_response is None:
+            self._cache_store(cache_key, decoder.text)
+
+    def parse_iter(
+        self,
+        image_paths: Iterable[ImageSource],
+        max_workers: int = 8,
+        max_in_flight: Optional[int] = None
+    ) -> Iterator[Tuple[ImageSource, ParseResult]]:
+        """
+        Parse many images concurrently, yielding results as they complete.
+
+        Jobs run on a bounded thread pool so provider round trips overlap.
+        At most ``max_in_flight`` images are submitted at once, and
+        ``image_paths`` is consumed lazily, so arbitrarily long inputs can be
+        streamed through. A failure on one image is yielded as the exception
+        instance instead of aborting the remaining work.
+
+        Args:
+            image_paths: Iterable of image paths
+            max_workers: Number of worker threads
+            max_in_flight: Maximum number of submitted but unfinished jobs
+                (defaults to ``2 * max_workers``)
+
+        Returns:
+            Iterator[Tuple[path, SignData | Exception]]: Results in completion order
+        """
+        for _, path, result in self._iter_indexed(image_paths, max_workers, max_in_flight):
+            yield path, result
+
+    def parse_batch(
+        self,
+        image_paths: Iterable[ImageSource],
+        max_workers: int = 8,
+        max_in_flight: Optional[int] = None
+    ) -> List[ParseResult]:
+        """
+        Parse many images concurrently and return results in input order.
+
+        Args:
+            image_paths: Iterable of image paths
+            max_workers: Number of worker threads
+            max_in_flight: Maximum number of submitted but unfinished jobs
+
+        Returns:
+            List[SignData | Exception]: One entry per input image; failed images
+            are represented by the exception that was raised
+        """
+        results = {}
+        for idx, _, result in self._iter_indexed(image_paths, max_workers, max_in_flight):
+            results[idx] = result
+        return [results[idx] for idx in range(len(results))]
+
+    def submit_batch(self, image_paths: Iterable[ImageSource]) -> BatchJob:
+        """
+        Preprocess images and submit them through the provider's batch API.
+
+        Intended for overnight reprocessing: results arrive within hours at a
+        fraction of the interactive price. The returned job can be saved with
+        ``model_dump_json`` and passed to ``collect_batch`` later, even from
+        another process. Very large surveys should be submitted in chunks to
+        stay under the provider's batch size limits.
+
+        Args:
+            image_paths: Iterable of image sources
+
+        Returns:
+            BatchJob: Handle describing the submitted batch
+        """
+        job = BatchJob(provider=type(self.provider).__name__)
+        images = {}
+
+        for idx, source in enumerate(image_paths):
+            custom_id = f"img-{idx}"
+            try:
+                image_bytes, location_data = self.image_processor.process_image(source)
+            except Exception as e:
+                logger.error(f"Error processing image {describe_source(source)}: {e}")
+                job.items[custom_id] = BatchItem(source=describe_source(source), error=str(e))
+                continue
+            images[custom_id] = image_bytes
+            job.items[custom_id] = BatchItem(source=describe_source(source), location=location_data)
+
+        if images:
+            job.batch_id = self.provider.submit_batch(images)
+        return job
+
+    def collect_batch(
+        self,
+        job: BatchJob,
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None
+    ) -> List[Tuple[str, ParseResult]]:
+        """
+        Wait for a submitted batch and normalize its responses like parse_sign.
+
+        Args:
+            job: Handle returned by ``submit_batch``
+            poll_interval: Seconds between status checks
+            timeout: Give up after this many seconds (None waits indefinitely)
+
+        Returns:
+            List[Tuple[source, SignData | Exception]]: Results in submission order
+        """
+        responses = {}
+        if job.batch_id is not None:
+            responses = self.provider.collect_batch(job.batch_id, poll_interval=poll_interval, timeout=timeout)
+
+        results: List[Tuple[str, ParseResult]] = []
+        for custom_id, item in job.items.items():
+            if item.error is not None:
+                results.append((item.source, ImageProcessingError(item.error)))
+                continue
+
+            response = responses.get(custom_id)
+            if response is None:
+                result: ParseResult = ProviderError(f"No batch result for {item.source}")
+            elif isinstance(response, Exception):
+                result = response
+            else:
+                try:
+                    result = self._build_sign_data(response, item.location)
+                except Exception as e:
+                    result = e
+            results.append((item.source, result))
+        return results
+
+    def parse_pipelined(
+        self,
+        image_paths: Iterable[ImageSource],
+        processes: Optional[int] = None,
+        max_workers: int = 8,
+        queue_size: Optional[int] = None
+    ) -> Iterator[Tuple[ImageSource, ParseResult]]:
+        """
+        Parse many images with preprocessing on a process pool.
+
+        Decoding, resizing and encoding run in ``processes`` worker processes
+        while ``max_workers`` threads send the processed images to the
+        provider. A bounded queue between the two stages applies backpressure.
+        Sources must be picklable (paths or bytes).
+
+        Args:
+            image_paths: Iterable of image paths or encoded image bytes
+            processes: Number of preprocessing processes (defaults to CPU count)
+            max_workers: Number of provider threads
+            queue_size: Capacity of the queue between the stages
+                (defaults to ``2 * max_workers``)
+
+        Returns:
+            Iterator[Tuple[path, SignData | Exception]]: Results in completion order
+        """
+        return iter_pipelined(
+            self,
+            image_paths,
+            processes=processes,
+            max_workers=max_workers,
+            queue_size=queue_size
+        )
+
+    def _iter_indexed(
+        self,
+        image_paths: Iterable[ImageSource],
+        max_workers: int,
+        max_in_flight: Optional[int]
+    ) -> Iterator[Tuple[int, ImageSource, ParseResult]]:
+        """Run parse_sign over a bounded window of in-flight jobs."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_in_flight is None:
+            max_in_flight = 2 * max_workers
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        sources = enumerate(image_paths)
+        pending = {}
+        exhausted = False
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="curb-sign-parser"
+        )
+        try:
+            while True:
+                # Top up the window before waiting on the next completion
+                while not exhausted and len(pending) < max_in_flight:
+                    try:
+                        idx, path = next(sources)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[executor.submit(self.parse_sign, path)] = (idx, path)
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    idx, path = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = e
+                    yield idx, path, result
+        finally:
+            # Drop queued work if the consumer stops iterating early
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
@@ -0,0 +1,170 @@
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from .processors.image_processor import ImageProcessor
+
+if TYPE_CHECKING:
+    from .models.data_models import SignData
+    from .parser import CurbSignParser
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's output on a queue
+_DONE = object()
+
+# Processor instance owned by each preprocessing worker process
+_worker_processor: Optional[ImageProcessor] = None
+
+def _init_worker(processor: ImageProcessor) -> None:
+    """Install the parent's image processor in a worker process."""
+    global _worker_processor
+    _worker_processor = processor
+
+def _preprocess(source: Any) -> Tuple[bytes, Optional[Dict[str, Any]]]:
+    """Decode, resize and encode one image inside a worker process."""
+    return _worker_processor.process_image(source)
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Blocking put that gives up once the pipeline is stopped."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _get(q: queue.Queue, stop: threading.Event) -> Any:
+    """Blocking get that gives up once the pipeline is stopped."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+def iter_pipelined(
+    parser: "CurbSignParser",
+    image_sources: Iterable[Any],
+    processes: Optional[int] = None,
+    max_workers: int = 8,
+    queue_size: Optional[int] = None
+) -> Iterator[Tuple[Any, Union["SignData", Exception]]]:
+    """
+    Parse images with a two-stage preprocessing / provider pipeline.
+
+    Stage one runs ``ImageProcessor.process_image`` on a process pool so
+    CPU-bound decode and encode work uses every core. Stage two is a pool of
+    threads that send processed images to the provider. The stages are
+    connected by a bounded queue: when the provider falls behind the queue
+    fills and preprocessing pauses instead of buffering without limit.
+
+    Args:
+        parser: Parser whose image processor and provider are used
+        image_sources: Iterable of picklable image sources (paths or bytes)
+        processes: Number of preprocessing processes (defaults to CPU count)
+        max_workers: Number of provider threads
+        queue_size: Capacity of the queue between the stages
+
+    Returns:
+        Iterator[Tuple[source, SignData | Exception]]: Results in completion order
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes < 1 or max_workers < 1:
+        raise ValueError("processes and max_workers must be at least 1")
+    queue_size = queue_size or 2 * max_workers
+
+    processed_q: queue.Queue = queue.Queue(maxsize=queue_size)
+    results_q: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+
+    def preprocess_stage() -> None:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker,
+                initargs=(parser.image_processor,)
+            ) as executor:
+                sources = iter(image_sources)
+                pending = {}
+                exhausted = False
+
+                while not stop.is_set():
+                    while not exhausted and len(pending) < 2 * processes:
+                        try:
+                            source = next(sources)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        pending[executor.submit(_preprocess, source)] = source
+
+                    if not pending:
+                        break
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        source = pending.pop(future)
+                        try:
+                            item = (source, future.result(), None)
+                        except Exception as e:
+                            item = (source, None, e)
+                        if not _put(processed_q, item, stop):
+                            break
+
+                for future in pending:
+                    future.cancel()
+        except Exception as e:
+            logger.error(f"Preprocessing stage failed: {e}", exc_info=True)
+            _put(results_q, (None, e), stop)
+        finally:
+            for _ in range(max_workers):
+                _put(processed_q, _DONE, stop)
+
+    def provider_stage() -> None:
+        try:
+            while True:
+                item = _get(processed_q, stop)
+                if item is _DONE:
+                    break
+                source, processed, error = item
+                if error is None:
+                    try:
+                        image_bytes, location_data = processed
+                        result = parser.parse_processed(image_bytes, location_data)
+                    except Exception as e:
+                        logger.error(f"Error processing sign: {e}", exc_info=True)
+                        result = e
+                else:
+                    result = error
+                if not _put(results_q, (source, result), stop):
+                    break
+        finally:
+            _put(results_q, _DONE, stop)
+
+    threads = [threading.Thread(target=preprocess_stage, name="curb-sign-preprocess", daemon=True)]
+    threads += [
+        threading.Thread(target=provider_stage, name=f"curb-sign-provider-{i}", daemon=True)
+        for i in range(max_workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        finished = 0
+        while finished < max_workers:
+            item = results_q.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            source, result = item
+            if source is None and isinstance(result, Exception):
+                raise result
+            yield source, result
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
@@ -2,6 +2,18 @@
 Image processing utilities for the Curb Sign Parser.
 """
 
-from .image_processor import ImageProcessor
+from .image_processor import (
+    ImageProcessor,
+    PerceptualHashIndex,
+    ImageInput,
+    compute_dhash,
+    hamming_distance,
+)
 
-__all__ = ["ImageProcessor"]
+__all__ = [
+    "ImageProcessor",
+    "ImageInput",
+    "PerceptualHashIndex",
+    "compute_dhash",
+    "hamming_distance",
+]
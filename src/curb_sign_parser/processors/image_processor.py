@@ -1,16 +1,62 @@
 import io
 import logging
+import math
+import threading
+from itertools import combinations
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, Union
+from typing import Any, BinaryIO, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar, Union
 
+import numpy as np
 import piexif
-import pillow_heif
 from PIL import Image
 
 from ..utils.exceptions import ImageProcessingError
+from ..utils.instrumentation import NULL_INSTRUMENTATION, Instrumentation
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# Anything process_image can read an image from
+ImageInput = Union[str, Path, bytes, bytearray, memoryview, BinaryIO, Image.Image]
+
+# ISO-BMFF brands of HEIF/HEIC images, found after the "ftyp" box type
+_HEIF_BRANDS = frozenset({
+    b'heic', b'heix', b'heim', b'heis', b'hevc', b'hevx', b'hevm', b'hevs', b'mif1', b'msf1'
+})
+
+_heif_lock = threading.Lock()
+_heif_registered = False
+
+def is_heif(header: bytes) -> bool:
+    """Whether encoded image bytes start with a HEIF/HEIC file type box."""
+    return header[4:8] == b'ftyp' and header[8:12] in _HEIF_BRANDS
+
+def register_heif_support() -> None:
+    """
+    Register the pillow-heif opener with Pillow.
+
+    Runs once per process, the first time a HEIF/HEIC image is opened, so
+    processes that never see one don't pay for importing pillow-heif.
+    """
+    global _heif_registered
+    if _heif_registered:
+        return
+    with _heif_lock:
+        if _heif_registered:
+            return
+        try:
+            import pillow_heif
+        except ImportError:
+            logger.error(
+                "HEIC support requires pillow-heif package. "
+                "Install with: pip install pillow-heif"
+            )
+            raise
+        pillow_heif.register_heif_opener()
+        _heif_registered = True
+        logger.info("HEIF/HEIC support initialized successfully")
+
 def convert_to_degrees(value) -> float:
     """
     Convert GPS coordinates stored in EXIF to degrees in float format.
@@ -31,57 +77,90 @@ def convert_to_degrees(value) -> float:
         logger.error(f"Error converting GPS value {value} to degrees: {e}")
         return 0.0
 
-def extract_location_metadata(image_path: Path) -> Optional[Dict[str, Any]]:
+def location_from_exif(exif_data: Optional[bytes]) -> Optional[Dict[str, Any]]:
     """
-    Extract location metadata from image EXIF data.
+    Extract location metadata from raw EXIF bytes.
 
     Args:
-        image_path: Path to the image file
+        exif_data: EXIF block as stored in ``Image.info['exif']``
 
     Returns:
         Optional[Dict]: Location data in CDS format or None if no location data
     """
+    if not exif_data:
+        logger.info("No EXIF data found in image")
+        return None
+
     try:
-        # Open the image
-        with Image.open(image_path) as img:
-            # Get EXIF data using piexif
-            exif_dict = piexif.load(img.info['exif'])
-
-            # Check if GPS data exists
-            if 'GPS' not in exif_dict:
-                logger.info("No GPS data found in image")
-                return None
-
-            gps_info = exif_dict['GPS']
-            logger.debug(f"Found GPS info: {gps_info}")
-
-            # Check if required GPS tags exist
-            # 1: Latitude Ref (N/S), 2: Latitude, 3: Longitude Ref (E/W), 4: Longitude
-            if not all(tag in gps_info for tag in [1, 2, 3, 4]):
-                logger.info("Missing required GPS tags")
-                return None
-
-            # Extract latitude
-            lat = convert_to_degrees(gps_info[2])
-            if gps_info[1] == b'S':
-                lat = -lat
-
-            # Extract longitude
-            lon = convert_to_degrees(gps_info[4])
-            if gps_info[3] == b'W':
-                lon = -lon
-
-            logger.info(f"Successfully extracted coordinates: ({lat}, {lon})")
-
-            return {
-                "type": "Point",
-                "coordinates": [lon, lat]  # GeoJSON format: [longitude, latitude]
-            }
+        # Get EXIF data using piexif
+        exif_dict = piexif.load(exif_data)
+
+        # Check if GPS data exists
+        gps_info = exif_dict.get('GPS')
+        if not gps_info:
+            logger.info("No GPS data found in image")
+            return None
+
+        logger.debug(f"Found GPS info: {gps_info}")
+
+        # Check if required GPS tags exist
+        # 1: Latitude Ref (N/S), 2: Latitude, 3: Longitude Ref (E/W), 4: Longitude
+        if not all(tag in gps_info for tag in [1, 2, 3, 4]):
+            logger.info("Missing required GPS tags")
+            return None
+
+        # Extract latitude
+        lat = convert_to_degrees(gps_info[2])
+        if gps_info[1] == b'S':
+            lat = -lat
+
+        # Extract longitude
+        lon = convert_to_degrees(gps_info[4])
+        if gps_info[3] == b'W':
+            lon = -lon
+
+        logger.info(f"Successfully extracted coordinates: ({lat}, {lon})")
+
+        return {
+            "type": "Point",
+            "coordinates": [lon, lat]  # GeoJSON format: [longitude, latitude]
+        }
 
     except Exception as e:
         logger.error(f"Error extracting location metadata: {e}", exc_info=True)
         return None
 
+def extract_location_metadata(image: Union[str, Path, Image.Image]) -> Optional[Dict[str, Any]]:
+    """
+    Extract location metadata from image EXIF data.
+
+    Args:
+        image: Path to the image file or an open PIL image
+
+    Returns:
+        Optional[Dict]: Location data in CDS format or None if no location data
+    """
+    if isinstance(image, Image.Image):
+        return location_from_exif(image.info.get('exif'))
+
+    try:
+        with open(image, 'rb') as f:
+            if is_heif(f.read(12)):
+                register_heif_support()
+        with Image.open(image) as img:
+            return location_from_exif(img.info.get('exif'))
+    except Exception as e:
+        logger.error(f"Error extracting location metadata: {e}", exc_info=True)
+        return None
+
+def describe_source(source: ImageInput) -> str:
+    """Short description of an image source for log messages."""
+    if isinstance(source, (str, Path)):
+        return str(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return f"<{len(source)} bytes>"
+    return f"<{type(source).__name__}>"
+
 class ImageProcessor:
     """Handles image processing and optimization for LLM providers."""
 
@@ -96,91 +175,409 @@ class ImageProcessor:
         'bmp': 'BMP'
     }
 
-    def __init__(self, max_size: Optional[int] = None):
-        """Initialize image processor."""
-        self.max_size = max_size or (5 * 1024 * 1024)  # Default to 5MB
-        self._setup_heif_support()
-
-    def _setup_heif_support(self):
-        """Configure HEIF/HEIC support."""
-        try:
-            pillow_heif.register_heif_opener()
-            logger.info("HEIF/HEIC support initialized successfully")
-        except ImportError:
-            logger.error(
-                "HEIC support requires pillow-heif package. "
-                "Install with: pip install pillow-heif"
-            )
-            raise
-        except Exception as e:
-            logger.error(f"Failed to initialize HEIC support: {e}")
-            raise
+    # Longest edge of the image sent to providers
+    MAX_DIMENSION = 2048
+
+    # Fixed JPEG quality used when adaptive encoding is off
+    DEFAULT_QUALITY = 95
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        adaptive: bool = False,
+        target_size: Optional[int] = None,
+        min_quality: int = 40,
+        max_quality: int = 95,
+        max_attempts: int = 6,
+        max_downscales: int = 3,
+        instrumentation: Optional[Instrumentation] = None
+    ):
+        """
+        Initialize image processor.
 
-    def process_image(self, image_path: Union[str, Path]) -> Tuple[bytes, Optional[Dict[str, Any]]]:
+        Args:
+            max_size: Hard limit on the encoded image size in bytes
+            adaptive: Search JPEG quality (and downscale if needed) to fit a
+                byte budget instead of encoding at a fixed quality
+            target_size: Byte budget for adaptive encoding (defaults to max_size)
+            min_quality: Lowest JPEG quality tried before downscaling
+            max_quality: Highest JPEG quality tried
+            max_attempts: Maximum trial encodes per resolution
+            max_downscales: Maximum number of 0.75x downscale steps
+            instrumentation: Receives read/exif/decode/resize/encode timings
+        """
+        self.max_size = max_size or (5 * 1024 * 1024)  # Default to 5MB
+        self.adaptive = adaptive
+        self.target_size = min(target_size or self.max_size, self.max_size)
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.max_attempts = max_attempts
+        self.max_downscales = max_downscales
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+
+        # Last quality chosen per resolution class, used as the first guess
+        self._quality_cache: Dict[Tuple[int, int], int] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Hooks stay in the parent; copies sent to worker processes report nothing
+        state = self.__dict__.copy()
+        state['instrumentation'] = NULL_INSTRUMENTATION
+        return state
+
+    @staticmethod
+    def _read_source(source: ImageInput) -> Union[bytes, Image.Image]:
+        """Read an image source into memory exactly once."""
+        if isinstance(source, Image.Image):
+            return source
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return bytes(source)
+        if hasattr(source, 'read'):
+            return source.read()
+
+        path = Path(source)
+        if not path.exists():
+            raise FileNotFoundError(f"Image file not found: {path}")
+        return path.read_bytes()
+
+    def process_image(self, image_source: ImageInput) -> Tuple[bytes, Optional[Dict[str, Any]]]:
         """
         Process image for LLM consumption and extract metadata.
 
+        The source is read into memory once; EXIF location data and pixels are
+        both taken from that single decoded image.
+
         Args:
-            image_path: Path to the image file
+            image_source: Path to the image file, encoded image bytes
+                (``bytes``, ``bytearray`` or ``memoryview``), a binary
+                file-like object, or an open PIL image
 
         Returns:
             Tuple[bytes, Optional[Dict]]: Processed image data and location metadata
         """
-        image_path = Path(image_path)
-
-        if not image_path.exists():
-            raise FileNotFoundError(f"Image file not found: {image_path}")
+        with self.instrumentation.span('read') as span:
+            data = self._read_source(image_source)
+            if not isinstance(data, Image.Image):
+                span['bytes'] = len(data)
 
         try:
-            logger.info(f"Processing image: {image_path}")
-
-            # Extract location metadata first
-            location_data = extract_location_metadata(image_path)
-            logger.info(f"Extracted location data: {location_data}")
-
-            # Process image
-            with Image.open(image_path) as img:
-                logger.info(f"Original image format: {img.format}, mode: {img.mode}, size: {img.size}")
-
-                # Convert to RGB if needed
-                if img.mode not in ('RGB', 'RGBA'):
-                    img = img.convert('RGB')
-                    logger.info("Converted image to RGB mode")
-
-                # Initial resize for very large images
-                max_dimension = 2048
-                width, height = img.size
-                if width > max_dimension or height > max_dimension:
-                    ratio = min(max_dimension / width, max_dimension / height)
-                    width = int(width * ratio)
-                    height = int(height * ratio)
-                    img = img.resize((width, height), Image.Resampling.LANCZOS)
-                    logger.info(f"Resized image to {width}x{height}")
-
-                # Save as JPEG with optimization
-                buffer = io.BytesIO()
-                img.save(buffer, format='JPEG', quality=95, optimize=True)
-                processed_data = buffer.getvalue()
+            logger.info(f"Processing image: {describe_source(image_source)}")
 
-                # Check final size
-                final_size = len(processed_data)
-                logger.info(f"Processed image size: {final_size/1024/1024:.2f}MB")
+            if isinstance(data, Image.Image):
+                return self._process_loaded(data, owned=False)
 
-                if final_size > self.max_size:
-                    raise ImageProcessingError(
-                        f"Processed image size ({final_size/1024/1024:.2f}MB) "
-                        f"exceeds maximum allowed size ({self.max_size/1024/1024:.2f}MB)"
-                    )
+            if is_heif(data[:12]):
+                register_heif_support()
 
-                return processed_data, location_data
+            with Image.open(io.BytesIO(data)) as img:
+                return self._process_loaded(img, owned=True)
 
-        except (pillow_heif.HeifError, OSError) as e:
+        except ImageProcessingError:
+            raise
+        except OSError as e:
             logger.error(f"Error processing image: {e}")
             raise ImageProcessingError(f"Error processing image: {str(e)}")
         except Exception as e:
             logger.error(f"Unexpected error processing image: {e}")
             raise ImageProcessingError(f"Failed to process image: {str(e)}")
 
+    def _target_size(self, size: Tuple[int, int]) -> Tuple[int, int]:
+        """Final output size: fit within MAX_DIMENSION, preserving aspect ratio."""
+        width, height = size
+        if width <= self.MAX_DIMENSION and height <= self.MAX_DIMENSION:
+            return size
+        ratio = min(self.MAX_DIMENSION / width, self.MAX_DIMENSION / height)
+        return int(width * ratio), int(height * ratio)
+
+    def _process_loaded(self, img: Image.Image, owned: bool) -> Tuple[bytes, Optional[Dict[str, Any]]]:
+        """
+        Resize and encode an opened image and read its location metadata.
+
+        Args:
+            img: Opened image
+            owned: Whether this module opened ``img``; images passed in by the
+                caller are never modified in place
+        """
+        # Location comes from the EXIF block already parsed with the image header
+        with self.instrumentation.span('exif'):
+            location_data = location_from_exif(img.info.get('exif'))
+        logger.info(f"Extracted location data: {location_data}")
+
+        logger.info(f"Original image format: {img.format}, mode: {img.mode}, size: {img.size}")
+
+        target_size = self._target_size(img.size)
+
+        with self.instrumentation.span('decode') as span:
+            # Let the JPEG decoder downscale in the DCT domain (1/2, 1/4 or 1/8) so
+            # pixels we'd throw away are never decoded. No-op for other formats or
+            # images that are already loaded. draft() and load() change the image
+            # in place, so only images opened here get them; the conversions below
+            # return new images and leave a caller's image untouched.
+            if owned:
+                if target_size != img.size:
+                    original_size = img.size
+                    img.draft(None, target_size)
+                    if img.size != original_size:
+                        logger.info(f"Decoding at reduced size {img.size}")
+                img.load()
+            span['width'], span['height'] = img.size
+
+            # Convert to RGB if needed
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGB')
+                logger.info("Converted image to RGB mode")
+
+        with self.instrumentation.span('resize'):
+            if img.size != target_size:
+                # reducing_gap does a cheap integer box reduction first, leaving
+                # only the last ~2x step to the full LANCZOS filter
+                img = img.resize(target_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+                logger.info(f"Resized image to {target_size[0]}x{target_size[1]}")
+
+            # JPEG has no alpha channel
+            if img.mode == 'RGBA':
+                img = img.convert('RGB')
+
+        with self.instrumentation.span('encode') as span:
+            if self.adaptive:
+                processed_data = self._encode_adaptive(img)
+            else:
+                # Save as JPEG with optimization
+                processed_data = self._encode(img, self.DEFAULT_QUALITY, optimize=True)
+            span['bytes'] = len(processed_data)
+
+        # Check final size
+        final_size = len(processed_data)
+        logger.info(f"Processed image size: {final_size/1024/1024:.2f}MB")
+
+        if final_size > self.max_size:
+            raise ImageProcessingError(
+                f"Processed image size ({final_size/1024/1024:.2f}MB) "
+                f"exceeds maximum allowed size ({self.max_size/1024/1024:.2f}MB)"
+            )
+
+        return processed_data, location_data
+
+    @staticmethod
+    def _encode(img: Image.Image, quality: int, optimize: bool = False) -> bytes:
+        """Encode an image as JPEG."""
+        buffer = io.BytesIO()
+        img.save(buffer, format='JPEG', quality=quality, optimize=optimize)
+        return buffer.getvalue()
+
+    @staticmethod
+    def _resolution_class(size: Tuple[int, int]) -> Tuple[int, int]:
+        """Bucket image dimensions so similar sources share a quality guess."""
+        return size[0] // 256, size[1] // 256
+
+    def _encode_adaptive(self, img: Image.Image) -> bytes:
+        """
+        Encode as JPEG at the highest quality that fits ``target_size``.
+
+        Binary-searches quality starting from the last quality that worked for
+        this resolution class, skipping ``optimize`` on trial encodes. If even
+        ``min_quality`` is too large, the image is downscaled and searched again.
+        """
+        for _ in range(self.max_downscales + 1):
+            resolution = self._resolution_class(img.size)
+            low, high = self.min_quality, self.max_quality
+            guess = self._quality_cache.get(resolution, high)
+            best: Optional[int] = None
+
+            for _ in range(self.max_attempts):
+                if low > high:
+                    break
+                quality = guess if low <= guess <= high else (low + high + 1) // 2
+                guess = -1
+                if len(self._encode(img, quality)) <= self.target_size:
+                    best, low = quality, quality + 1
+                else:
+                    high = quality - 1
+
+            if best is not None:
+                self._quality_cache[resolution] = best
+                logger.info(f"Adaptive encoding chose quality {best} at {img.size[0]}x{img.size[1]}")
+                # optimize only ever shrinks the output, so the budget still holds
+                return self._encode(img, best, optimize=True)
+
+            width, height = img.size
+            img = img.resize(
+                (max(1, int(width * 0.75)), max(1, int(height * 0.75))),
+                Image.Resampling.LANCZOS
+            )
+            logger.info(f"Downscaled image to {img.size[0]}x{img.size[1]} to meet size budget")
+
+        return self._encode(img, self.min_quality, optimize=True)
+
     def get_mime_type(self, image_path: Union[str, Path]) -> str:
         """Get MIME type for image."""
         return "image/jpeg"  # We always convert to JPEG
+
+
+def compute_dhash(image: Union[bytes, Image.Image], hash_size: int = 8) -> int:
+    """
+    Compute a difference hash (dHash) for an image.
+
+    The image is reduced to a ``(hash_size + 1) x hash_size`` grayscale
+    thumbnail and each bit records whether a pixel is brighter than its right
+    neighbour, which is robust to small changes in exposure, scale and
+    compression.
+
+    Args:
+        image: Encoded image bytes or an open PIL image
+        hash_size: Number of rows/columns compared (64-bit hash by default)
+
+    Returns:
+        int: Hash with ``hash_size ** 2`` bits
+    """
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        with Image.open(io.BytesIO(image)) as img:
+            # Let the JPEG decoder skip most of the pixels we're about to discard
+            img.draft('L', (hash_size * 8, hash_size * 8))
+            return compute_dhash(img.convert('L'), hash_size)
+
+    thumb = image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = np.asarray(thumb, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(a ^ b).count('1')
+
+def haversine_meters(a: Sequence[float], b: Sequence[float]) -> float:
+    """Great-circle distance in meters between two ``[lon, lat]`` points."""
+    lon1, lat1, lon2, lat2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * 6371008.8 * math.asin(math.sqrt(h))
+
+class PerceptualHashIndex(Generic[T]):
+    """
+    Near-duplicate index over 64-bit perceptual hashes.
+
+    Uses multi-index hashing: each hash is split into ``chunks`` substrings
+    with one lookup table per substring. Two hashes within ``max_distance``
+    must agree to within ``max_distance // chunks`` bits on at least one
+    substring, so a query only probes a small neighbourhood of buckets in each
+    table and verifies the resulting candidates, keeping lookups fast as the
+    index grows into the millions.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = 6,
+        max_meters: Optional[float] = None,
+        hash_bits: int = 64,
+        chunks: int = 4
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            max_distance: Maximum Hamming distance treated as a duplicate
+            max_meters: When set, entries with GPS coordinates only match
+                queries within this many meters
+            hash_bits: Bit length of the hashes
+            chunks: Number of substrings the hash is split into
+        """
+        if hash_bits % chunks:
+            raise ValueError("hash_bits must be divisible by chunks")
+        self.max_distance = max_distance
+        self.max_meters = max_meters
+        self.hash_bits = hash_bits
+        self.chunks = chunks
+
+        self._chunk_bits = hash_bits // chunks
+        self._chunk_mask = (1 << self._chunk_bits) - 1
+        self._radius = max_distance // chunks
+        self._flips = [
+            sum(1 << bit for bit in bits)
+            for r in range(self._radius + 1)
+            for bits in combinations(range(self._chunk_bits), r)
+        ]
+
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in range(chunks)]
+        self._hashes: List[int] = []
+        self._values: List[T] = []
+        self._coordinates: List[Optional[Tuple[float, float]]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def _split(self, value: int) -> List[int]:
+        return [
+            (value >> (i * self._chunk_bits)) & self._chunk_mask
+            for i in range(self.chunks)
+        ]
+
+    def add(
+        self,
+        image_hash: int,
+        value: T,
+        coordinates: Optional[Sequence[float]] = None
+    ) -> None:
+        """
+        Add a hash and its associated value.
+
+        Args:
+            image_hash: Perceptual hash of the image
+            value: Value returned for near-duplicate queries
+            coordinates: Optional ``[lon, lat]`` where the image was taken
+        """
+        with self._lock:
+            entry_id = len(self._hashes)
+            self._hashes.append(image_hash)
+            self._values.append(value)
+            self._coordinates.append(tuple(coordinates[:2]) if coordinates else None)
+            for table, chunk in zip(self._tables, self._split(image_hash)):
+                table.setdefault(chunk, []).append(entry_id)
+
+    def query(
+        self,
+        image_hash: int,
+        coordinates: Optional[Sequence[float]] = None
+    ) -> Optional[Tuple[T, int]]:
+        """
+        Find the closest near-duplicate of a hash.
+
+        Args:
+            image_hash: Perceptual hash of the query image
+            coordinates: Optional ``[lon, lat]`` of the query image
+
+        Returns:
+            Optional[Tuple[value, distance]]: Closest match, or None
+        """
+        best: Optional[Tuple[T, int]] = None
+        seen = set()
+
+        with self._lock:
+            for table, chunk in zip(self._tables, self._split(image_hash)):
+                for flip in self._flips:
+                    for entry_id in table.get(chunk ^ flip, ()):
+                        if entry_id in seen:
+                            continue
+                        seen.add(entry_id)
+
+                        distance = hamming_distance(image_hash, self._hashes[entry_id])
+                        if distance > self.max_distance:
+                            continue
+                        if best is not None and distance >= best[1]:
+                            continue
+                        if not self._within_range(coordinates, self._coordinates[entry_id]):
+                            continue
+                        best = (self._values[entry_id], distance)
+
+        return best
+
+    def _within_range(
+        self,
+        a: Optional[Sequence[float]],
+        b: Optional[Sequence[float]]
+    ) -> bool:
+        """Check the GPS constraint; entries without coordinates always pass."""
+        if self.max_meters is None or not a or not b:
+            return True
+        return haversine_meters(a, b) <= self.max_meters
@@ -1,13 +1,55 @@
 """
 LLM Providers for the Curb Sign Parser.
+
+Provider modules are imported on first access, so using one provider never
+loads another provider's client library.
 """
 
-from .base import LLMProvider
-from .claude import ClaudeProvider
-from .gpt4 import GPT4VisionProvider
+from typing import TYPE_CHECKING
+
+from .registry import available_providers, get_provider_class, register_provider
+
+if TYPE_CHECKING:
+    from .base import LLMProvider, RetryPolicy
+    from .claude import ClaudeProvider
+    from .gpt4 import GPT4VisionProvider
+    from .rate_limit import AdaptiveConcurrency, RateLimiter, TokenBucket
+    from .transport import TransportConfig
+
+_LAZY_IMPORTS = {
+    "LLMProvider": ".base",
+    "RetryPolicy": ".base",
+    "ClaudeProvider": ".claude",
+    "GPT4VisionProvider": ".gpt4",
+    "TransportConfig": ".transport",
+    "RateLimiter": ".rate_limit",
+    "TokenBucket": ".rate_limit",
+    "AdaptiveConcurrency": ".rate_limit",
+}
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 __all__ = [
     "LLMProvider",
     "ClaudeProvider",
     "GPT4VisionProvider",
+    "TransportConfig",
+    "RetryPolicy",
+    "RateLimiter",
+    "TokenBucket",
+    "AdaptiveConcurrency",
+    "available_providers",
+    "get_provider_class",
+    "register_provider",
 ]
@@ -1,12 +1,186 @@
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from ..models.usage import TokenUsage
+from ..utils.exceptions import APIError, ProviderError
+from ..utils.instrumentation import NULL_INSTRUMENTATION, Instrumentation
+from .rate_limit import AdaptiveConcurrency, RateLimiter
+from .transport import TransportConfig
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Headers checked, in order, for how long to wait before retrying
+_RETRY_HEADERS = ('retry-after-ms', 'retry-after')
+
+# Quota reset times; only meaningful when the request was rate limited
+_RESET_HEADERS = (
+    'anthropic-ratelimit-requests-reset',
+    'anthropic-ratelimit-tokens-reset',
+    'x-ratelimit-reset-requests',
+    'x-ratelimit-reset-tokens',
+)
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+
+def parse_retry_after(
+    headers: Optional[Mapping[str, str]],
+    rate_limited: bool = False
+) -> Optional[float]:
+    """
+    Read the server-requested retry delay from response headers.
+
+    Understands ``retry-after-ms``, ``retry-after`` (seconds or HTTP date),
+    Anthropic's RFC 3339 ``anthropic-ratelimit-*-reset`` timestamps and
+    OpenAI's ``x-ratelimit-reset-*`` durations such as ``"6m0s"``.
+
+    Args:
+        headers: Response headers
+        rate_limited: Also consult quota reset headers (for 429 responses)
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if no usable header
+    """
+    if not headers:
+        return None
+
+    lowered = {k.lower(): v for k, v in headers.items()}
+    names = _RETRY_HEADERS + _RESET_HEADERS if rate_limited else _RETRY_HEADERS
+    for name in names:
+        value = lowered.get(name)
+        if not value:
+            continue
+        value = value.strip()
+        try:
+            if name == 'retry-after-ms':
+                return max(0.0, float(value) / 1000.0)
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        parts = _DURATION_PART.findall(value)
+        if parts and ''.join(n + u for n, u in parts) == value:
+            scale = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+            return sum(float(n) * scale[u] for n, u in parts)
+
+        try:
+            if name == 'retry-after':
+                when = parsedate_to_datetime(value)
+            else:
+                when = datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if when.tzinfo is None:
+                when = when.replace(tzinfo=timezone.utc)
+            return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            continue
+
+    return None
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient provider failures."""
+
+    # Request timeout, conflict, rate limited, server errors and Anthropic's "overloaded"
+    RETRY_STATUSES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+
+    # Statuses that mean the provider is shedding load
+    THROTTLE_STATUSES = frozenset({429, 503, 529})
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        respect_retry_after: bool = True
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            max_attempts: Total attempts including the first (1 disables retries)
+            base_delay: Backoff ceiling for the first retry, doubled per attempt
+            max_delay: Upper bound on any single wait
+            respect_retry_after: Wait at least as long as the server asks
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.respect_retry_after = respect_retry_after
+
+    def should_retry(self, error: APIError) -> bool:
+        """Connection failures (no status) and transient statuses are retried."""
+        return error.status_code is None or error.status_code in self.RETRY_STATUSES
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (0-based)."""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if self.respect_retry_after and retry_after is not None:
+            backoff = max(backoff, min(retry_after, self.max_delay))
+        return backoff
 
 
 class LLMProvider(ABC):
     """Base class for multi-modal LLM providers."""
 
-    def __init__(self, api_key: str, **kwargs):
+    def __init__(
+        self,
+        api_key: str,
+        transport: Optional[TransportConfig] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        prompt_caching: bool = False,
+        usage_callback: Optional[Callable[[TokenUsage], None]] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        **kwargs
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            api_key: Provider API key
+            transport: Connection pooling and timeout settings
+            retry_policy: Backoff policy for transient failures
+            rate_limiter: Optional client-side request/token quotas
+            concurrency: Optional AIMD limit on concurrent requests
+            prompt_caching: Send the static prompt as a cacheable prefix
+            usage_callback: Called with the TokenUsage of each response
+            instrumentation: Receives base64 and network timings
+            **kwargs: Extra provider options
+        """
         self.api_key = api_key
+        self.transport = transport or TransportConfig()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.concurrency = concurrency
+        self.prompt_caching = prompt_caching
+        self.usage_callback = usage_callback
+        self.usage = TokenUsage()
+        self._usage_lock = threading.Lock()
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
         self.kwargs = kwargs
 
     @abstractmethod
@@ -22,6 +196,233 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def process_image_async(self, image_data: bytes) -> str:
+        """
+        Asynchronously process an image and return the raw LLM response.
+
+        Providers without a native async client fall back to running
+        ``process_image`` in the event loop's default executor.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            str: Raw LLM response text
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.process_image, image_data)
+
+    def stream_image(self, image_data: bytes) -> Iterator[str]:
+        """
+        Stream the raw LLM response for an image as text chunks.
+
+        Closing the iterator before it is exhausted aborts generation.
+        Providers without streaming support yield the complete response as
+        a single chunk.
+
+        Args:
+            image_data: Raw image bytes
+
+        Returns:
+            Iterator[str]: Response text chunks in order
+        """
+        yield self.process_image(image_data)
+
+    async def stream_image_async(self, image_data: bytes) -> AsyncIterator[str]:
+        """Asynchronously stream the raw LLM response; see ``stream_image``."""
+        yield await self.process_image_async(image_data)
+
+    def _to_api_error(self, error: Exception) -> Optional[APIError]:
+        """
+        Map a client library exception to an APIError.
+
+        Providers override this for their SDK's exception types. Returning
+        None marks the exception as non-retryable and it propagates unchanged.
+        """
+        return error if isinstance(error, APIError) else None
+
+    def _record_usage(self, usage: TokenUsage) -> None:
+        """Add one response's token counts to ``usage`` and notify the callback."""
+        with self._usage_lock:
+            self.usage = self.usage + usage
+        if usage.cache_read_input_tokens or usage.cache_creation_input_tokens:
+            logger.debug(
+                f"Prompt cache: {usage.cache_read_input_tokens} tokens read, "
+                f"{usage.cache_creation_input_tokens} written"
+            )
+        if self.usage_callback is not None:
+            self.usage_callback(usage)
+
+    def _estimate_tokens(self, image_data: bytes) -> int:
+        """Rough token cost of one request, used for tokens-per-minute limiting."""
+        # ~4 characters per prompt token, ~1.6k tokens for a 2048px image, plus the output cap
+        return len(self.system_prompt) // 4 + 1600 + 1024
+
+    def _handle_failure(self, error: Exception, attempt: int, ticket: Optional[int] = None) -> float:
+        """Translate a failure and return the retry delay, or raise if final."""
+        api_error = self._to_api_error(error)
+        if api_error is None:
+            raise error
+
+        if self.concurrency is not None and api_error.status_code in RetryPolicy.THROTTLE_STATUSES:
+            self.concurrency.on_throttle(ticket)
+
+        final = attempt + 1 >= self.retry_policy.max_attempts
+        if final or not self.retry_policy.should_retry(api_error):
+            if api_error is error:
+                raise api_error
+            raise api_error from error
+
+        delay = self.retry_policy.delay(attempt, api_error.retry_after)
+        logger.warning(
+            f"{type(self).__name__} request failed with status {api_error.status_code}; "
+            f"retrying in {delay:.1f}s (attempt {attempt + 1}/{self.retry_policy.max_attempts})"
+        )
+        return delay
+
+    def _call_with_retries(self, call: Callable[[], T], image_data: bytes = b"") -> T:
+        """
+        Run a provider request with rate limiting, AIMD concurrency and retries.
+
+        Args:
+            call: Zero-argument function performing one request
+            image_data: Image being sent, used for token estimates
+
+        Returns:
+            The result of ``call``
+        """
+        for attempt in range(self.retry_policy.max_attempts):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self._estimate_tokens(image_data))
+            ticket = self.concurrency.acquire() if self.concurrency is not None else None
+            try:
+                with self.instrumentation.span('network', provider=type(self).__name__, attempt=attempt):
+                    result = call()
+            except Exception as e:
+                delay = self._handle_failure(e, attempt, ticket)
+            else:
+                if self.concurrency is not None:
+                    self.concurrency.on_success()
+                return result
+            finally:
+                if self.concurrency is not None:
+                    self.concurrency.release()
+            time.sleep(delay)
+
+        raise AssertionError("unreachable")
+
+    async def _call_with_retries_async(
+        self,
+        call: Callable[[], Awaitable[T]],
+        image_data: bytes = b""
+    ) -> T:
+        """Async variant of ``_call_with_retries``."""
+        for attempt in range(self.retry_policy.max_attempts):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(self._estimate_tokens(image_data))
+            ticket = await self.concurrency.acquire_async() if self.concurrency is not None else None
+            try:
+                with self.instrumentation.span('network', provider=type(self).__name__, attempt=attempt):
+                    result = await call()
+            except Exception as e:
+                delay = self._handle_failure(e, attempt, ticket)
+            else:
+                if self.concurrency is not None:
+                    self.concurrency.on_success()
+                return result
+            finally:
+                if self.concurrency is not None:
+                    self.concurrency.release()
+            await asyncio.sleep(delay)
+
+        raise AssertionError("unreachable")
+
+    def submit_batch(self, images: Mapping[str, bytes]) -> str:
+        """
+        Submit many images through the provider's offline batch API.
+
+        Batch APIs trade latency (results within hours) for much lower cost
+        and higher throughput ceilings than interactive requests.
+
+        Args:
+            images: Processed image bytes keyed by a caller-chosen custom ID
+                (letters, digits, ``_`` and ``-``; at most 64 characters)
+
+        Returns:
+            str: Provider batch ID
+        """
+        raise ProviderError(f"{type(self).__name__} does not support batch submission")
+
+    def collect_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Union[str, APIError]]:
+        """
+        Wait for a submitted batch to finish and return its responses.
+
+        Args:
+            batch_id: ID returned by ``submit_batch``
+            poll_interval: Seconds between status checks
+            timeout: Give up after this many seconds (None waits indefinitely)
+
+        Returns:
+            Dict[str, str | APIError]: Raw LLM response text, or the error for
+            that request, keyed by custom ID
+        """
+        raise ProviderError(f"{type(self).__name__} does not support batch submission")
+
+    def _wait_for_batch(
+        self,
+        is_done: Callable[[], bool],
+        batch_id: str,
+        poll_interval: float,
+        timeout: Optional[float]
+    ) -> None:
+        """Poll ``is_done`` until it returns True or ``timeout`` elapses."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not is_done():
+            if deadline is not None and time.monotonic() >= deadline:
+                raise ProviderError(f"Timed out waiting for batch {batch_id}")
+            logger.info(f"Batch {batch_id} still processing; checking again in {poll_interval}s")
+            time.sleep(poll_interval)
+
+    def warmup(self, connections: int = 1) -> int:
+        """
+        Pre-open pooled connections to the provider API.
+
+        Call at service start so the first requests don't pay for TCP and TLS
+        handshakes. Failures are logged rather than raised.
+
+        Args:
+            connections: Number of connections to open concurrently; at most
+                the transport's pool size is useful
+
+        Returns:
+            int: Number of connections successfully opened
+        """
+        connections = max(1, min(connections, self.transport.pool_size))
+
+        def probe(_: int) -> bool:
+            try:
+                self._warmup_request()
+                return True
+            except Exception as e:
+                logger.warning(f"Connection warmup failed: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return sum(executor.map(probe, range(connections)))
+
+    def _warmup_request(self) -> None:
+        """Issue one lightweight request over the pooled transport."""
+        pass
+
+    async def aclose(self) -> None:
+        """Release resources held by the provider's async client, if any."""
+        pass
+
     @property
     @abstractmethod
     def max_image_size(self) -> int:
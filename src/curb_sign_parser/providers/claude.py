@@ -1,12 +1,18 @@
 import base64
 import logging
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping, Optional, Union
 
-from anthropic import Anthropic
+import anthropic
+from anthropic import Anthropic, AsyncAnthropic
 
-from .base import LLMProvider
+from ..models.usage import TokenUsage
+from ..utils.exceptions import APIError, ProviderError
+from .base import LLMProvider, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
+USER_INSTRUCTION = "Analyze this parking sign and return a CDS-compliant JSON object with the regulations."
+
 class ClaudeProvider(LLMProvider):
     """Claude provider for multi-modal LLM processing."""
 
@@ -14,48 +20,124 @@ class ClaudeProvider(LLMProvider):
         self,
         api_key: str,
         model: str = "claude-3-opus-20240229",
+        base_url: Optional[str] = None,
         **kwargs
     ):
         super().__init__(api_key, **kwargs)
         self.model = model
-        self.client = Anthropic(api_key=api_key)
+        self.base_url = base_url
+        self._http_client = self.transport.create_httpx_client()
+        self.client = Anthropic(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self._http_client,
+            timeout=self.transport.httpx_timeout,
+            max_retries=0  # retries are handled by retry_policy
+        )
+        self._async_client = None
+
+    @property
+    def async_client(self) -> AsyncAnthropic:
+        """Lazily constructed async Anthropic client."""
+        if self._async_client is None:
+            self._async_client = AsyncAnthropic(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=self.transport.create_async_httpx_client(),
+                timeout=self.transport.httpx_timeout,
+                max_retries=0
+            )
+        return self._async_client
+
+    def _to_api_error(self, error: Exception) -> Optional[APIError]:
+        """Map Anthropic SDK errors to APIError."""
+        if isinstance(error, anthropic.APIStatusError):
+            status = error.status_code
+            return APIError(
+                f"Claude API error ({status}): {error.message}",
+                status_code=status,
+                response=error.response.text,
+                retry_after=parse_retry_after(error.response.headers, rate_limited=status == 429)
+            )
+        if isinstance(error, anthropic.APIConnectionError):
+            return APIError(f"Claude API connection error: {error}")
+        return super()._to_api_error(error)
+
+    def _warmup_request(self) -> None:
+        """Open a pooled connection to the Anthropic API host."""
+        self._http_client.head(str(self.client.base_url))
 
     @property
     def max_image_size(self) -> int:
         return 5 * 1024 * 1024  # 5MB
 
+    def _build_request(self, image_data: bytes) -> dict:
+        """
+        Build the Messages API request for an image.
+
+        With prompt caching enabled the instruction is sent ahead of the image
+        and marked with ``cache_control``, so the system prompt and instruction
+        form one identical prefix that later requests read from the cache.
+        Prefixes shorter than the model's minimum cacheable length are simply
+        not cached.
+        """
+        logger.info("Encoding image for Claude API")
+        with self.instrumentation.span('base64', bytes=len(image_data)):
+            encoded_image = base64.b64encode(image_data).decode('utf-8')
+
+        image_block = {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": "image/jpeg",
+                "data": encoded_image
+            }
+        }
+        instruction_block = {"type": "text", "text": USER_INSTRUCTION}
+
+        if self.prompt_caching:
+            instruction_block["cache_control"] = {"type": "ephemeral"}
+            content = [instruction_block, image_block]
+        else:
+            content = [image_block, instruction_block]
+
+        return {
+            "model": self.model,
+            "max_tokens": 1024,
+            "system": self.system_prompt,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": content
+                }
+            ]
+        }
+
+    @staticmethod
+    def _usage(message: Any) -> TokenUsage:
+        """Token counts from a Messages API response."""
+        usage = getattr(message, 'usage', None)
+        if usage is None:
+            return TokenUsage(requests=1)
+        return TokenUsage(
+            requests=1,
+            input_tokens=getattr(usage, 'input_tokens', 0) or 0,
+            output_tokens=getattr(usage, 'output_tokens', 0) or 0,
+            cache_creation_input_tokens=getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+            cache_read_input_tokens=getattr(usage, 'cache_read_input_tokens', 0) or 0
+        )
+
     def process_image(self, image_data: bytes) -> str:
         """Process image using Claude's API."""
         try:
-            logger.info("Encoding image for Claude API")
-            encoded_image = base64.b64encode(image_data).decode('utf-8')
+            request = self._build_request(image_data)
 
             logger.info("Sending request to Claude API")
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                system=self.system_prompt,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "image",
-                                "source": {
-                                    "type": "base64",
-                                    "media_type": "image/jpeg",
-                                    "data": encoded_image
-                                }
-                            },
-                            {
-                                "type": "text",
-                                "text": "Analyze this parking sign and return a CDS-compliant JSON object with the regulations."
-                            }
-                        ]
-                    }
-                ]
+            message = self._call_with_retries(
+                lambda: self.client.messages.create(**request), image_data
             )
 
+            self._record_usage(self._usage(message))
             response = message.content[0].text
             logger.info(f"Received response from Claude: {response[:500]}...")  # Log first 500 chars
             return response
@@ -63,3 +145,131 @@ class ClaudeProvider(LLMProvider):
         except Exception as e:
             logger.error(f"Claude API error: {str(e)}", exc_info=True)
             raise
+
+    async def process_image_async(self, image_data: bytes) -> str:
+        """Process image using Claude's API without blocking the event loop."""
+        try:
+            request = self._build_request(image_data)
+
+            logger.info("Sending async request to Claude API")
+            message = await self._call_with_retries_async(
+                lambda: self.async_client.messages.create(**request), image_data
+            )
+
+            self._record_usage(self._usage(message))
+            response = message.content[0].text
+            logger.info(f"Received response from Claude: {response[:500]}...")
+            return response
+
+        except Exception as e:
+            logger.error(f"Claude API error: {str(e)}", exc_info=True)
+            raise
+
+    def stream_image(self, image_data: bytes) -> Iterator[str]:
+        """
+        Stream Claude's response text as it is generated.
+
+        Only opening the stream is retried; closing the iterator early closes
+        the connection, which stops generation.
+        """
+        request = self._build_request(image_data)
+
+        logger.info("Streaming request to Claude API")
+        stream = self._call_with_retries(
+            lambda: self.client.messages.create(stream=True, **request), image_data
+        )
+        usage = TokenUsage(requests=1)
+        try:
+            for event in stream:
+                if event.type == 'content_block_delta':
+                    text = getattr(event.delta, 'text', None)
+                    if text:
+                        yield text
+                elif event.type == 'message_start':
+                    usage = self._usage(event.message)
+                elif event.type == 'message_delta':
+                    usage.output_tokens = getattr(event.usage, 'output_tokens', 0) or 0
+        finally:
+            stream.close()
+            self._record_usage(usage)
+
+    async def stream_image_async(self, image_data: bytes) -> AsyncIterator[str]:
+        """Stream Claude's response text without blocking the event loop."""
+        request = self._build_request(image_data)
+
+        logger.info("Streaming async request to Claude API")
+        stream = await self._call_with_retries_async(
+            lambda: self.async_client.messages.create(stream=True, **request), image_data
+        )
+        usage = TokenUsage(requests=1)
+        try:
+            async for event in stream:
+                if event.type == 'content_block_delta':
+                    text = getattr(event.delta, 'text', None)
+                    if text:
+                        yield text
+                elif event.type == 'message_start':
+                    usage = self._usage(event.message)
+                elif event.type == 'message_delta':
+                    usage.output_tokens = getattr(event.usage, 'output_tokens', 0) or 0
+        finally:
+            await stream.close()
+            self._record_usage(usage)
+
+    def _batches(self) -> Any:
+        """Message Batches resource (GA or beta, depending on SDK version)."""
+        batches = getattr(self.client.messages, 'batches', None)
+        if batches is None:
+            beta_messages = getattr(getattr(self.client, 'beta', None), 'messages', None)
+            batches = getattr(beta_messages, 'batches', None)
+        if batches is None:
+            raise ProviderError("Installed anthropic SDK does not support Message Batches")
+        return batches
+
+    def submit_batch(self, images: Mapping[str, bytes]) -> str:
+        """Submit images through the Message Batches API."""
+        batches = self._batches()
+        requests = [
+            {"custom_id": custom_id, "params": self._build_request(image_data)}
+            for custom_id, image_data in images.items()
+        ]
+
+        logger.info(f"Submitting batch of {len(requests)} requests to Claude API")
+        batch = self._call_with_retries(lambda: batches.create(requests=requests))
+        logger.info(f"Created Claude message batch {batch.id}")
+        return batch.id
+
+    def collect_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Union[str, APIError]]:
+        """Wait for a Message Batch to end and return its responses."""
+        batches = self._batches()
+
+        def is_done() -> bool:
+            batch = self._call_with_retries(lambda: batches.retrieve(batch_id))
+            return batch.processing_status == "ended"
+
+        self._wait_for_batch(is_done, batch_id, poll_interval, timeout)
+
+        results: Dict[str, Union[str, APIError]] = {}
+        for entry in self._call_with_retries(lambda: batches.results(batch_id)):
+            result = entry.result
+            if result.type == "succeeded":
+                self._record_usage(self._usage(result.message))
+                results[entry.custom_id] = result.message.content[0].text
+            else:
+                error = getattr(result, 'error', None)
+                results[entry.custom_id] = APIError(
+                    f"Claude batch request {result.type}",
+                    response=str(error) if error is not None else None
+                )
+        return results
+
+    async def aclose(self) -> None:
+        """Close the async Anthropic client."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
@@ -1,10 +1,14 @@
 import base64
+import json
 import logging
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping, Optional, Tuple, Union
 
+import httpx
 import requests
 
-from .base import LLMProvider
+from ..models.usage import TokenUsage
+from ..utils.exceptions import APIError, ParsingError, ProviderError
+from .base import LLMProvider, parse_retry_after
 
 logger = logging.getLogger(__name__)
 
@@ -15,58 +19,357 @@ class GPT4VisionProvider(LLMProvider):
         self,
         api_key: str,
         model: str = "gpt-4-vision-preview",
+        base_url: Optional[str] = None,
         **kwargs
     ):
         super().__init__(api_key, **kwargs)
         self.model = model
-        self.api_url = "https://api.openai.com/v1/chat/completions"
+        self.base_url = (base_url or "https://api.openai.com/v1").rstrip('/')
+        self.api_url = f"{self.base_url}/chat/completions"
+
+        # requests has no HTTP/2 support, so HTTP/2 transports use httpx
+        if self.transport.http2:
+            self.session = self.transport.create_httpx_client()
+        else:
+            self.session = self.transport.create_session()
+        self._async_client: Optional[httpx.AsyncClient] = None
 
     @property
     def max_image_size(self) -> int:
         return 20 * 1024 * 1024  # 20MB
 
-    def process_image(self, image_data: bytes) -> Dict[str, Any]:
-        """Process image using GPT-4 Vision API."""
-        try:
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Lazily constructed async HTTP client."""
+        if self._async_client is None:
+            self._async_client = self.transport.create_async_httpx_client()
+        return self._async_client
+
+    def _build_request(self, image_data: bytes) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Build headers and Chat Completions payload for an image.
+
+        OpenAI caches long prompt prefixes automatically. With prompt caching
+        enabled the prompt is sent as a system message ahead of the image, so
+        every request shares the same static prefix.
+        """
+        with self.instrumentation.span('base64', bytes=len(image_data)):
             encoded_image = base64.b64encode(image_data).decode('utf-8')
 
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
 
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": [
-                            {
-                                "type": "text",
-                                "text": self.system_prompt
-                            },
-                            {
-                                "type": "image_url",
-                                "image_url": {
-                                    "url": f"data:image/jpeg;base64,{encoded_image}"
-                                }
-                            }
-                        ]
-                    }
-                ],
-                "max_tokens": 1024
+        image_block = {
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/jpeg;base64,{encoded_image}"
             }
+        }
 
-            response = requests.post(
-                self.api_url,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+        if self.prompt_caching:
+            messages = [
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": [image_block]}
+            ]
+        else:
+            messages = [
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": self.system_prompt
+                        },
+                        image_block
+                    ]
+                }
+            ]
+
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": 1024
+        }
+
+        return headers, payload
+
+    @staticmethod
+    def _usage(usage: Dict[str, Any]) -> TokenUsage:
+        """Token counts from a Chat Completions ``usage`` object."""
+        cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        return TokenUsage(
+            requests=1,
+            input_tokens=(usage.get("prompt_tokens") or 0) - cached,
+            output_tokens=usage.get("completion_tokens") or 0,
+            cache_read_input_tokens=cached
+        )
+
+    def _read_completion(self, body: Dict[str, Any]) -> str:
+        """Record token usage from a Chat Completions response and return its text."""
+        self._record_usage(self._usage(body.get("usage") or {}))
+        return body["choices"][0]["message"]["content"]
+
+    @staticmethod
+    def _stream_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Chat Completions payload requesting a server-sent event stream."""
+        return {**payload, "stream": True, "stream_options": {"include_usage": True}}
+
+    @staticmethod
+    def _read_stream_line(line: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        """
+        Decode one ``data:`` line of the event stream (None for anything else).
+
+        Raises:
+            ParsingError: If the event is not a JSON object, so a corrupt stream
+                ends the same way as an unparseable response
+        """
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            if not line.startswith("data:"):
+                return None
+            data = line[5:].strip()
+            if data == "[DONE]":
+                return None
+            chunk = json.loads(data)
+        except ValueError as e:
+            # Covers both UnicodeDecodeError and json.JSONDecodeError
+            raise ParsingError(f"Malformed GPT-4 Vision stream event ({e}): {line[:200]!r}") from e
+        if not isinstance(chunk, dict):
+            raise ParsingError(f"Malformed GPT-4 Vision stream event: {data[:200]!r}")
+        return chunk
+
+    def _open_stream(self, headers: Dict[str, str], payload: Dict[str, Any]) -> Any:
+        """Send a streaming request over the pooled session and check its status."""
+        if isinstance(self.session, httpx.Client):
+            request = self.session.build_request("POST", self.api_url, headers=headers, json=payload)
+            response = self.session.send(request, stream=True)
+            if response.is_error:
+                # Read the error body so it can be reported
+                response.read()
+                response.close()
+        else:
+            response = self._post(self.api_url, headers=headers, json=payload, stream=True)
+            if not response.ok:
+                # Same as above: keep the error body, release the connection
+                response.content
+                response.close()
+        response.raise_for_status()
+        return response
+
+    def stream_image(self, image_data: bytes) -> Iterator[str]:
+        """
+        Stream GPT-4 Vision's response text as it is generated.
+
+        Only opening the stream is retried; closing the iterator early closes
+        the connection, which stops generation.
+        """
+        headers, payload = self._build_request(image_data)
+        payload = self._stream_payload(payload)
+
+        response = self._call_with_retries(lambda: self._open_stream(headers, payload), image_data)
+        usage = TokenUsage(requests=1)
+        try:
+            for line in response.iter_lines():
+                chunk = self._read_stream_line(line)
+                if chunk is None:
+                    continue
+                if chunk.get("usage"):
+                    usage = self._usage(chunk["usage"])
+                for choice in chunk.get("choices") or []:
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        yield text
+        finally:
+            response.close()
+            self._record_usage(usage)
+
+    async def stream_image_async(self, image_data: bytes) -> AsyncIterator[str]:
+        """Stream GPT-4 Vision's response text without blocking the event loop."""
+        headers, payload = self._build_request(image_data)
+        payload = self._stream_payload(payload)
+
+        async def send() -> httpx.Response:
+            request = self.async_client.build_request("POST", self.api_url, headers=headers, json=payload)
+            response = await self.async_client.send(request, stream=True)
+            if response.is_error:
+                await response.aread()
+                await response.aclose()
+            response.raise_for_status()
+            return response
+
+        response = await self._call_with_retries_async(send, image_data)
+        usage = TokenUsage(requests=1)
+        try:
+            async for line in response.aiter_lines():
+                chunk = self._read_stream_line(line)
+                if chunk is None:
+                    continue
+                if chunk.get("usage"):
+                    usage = self._usage(chunk["usage"])
+                for choice in chunk.get("choices") or []:
+                    text = (choice.get("delta") or {}).get("content")
+                    if text:
+                        yield text
+        finally:
+            await response.aclose()
+            self._record_usage(usage)
+
+    def _post(self, url: str, **kwargs) -> Any:
+        """POST over the pooled session with the configured timeouts."""
+        if isinstance(self.session, httpx.Client):
+            return self.session.post(url, **kwargs)
+        return self.session.post(url, timeout=self.transport.requests_timeout, **kwargs)
+
+    def _api_request(self, method: str, path: str, **kwargs) -> Any:
+        """Authenticated request to an OpenAI endpoint, with retries."""
+        url = f"{self.base_url}{path}"
+        headers = {"Authorization": f"Bearer {self.api_key}"}
 
+        def send() -> Any:
+            if isinstance(self.session, httpx.Client):
+                response = self.session.request(method, url, headers=headers, **kwargs)
+            else:
+                response = self.session.request(
+                    method, url, headers=headers, timeout=self.transport.requests_timeout, **kwargs
+                )
             response.raise_for_status()
-            return response.json()["choices"][0]["message"]["content"]
+            return response
+
+        return self._call_with_retries(send)
+
+    def _to_api_error(self, error: Exception) -> Optional[APIError]:
+        """Map requests/httpx errors to APIError."""
+        response = None
+        if isinstance(error, (requests.HTTPError, httpx.HTTPStatusError)):
+            response = error.response
+        if response is not None:
+            status = response.status_code
+            return APIError(
+                f"GPT-4 Vision API error ({status}): {response.text[:500]}",
+                status_code=status,
+                response=response.text,
+                retry_after=parse_retry_after(response.headers, rate_limited=status == 429)
+            )
+        if isinstance(error, (requests.ConnectionError, requests.Timeout, httpx.TransportError)):
+            return APIError(f"GPT-4 Vision API connection error: {error}")
+        return super()._to_api_error(error)
+
+    def _warmup_request(self) -> None:
+        """Open a pooled connection to the OpenAI API host."""
+        if isinstance(self.session, httpx.Client):
+            self.session.head(self.api_url)
+        else:
+            self.session.head(self.api_url, timeout=self.transport.requests_timeout)
+
+    def process_image(self, image_data: bytes) -> str:
+        """Process image using GPT-4 Vision API."""
+        try:
+            headers, payload = self._build_request(image_data)
+
+            def send() -> str:
+                response = self._post(self.api_url, headers=headers, json=payload)
+                response.raise_for_status()
+                return self._read_completion(response.json())
+
+            return self._call_with_retries(send, image_data)
 
         except Exception as e:
             logger.error(f"GPT-4 Vision API error: {str(e)}")
             raise
+
+    async def process_image_async(self, image_data: bytes) -> str:
+        """Process image using GPT-4 Vision API without blocking the event loop."""
+        try:
+            headers, payload = self._build_request(image_data)
+
+            async def send() -> str:
+                response = await self.async_client.post(
+                    self.api_url,
+                    headers=headers,
+                    json=payload
+                )
+                response.raise_for_status()
+                return self._read_completion(response.json())
+
+            return await self._call_with_retries_async(send, image_data)
+
+        except Exception as e:
+            logger.error(f"GPT-4 Vision API error: {str(e)}")
+            raise
+
+    def submit_batch(self, images: Mapping[str, bytes]) -> str:
+        """Upload a JSONL request file and create an OpenAI batch."""
+        lines = []
+        for custom_id, image_data in images.items():
+            _, payload = self._build_request(image_data)
+            lines.append(json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": payload
+            }))
+        content = ("\n".join(lines) + "\n").encode('utf-8')
+
+        logger.info(f"Uploading batch file with {len(lines)} requests to OpenAI")
+        upload = self._api_request(
+            "POST", "/files",
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", content, "application/jsonl")}
+        ).json()
+
+        batch = self._api_request("POST", "/batches", json={
+            "input_file_id": upload["id"],
+            "endpoint": "/v1/chat/completions",
+            "completion_window": "24h"
+        }).json()
+        logger.info(f"Created OpenAI batch {batch['id']}")
+        return batch["id"]
+
+    def collect_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Union[str, APIError]]:
+        """Wait for an OpenAI batch to finish and return its responses."""
+        state: Dict[str, Any] = {}
+
+        def is_done() -> bool:
+            state.update(self._api_request("GET", f"/batches/{batch_id}").json())
+            return state.get("status") in ("completed", "failed", "expired", "cancelled")
+
+        self._wait_for_batch(is_done, batch_id, poll_interval, timeout)
+
+        if not state.get("output_file_id") and not state.get("error_file_id"):
+            raise ProviderError(f"OpenAI batch {batch_id} {state.get('status')} without results")
+
+        results: Dict[str, Union[str, APIError]] = {}
+        for file_key in ("output_file_id", "error_file_id"):
+            file_id = state.get(file_key)
+            if not file_id:
+                continue
+            text = self._api_request("GET", f"/files/{file_id}/content").text
+            for line in text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                status = response.get("status_code")
+                if status == 200:
+                    results[record["custom_id"]] = self._read_completion(response["body"])
+                else:
+                    results[record["custom_id"]] = APIError(
+                        f"GPT-4 Vision batch request failed ({status})",
+                        status_code=status,
+                        response=json.dumps(record.get("error") or response.get("body"))
+                    )
+        return results
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -0,0 +1,267 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at a per-minute rate.
+
+    ``reserve`` debits the bucket immediately (allowing it to go negative) and
+    returns how long the caller must wait, so sync and async callers share one
+    bucket and are served in arrival order.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the bucket.
+
+        Args:
+            per_minute: Refill rate in units per minute
+            capacity: Maximum burst size (defaults to one minute's worth)
+            clock: Monotonic clock, injectable for tests
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Take ``amount`` units and return the seconds to wait before using them.
+
+        Args:
+            amount: Units to take; requests larger than the capacity are
+                clamped so they can still proceed
+
+        Returns:
+            float: Seconds to wait (0 if available now)
+        """
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """Block until ``amount`` units are available."""
+        delay = self.reserve(amount)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, amount: float = 1.0) -> None:
+        """Wait without blocking the event loop until ``amount`` units are available."""
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class RateLimiter:
+    """Client-side requests-per-minute and tokens-per-minute limits."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Request quota, or None for unlimited
+            tokens_per_minute: Token quota, or None for unlimited
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def _delay(self, tokens: float) -> float:
+        delays = [0.0]
+        if self.requests is not None:
+            delays.append(self.requests.reserve(1))
+        if self.tokens is not None:
+            delays.append(self.tokens.reserve(tokens))
+        return max(delays)
+
+    def acquire(self, tokens: float = 0) -> None:
+        """Block until one request using ``tokens`` tokens is allowed."""
+        delay = self._delay(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 0) -> None:
+        """Async variant of ``acquire``."""
+        delay = self._delay(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limit for provider requests.
+
+    The limit grows by one after a full window of successful requests and is
+    multiplied by ``decrease_factor`` when the provider throttles, so
+    throughput climbs to the account's quota and backs off before retries
+    cascade. Throttles of requests that were already in flight at the last
+    decrease don't shrink it again, so a burst of 429s backs off once.
+
+    Slots are handed to waiting threads and coroutines in arrival order as
+    they're released; waiting coroutines don't poll.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 64,
+        decrease_factor: float = 0.5
+    ):
+        """
+        Initialize the controller.
+
+        Args:
+            initial: Starting concurrency limit
+            minimum: Lowest limit after backing off
+            maximum: Highest limit reachable by growth
+            decrease_factor: Multiplier applied to the limit on throttling
+        """
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("Require 1 <= minimum <= initial <= maximum")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease_factor = decrease_factor
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        # Coroutines waiting for a slot, oldest first
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        # Slots granted so far, and how many had been granted at the last decrease
+        self._issued = 0
+        self._decreased_at = -1
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _take(self) -> int:
+        self._in_flight += 1
+        self._issued += 1
+        return self._issued
+
+    def _queued(self) -> bool:
+        """Whether coroutines are waiting, dropping ones that were cancelled."""
+        waiters = self._waiters
+        while waiters and waiters[0][1].done():
+            waiters.popleft()
+        return bool(waiters)
+
+    def _free(self) -> bool:
+        return self._in_flight < int(self._limit)
+
+    def _wake(self) -> None:
+        """Hand free slots to waiting coroutines in order, then to a thread."""
+        while self._free() and self._queued():
+            loop, future = self._waiters.popleft()
+            ticket = self._take()
+            try:
+                loop.call_soon_threadsafe(self._grant, future, ticket)
+            except RuntimeError:
+                # Event loop closed while waiting
+                self._in_flight -= 1
+        if self._free():
+            self._condition.notify()
+
+    def _grant(self, future: asyncio.Future, ticket: int) -> None:
+        # Runs on the waiter's event loop, so it can't race with cancellation
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(ticket)
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free and nobody is waiting for it."""
+        with self._condition:
+            if self._free() and not self._queued():
+                self._take()
+                return True
+            return False
+
+    def acquire(self) -> int:
+        """
+        Block until a slot is free.
+
+        Returns:
+            int: Ticket identifying this request to ``on_throttle``
+        """
+        with self._condition:
+            while not self._free() or self._queued():
+                self._condition.wait()
+            return self._take()
+
+    async def acquire_async(self) -> int:
+        """Wait without blocking the event loop until a slot is free; returns a ticket like ``acquire``."""
+        with self._condition:
+            if self._free() and not self._queued():
+                return self._take()
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append((asyncio.get_running_loop(), future))
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Cancelled after the slot was handed over
+            if future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._wake()
+
+    def on_success(self) -> None:
+        """Additive increase: roughly +1 per window of successful requests."""
+        with self._condition:
+            previous = int(self._limit)
+            self._limit = min(self.maximum, self._limit + 1.0 / max(self._limit, 1.0))
+            if int(self._limit) > previous:
+                self._wake()
+
+    def on_throttle(self, ticket: Optional[int] = None) -> None:
+        """
+        Multiplicative decrease after a 429 or overload response.
+
+        Args:
+            ticket: Ticket of the throttled request from ``acquire``; without
+                one, the decrease applies unless no request has started since
+                the last one
+        """
+        with self._condition:
+            if ticket is None:
+                ticket = self._issued
+            if ticket <= self._decreased_at:
+                # Sent under the limit that was already cut for this burst
+                return
+            self._limit = max(self.minimum, self._limit * self.decrease_factor)
+            self._decreased_at = self._issued
@@ -0,0 +1,99 @@
+"""
+Provider discovery.
+
+Providers are registered under the ``curb_sign_parser.providers`` entry point
+group, so third-party packages can add one without changing this package:
+
+    [project.entry-points."curb_sign_parser.providers"]
+    my_llm = "my_package.provider:MyProvider"
+
+Provider modules are only imported when a provider is requested, so a worker
+that uses Claude never imports the OpenAI client stack and vice versa.
+"""
+
+import importlib
+import threading
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Dict, List, Type, Union
+
+if TYPE_CHECKING:
+    from .base import LLMProvider
+
+ENTRY_POINT_GROUP = "curb_sign_parser.providers"
+
+# Used when the package metadata isn't installed (e.g. running from a checkout)
+BUILTIN_PROVIDERS: Dict[str, str] = {
+    "claude": "curb_sign_parser.providers.claude:ClaudeProvider",
+    "gpt4": "curb_sign_parser.providers.gpt4:GPT4VisionProvider",
+}
+
+_lock = threading.Lock()
+_specs: Dict[str, Union[str, "Type[LLMProvider]"]] = {}
+_discovered = False
+
+def _entry_points() -> list:
+    """Installed entry points in the provider group."""
+    eps = entry_points()
+    if hasattr(eps, 'select'):
+        return list(eps.select(group=ENTRY_POINT_GROUP))
+    # Python < 3.10 returns a dict of groups
+    return list(eps.get(ENTRY_POINT_GROUP, []))
+
+def _discover() -> Dict[str, Union[str, "Type[LLMProvider]"]]:
+    """Collect provider specs from the builtins and installed entry points, once."""
+    global _discovered
+    if not _discovered:
+        with _lock:
+            if not _discovered:
+                specs: Dict[str, Union[str, "Type[LLMProvider]"]] = dict(BUILTIN_PROVIDERS)
+                for entry_point in _entry_points():
+                    specs[entry_point.name] = entry_point.value
+                # Runtime registrations take precedence over discovered ones
+                specs.update(_specs)
+                _specs.clear()
+                _specs.update(specs)
+                _discovered = True
+    return _specs
+
+def register_provider(name: str, provider: Union[str, "Type[LLMProvider]"]) -> None:
+    """
+    Register a provider under ``name``.
+
+    Args:
+        name: Name passed as ``provider=`` to the parser
+        provider: Provider class, or a lazy ``"module:Class"`` reference
+    """
+    with _lock:
+        _specs[name] = provider
+
+def available_providers() -> List[str]:
+    """Names of all registered providers, without importing them."""
+    return sorted(_discover())
+
+def get_provider_class(name: str) -> "Type[LLMProvider]":
+    """
+    Resolve a provider name to its class, importing its module on first use.
+
+    Args:
+        name: Registered provider name
+
+    Returns:
+        Type[LLMProvider]: Provider class
+
+    Raises:
+        ValueError: If no provider is registered under ``name``
+    """
+    specs = _discover()
+    if name not in specs:
+        raise ValueError(
+            f"Unsupported provider: {name}. "
+            f"Supported providers: {', '.join(sorted(specs))}"
+        )
+
+    spec = specs[name]
+    if isinstance(spec, str):
+        # Resolved on every call (a sys.modules lookup after the first import)
+        # so the module attribute stays the single source of truth
+        module_name, _, attr = spec.partition(':')
+        return getattr(importlib.import_module(module_name), attr)
+    return spec
@@ -0,0 +1,110 @@
+import logging
+from typing import TYPE_CHECKING, Tuple
+
+import httpx
+
+from ..utils.exceptions import ConfigurationError
+
+if TYPE_CHECKING:
+    import requests
+
+logger = logging.getLogger(__name__)
+
+class TransportConfig:
+    """
+    Connection pooling and timeout settings shared by provider HTTP clients.
+
+    One config produces both the ``requests`` session used by the GPT-4
+    provider and the ``httpx`` clients handed to the Anthropic SDK, so pool
+    size, keep-alive and timeouts are set in one place.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0,
+        keepalive_expiry: float = 60.0,
+        http2: bool = False
+    ):
+        """
+        Initialize transport settings.
+
+        Args:
+            pool_size: Maximum pooled connections per host; match this to
+                the number of concurrent parser workers
+            connect_timeout: Seconds allowed to establish a connection
+            read_timeout: Seconds allowed between bytes of the response
+            keepalive_expiry: Seconds an idle pooled connection is kept open
+            http2: Use HTTP/2 (requires the ``h2`` package)
+        """
+        if pool_size < 1:
+            raise ConfigurationError("pool_size must be at least 1")
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise ConfigurationError(
+                    "HTTP/2 support requires the h2 package. "
+                    "Install with: pip install httpx[http2]"
+                )
+
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+
+    @classmethod
+    def for_concurrency(cls, workers: int, **kwargs) -> "TransportConfig":
+        """Transport sized for ``workers`` concurrent requests."""
+        return cls(pool_size=max(1, workers), **kwargs)
+
+    @property
+    def requests_timeout(self) -> Tuple[float, float]:
+        """``(connect, read)`` timeout tuple for ``requests``."""
+        return self.connect_timeout, self.read_timeout
+
+    @property
+    def httpx_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            self.read_timeout,
+            connect=self.connect_timeout,
+            pool=self.connect_timeout
+        )
+
+    @property
+    def httpx_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    def create_session(self) -> "requests.Session":
+        """Create a keep-alive ``requests`` session with a sized connection pool."""
+        # Imported here so providers that only use httpx never load requests
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def create_httpx_client(self) -> httpx.Client:
+        """Create a pooled synchronous ``httpx`` client."""
+        return httpx.Client(
+            http2=self.http2,
+            limits=self.httpx_limits,
+            timeout=self.httpx_timeout
+        )
+
+    def create_async_httpx_client(self) -> httpx.AsyncClient:
+        """Create a pooled asynchronous ``httpx`` client."""
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=self.httpx_limits,
+            timeout=self.httpx_timeout
+        )
@@ -0,0 +1,10 @@
+"""
+Queries over corpora of parsed signs.
+"""
+
+from .spatial_index import RegulationIndex, RegulationMatch
+
+__all__ = [
+    "RegulationIndex",
+    "RegulationMatch",
+]
@@ -0,0 +1,18 @@
+"""
+Array helpers shared by the vectorized query modules.
+"""
+
+import numpy as np
+
+def concat_ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Concatenate ``arange(start, start + count)`` for every pair.
+
+    Expands offset-encoded children (a start and a count per parent) into
+    the flat indices of every child without a Python loop.
+    """
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(counts)
+    return np.repeat(starts - ends + counts, counts) + np.arange(total)
@@ -0,0 +1,294 @@
+"""
+Vectorized evaluation of policy schedules over the minutes of a week.
+
+``ScheduleEvaluator`` compiles every time span of a ``CompactCorpus`` into
+half-open ``[start, end)`` intervals of minute-of-week (Monday 00:00 is 0).
+Overnight spans such as 22:00-06:00 continue into the next day, and spans
+running past Sunday midnight wrap around to Monday. Evaluating many
+timestamps against many policies is then a handful of array operations:
+interval bounds are located in the sorted timestamps with ``searchsorted``
+and turned into per-policy coverage with a cumulative sum.
+"""
+
+import logging
+from datetime import datetime
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from ..models.compact import (
+    ALL_DAYS_MASK,
+    DAY_BITS,
+    HAS_MAX_STAY,
+    HAS_PRIORITY,
+    HAS_RATE,
+    CompactCorpus,
+    time_to_minutes,
+)
+from ..models.data_models import SignData, TimeSpan
+from ..normalization import DEFAULT_END, DEFAULT_START, normalize_days, normalize_time
+from .arrays import concat_ranges
+
+logger = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+# Start of every hour of the week, Monday 00:00 first
+HOURLY_SLOTS = np.arange(0, MINUTES_PER_WEEK, 60)
+
+# 1970-01-01 was a Thursday
+_EPOCH_OFFSET = 3 * MINUTES_PER_DAY
+# Sorts after any real priority
+_NO_PRIORITY = np.iinfo(np.int64).max
+
+def minute_of_week(at: Union[datetime, np.ndarray, Sequence[datetime]]) -> Union[int, np.ndarray]:
+    """
+    Minute of the week (Monday 00:00 is 0) of local wall-clock times.
+
+    Args:
+        at: A datetime, or an array of datetime64 values / a sequence of datetimes
+
+    Returns:
+        int or np.ndarray: Minute of the week for each time
+    """
+    if isinstance(at, datetime):
+        return at.weekday() * MINUTES_PER_DAY + at.hour * 60 + at.minute
+    minutes = np.asarray(at, dtype='datetime64[m]').astype(np.int64)
+    return (minutes + _EPOCH_OFFSET) % MINUTES_PER_WEEK
+
+def _compact_span(span: TimeSpan):
+    """Day mask and minutes of a span the corpus kept as a model, or None."""
+    mask = 0
+    for day in normalize_days(span.days_of_week):
+        mask |= DAY_BITS.get(day, 0)
+    start = time_to_minutes(normalize_time(span.time_of_day_start, DEFAULT_START))
+    end = time_to_minutes(normalize_time(span.time_of_day_end, DEFAULT_END, end=True))
+    if not mask or start is None or end is None:
+        return None
+    return mask, start, end
+
+def span_intervals(day_mask: np.ndarray, start: np.ndarray, end: np.ndarray):
+    """
+    Expand time spans into minute-of-week intervals.
+
+    Args:
+        day_mask: 7-bit day masks (bit 0 is Monday)
+        start: ``time_of_day_start`` in minutes of the day
+        end: ``time_of_day_end`` in minutes of the day; 23:59 means end of
+            day, an end at or before the start means the span runs overnight
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Index of the source span,
+        interval start and interval end of every ``[start, end)`` interval
+    """
+    start = np.asarray(start, dtype=np.int64)
+    end = np.asarray(end, dtype=np.int64)
+    end = np.where(end == MINUTES_PER_DAY - 1, MINUTES_PER_DAY, end)
+    duration = np.where(end > start, end - start, end + MINUTES_PER_DAY - start)
+
+    spans, days = np.nonzero((np.asarray(day_mask)[:, None] >> np.arange(7)) & 1)
+    first = days * MINUTES_PER_DAY + start[spans]
+    last = first + duration[spans]
+
+    # Split intervals that run past Sunday midnight
+    wraps = last > MINUTES_PER_WEEK
+    spans = np.concatenate([spans, spans[wraps]])
+    first = np.concatenate([first, np.zeros(int(wraps.sum()), dtype=np.int64)])
+    last = np.concatenate([np.minimum(last, MINUTES_PER_WEEK), last[wraps] - MINUTES_PER_WEEK])
+    return spans, first, last
+
+class ScheduleSlots:
+    """
+    Regulation in force per sign and evaluated minute.
+
+    Every array has shape ``(signs, minutes)``. ``policy`` holds policy rows
+    of the corpus (-1 where no policy applies); ``activity``, ``max_stay``
+    and ``rate`` come from the first rule of that policy, with -1 for a
+    missing activity code or ``max_stay`` and NaN for a missing rate.
+    ``skipped`` has shape ``(signs,)`` and marks signs that were not
+    evaluated (see ``ScheduleEvaluator``); their rows read as unregulated.
+    """
+
+    __slots__ = ('corpus', 'signs', 'minutes', 'policy', 'activity', 'max_stay', 'rate', 'skipped')
+
+    def __init__(self, corpus, signs, minutes, policy, activity, max_stay, rate, skipped):
+        self.corpus = corpus
+        self.signs = signs
+        self.minutes = minutes
+        self.policy = policy
+        self.activity = activity
+        self.max_stay = max_stay
+        self.rate = rate
+        self.skipped = skipped
+
+    def activity_names(self) -> np.ndarray:
+        """Activity names, with None where no policy applies."""
+        names = np.array(list(self.corpus.strings) + [None], dtype=object)
+        return names[self.activity]
+
+class ScheduleEvaluator:
+    """
+    Minute-of-week schedules of every policy in a corpus.
+
+    Signs the corpus stores whole (see ``CompactCorpus.fallback``) have no
+    policy rows, so they are not evaluated: ``skipped`` marks them, and
+    ``ScheduleSlots.skipped`` flags their rows in every result.
+    """
+
+    def __init__(self, corpus: CompactCorpus):
+        """
+        Compile the time spans of a packed corpus.
+
+        Args:
+            corpus: Signs whose policies are evaluated
+        """
+        self.corpus = corpus
+        policy_count = len(corpus.policies)
+        span_counts = np.diff(corpus.span_offsets)
+        span_policy = np.repeat(np.arange(policy_count), span_counts)
+
+        spans = corpus.spans
+        day_mask = spans['day_mask'].astype(np.int64)
+        start = spans['start'].astype(np.int64)
+        end = spans['end'].astype(np.int64)
+        for row, span in corpus.irregular_spans.items():
+            compact = _compact_span(span)
+            day_mask[row], start[row], end[row] = compact if compact is not None else (0, 0, 0)
+        day_mask &= ALL_DAYS_MASK
+
+        source, first, last = span_intervals(day_mask, start, end)
+        owner = span_policy[source]
+        order = np.lexsort((first, owner))
+        self.interval_policy = owner[order]
+        self.interval_start = first[order]
+        self.interval_end = last[order]
+        self.interval_offsets = np.searchsorted(self.interval_policy, np.arange(policy_count + 1))
+
+        # Policies without time spans apply at all times
+        self.always = span_counts == 0
+
+        priority = np.where(
+            corpus.policies['flags'] & HAS_PRIORITY, corpus.policies['priority'], _NO_PRIORITY
+        )
+        policy_sign = np.repeat(np.arange(len(corpus)), np.diff(corpus.policy_offsets))
+        # Rank policies by sign, then priority, then position on the sign
+        self._by_rank = np.lexsort((np.arange(policy_count), priority, policy_sign))
+        self._rank = np.empty(policy_count, dtype=np.int64)
+        self._rank[self._by_rank] = np.arange(policy_count)
+
+        self.skipped = np.zeros(len(corpus), dtype=bool)
+        if corpus.fallback:
+            self.skipped[list(corpus.fallback)] = True
+            logger.warning(
+                f"{len(corpus.fallback)} of {len(corpus)} signs are stored unpacked and will not be "
+                f"evaluated; see ScheduleEvaluator.skipped"
+            )
+
+    @classmethod
+    def from_sign_data(cls, signs: Iterable[SignData]) -> 'ScheduleEvaluator':
+        """Pack and compile parsed signs in one step."""
+        return cls(CompactCorpus.from_sign_data(signs))
+
+    def active(self, minutes: Union[int, Sequence[int], np.ndarray], policies: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Whether policies apply at the given minutes of the week.
+
+        Args:
+            minutes: Minutes of the week (see ``minute_of_week``)
+            policies: Policy rows to evaluate (default: all)
+
+        Returns:
+            np.ndarray: Boolean array of shape ``(policies, minutes)``
+        """
+        minutes = np.atleast_1d(np.asarray(minutes, dtype=np.int64)) % MINUTES_PER_WEEK
+        if policies is None:
+            policies = np.arange(len(self.always))
+        policies = np.asarray(policies, dtype=np.int64)
+
+        starts = self.interval_offsets[policies]
+        counts = self.interval_offsets[policies + 1] - starts
+        intervals = concat_ranges(starts, counts)
+        rows = np.repeat(np.arange(len(policies)), counts)
+
+        order = np.argsort(minutes, kind='stable')
+        sorted_minutes = minutes[order]
+        width = len(minutes) + 1
+        opened = rows * width + np.searchsorted(sorted_minutes, self.interval_start[intervals])
+        closed = rows * width + np.searchsorted(sorted_minutes, self.interval_end[intervals])
+        size = len(policies) * width
+        coverage = (np.bincount(opened, minlength=size) - np.bincount(closed, minlength=size))
+        covered = np.cumsum(coverage.reshape(len(policies), width)[:, :-1], axis=1) > 0
+
+        result = np.empty_like(covered)
+        result[:, order] = covered | self.always[policies][:, None]
+        return result
+
+    def evaluate(
+        self,
+        minutes: Union[int, Sequence[int], np.ndarray],
+        signs: Optional[np.ndarray] = None,
+        chunk_size: int = 4096
+    ) -> ScheduleSlots:
+        """
+        Regulation in force at each sign for each minute of the week.
+
+        Where several policies of a sign apply, the one with the lowest
+        ``priority`` wins (policies without a priority last, then in sign
+        order).
+
+        Args:
+            minutes: Minutes of the week (see ``minute_of_week``)
+            signs: Sign indices to evaluate (default: all)
+            chunk_size: Signs evaluated per batch, bounding temporary memory
+
+        Returns:
+            ScheduleSlots: Winning policy and its first rule per sign and minute
+        """
+        corpus = self.corpus
+        minutes = np.atleast_1d(np.asarray(minutes, dtype=np.int64))
+        signs = np.arange(len(corpus)) if signs is None else np.asarray(signs, dtype=np.int64)
+
+        policy = np.full((len(signs), len(minutes)), -1, dtype=np.int64)
+        for first in range(0, len(signs), chunk_size):
+            chunk = signs[first:first + chunk_size]
+            policy[first:first + chunk_size] = self._winning_policies(chunk, minutes)
+
+        found = policy >= 0
+        rule_rows = corpus.rule_offsets[policy[found]]
+        has_rule = corpus.rule_offsets[policy[found] + 1] > rule_rows
+        rules = corpus.rules[rule_rows[has_rule]]
+        with_rule = np.zeros(policy.shape, dtype=bool)
+        with_rule[found] = has_rule
+
+        activity = np.full(policy.shape, -1, dtype=np.int64)
+        max_stay = np.full(policy.shape, -1, dtype=np.int64)
+        rate = np.full(policy.shape, np.nan)
+        activity[with_rule] = rules['activity']
+        max_stay[with_rule] = np.where(rules['flags'] & HAS_MAX_STAY, rules['max_stay'], -1)
+        rate[with_rule] = np.where(rules['flags'] & HAS_RATE, rules['rate'], np.nan)
+        return ScheduleSlots(corpus, signs, minutes, policy, activity, max_stay, rate, self.skipped[signs])
+
+    def _winning_policies(self, signs: np.ndarray, minutes: np.ndarray) -> np.ndarray:
+        corpus = self.corpus
+        starts = corpus.policy_offsets[signs]
+        counts = corpus.policy_offsets[signs + 1] - starts
+        policies = concat_ranges(starts, counts)
+        winners = np.full((len(signs), len(minutes)), -1, dtype=np.int64)
+        if not len(policies):
+            return winners
+
+        # Lowest rank of an active policy per sign; a sign's policies are
+        # consecutive in ``policies``, so each group is one reduceat segment
+        ranks = np.where(self.active(minutes, policies), self._rank[policies][:, None], _NO_PRIORITY)
+        nonempty = counts > 0
+        best = np.minimum.reduceat(ranks, (np.cumsum(counts) - counts)[nonempty], axis=0)
+        found = best != _NO_PRIORITY
+        best[found] = self._by_rank[best[found]]
+        best[~found] = -1
+        winners[nonempty] = best
+        return winners
+
+    def heatmap(self, signs: Optional[np.ndarray] = None) -> ScheduleSlots:
+        """Evaluate the start of every hour of the week (168 slots, Monday 00:00 first)."""
+        return self.evaluate(HOURLY_SLOTS, signs)
@@ -0,0 +1,206 @@
+"""
+Spatial index over parsed signs, answering "can I park here now?".
+
+``RegulationIndex`` buckets sign locations into a uniform grid of square
+cells in locally projected meters. Cells are stored sorted by ``(row, col)``
+key, so the cells a query circle covers are found with one vectorized
+``searchsorted`` per call; candidates are then filtered by great-circle
+distance and their policies evaluated against the query time with the
+compiled minute-of-week schedules of ``ScheduleEvaluator``.
+"""
+
+import logging
+import math
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..models.compact import CompactCorpus
+from ..models.data_models import CurbPolicy, Rule, SignData
+from .arrays import concat_ranges
+from .schedule import ScheduleEvaluator, minute_of_week
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6_371_008.8
+
+_RADIANS = math.pi / 180
+
+class RegulationMatch(BaseModel):
+    """A rule in effect near the query point."""
+    sign_index: int
+    distance_m: float
+    policy: CurbPolicy
+    rule: Rule
+
+def haversine_m(lon1: float, lat1: float, lon2: np.ndarray, lat2: np.ndarray) -> np.ndarray:
+    """Great-circle distances in meters from one point to many (degrees)."""
+    phi1, phi2 = lat1 * _RADIANS, lat2 * _RADIANS
+    a = np.sin((phi2 - phi1) / 2) ** 2 \
+        + math.cos(phi1) * np.cos(phi2) * np.sin((lon2 - lon1) * _RADIANS / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+class RegulationIndex:
+    """
+    Grid index of sign locations with time-aware regulation lookup.
+
+    Only signs with a point location are indexed; signs the corpus stores
+    whole (see ``CompactCorpus.fallback``) are skipped.
+    """
+
+    def __init__(self, corpus: CompactCorpus, cell_meters: float = 250.0):
+        """
+        Index a packed corpus.
+
+        Args:
+            corpus: Signs to index; ``sign_index`` in results refers to it
+            cell_meters: Grid cell size; roughly the typical query radius
+        """
+        if cell_meters <= 0:
+            raise ValueError("cell_meters must be positive")
+        self.corpus = corpus
+        self.cell_meters = cell_meters
+        self.schedule = ScheduleEvaluator(corpus)
+        self._activity_codes = {value: code for code, value in enumerate(corpus.strings)}
+
+        indexed = ~np.isnan(corpus.signs['lon'])
+        if corpus.fallback:
+            indexed[list(corpus.fallback)] = False
+        skipped = len(corpus) - int(indexed.sum())
+        if skipped:
+            logger.info(f"Skipping {skipped} signs without a point location")
+
+        sign_ids = np.flatnonzero(indexed)
+        lon = corpus.signs['lon'][sign_ids]
+        lat = corpus.signs['lat'][sign_ids]
+
+        # Project with the scale of the corpus' mean latitude; queries widen
+        # their column range by the scale difference at their own latitude
+        self._ref_cos = math.cos(float(lat.mean()) * _RADIANS) if len(lat) else 1.0
+        ix, iy = self._cells(lon, lat)
+        self._ix0 = int(ix.min()) if len(ix) else 0
+        self._iy0 = int(iy.min()) if len(iy) else 0
+        keys = ((iy - self._iy0) << 32) | (ix - self._ix0)
+
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        self._sign_ids = sign_ids[order]
+        self._lon = lon[order]
+        self._lat = lat[order]
+
+    @classmethod
+    def from_sign_data(cls, signs: Iterable[SignData], cell_meters: float = 250.0) -> 'RegulationIndex':
+        """Pack and index parsed signs in one step."""
+        return cls(CompactCorpus.from_sign_data(signs), cell_meters)
+
+    def __len__(self) -> int:
+        return len(self._sign_ids)
+
+    def _cells(self, lon, lat) -> Tuple[np.ndarray, np.ndarray]:
+        scale = EARTH_RADIUS_M * _RADIANS / self.cell_meters
+        ix = np.floor(np.asarray(lon) * scale * self._ref_cos).astype(np.int64)
+        iy = np.floor(np.asarray(lat) * scale).astype(np.int64)
+        return ix, iy
+
+    def nearby(self, lon: float, lat: float, radius_m: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find signs within ``radius_m`` of a point.
+
+        Args:
+            lon: Query longitude in degrees
+            lat: Query latitude in degrees
+            radius_m: Search radius in meters
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Sign indices into the corpus and
+            their distances in meters, nearest first
+        """
+        if not len(self._keys):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        degrees = radius_m / (EARTH_RADIUS_M * _RADIANS)
+        lon_span = degrees / max(math.cos(lat * _RADIANS), 1e-9)
+        (col_lo, col_hi), (row_lo, row_hi) = self._cells(
+            [lon - lon_span, lon + lon_span], [lat - degrees, lat + degrees]
+        )
+        col_lo, col_hi = max(int(col_lo) - self._ix0, 0), int(col_hi) - self._ix0
+        row_lo, row_hi = max(int(row_lo) - self._iy0, 0), int(row_hi) - self._iy0
+        if col_hi < 0 or row_hi < row_lo:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        rows = np.arange(row_lo, row_hi + 1, dtype=np.int64) << 32
+        starts = np.searchsorted(self._keys, rows | col_lo, side='left')
+        ends = np.searchsorted(self._keys, rows | col_hi, side='right')
+        candidates = concat_ranges(starts, ends - starts)
+
+        distances = haversine_m(lon, lat, self._lon[candidates], self._lat[candidates])
+        within = distances <= radius_m
+        candidates, distances = candidates[within], distances[within]
+        order = np.argsort(distances, kind='stable')
+        return self._sign_ids[candidates[order]], distances[order]
+
+    def query(
+        self,
+        lon: float,
+        lat: float,
+        radius_m: float = 50.0,
+        at: Optional[datetime] = None,
+        activity: Optional[str] = None
+    ) -> List[RegulationMatch]:
+        """
+        Rules of nearby signs that are in effect at a given time.
+
+        Args:
+            lon: Query longitude in degrees
+            lat: Query latitude in degrees
+            radius_m: Search radius in meters
+            at: Local wall-clock time at the signs (default: now)
+            activity: Only return rules for this CDS activity, e.g. ``"parking"``
+
+        Returns:
+            List[RegulationMatch]: Nearest signs first, then by policy priority
+            (lower numbers first, policies without one last)
+        """
+        corpus = self.corpus
+        signs, distances = self.nearby(lon, lat, radius_m)
+        if not len(signs):
+            return []
+
+        at = at or datetime.now()
+        starts = corpus.policy_offsets[signs]
+        counts = corpus.policy_offsets[signs + 1] - starts
+        policies = concat_ranges(starts, counts)
+        policy_signs = np.repeat(np.arange(len(signs)), counts)
+
+        active = self.schedule.active(minute_of_week(at), policies)[:, 0]
+        policies, policy_signs = policies[active], policy_signs[active]
+
+        starts = corpus.rule_offsets[policies]
+        counts = corpus.rule_offsets[policies + 1] - starts
+        rules = concat_ranges(starts, counts)
+        rule_policies = np.repeat(np.arange(len(policies)), counts)
+        if activity is not None:
+            keep = corpus.rules['activity'][rules] == self._activity_codes.get(activity, -2)
+            rules, rule_policies = rules[keep], rule_policies[keep]
+
+        matches = []
+        built = {}
+        for rule_row, position in zip(rules.tolist(), rule_policies.tolist()):
+            row = int(policies[position])
+            policy = built.get(row)
+            if policy is None:
+                policy = built[row] = corpus.policy(row)
+            sign = int(policy_signs[position])
+            matches.append(RegulationMatch(
+                sign_index=int(signs[sign]),
+                distance_m=float(distances[sign]),
+                policy=policy,
+                rule=policy.rules[rule_row - int(corpus.rule_offsets[row])]
+            ))
+
+        matches.sort(key=lambda m: (
+            m.distance_m, m.policy.priority is None, m.policy.priority or 0
+        ))
+        return matches
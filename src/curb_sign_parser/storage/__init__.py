@@ -0,0 +1,16 @@
+"""
+Persistent storage backends for the Curb Sign Parser.
+"""
+
+from .columnar import ColumnarReader, write_parquet
+from .result_cache import CacheStats, ResultCache
+from .segment_store import SegmentStore, StoreStats
+
+__all__ = [
+    "CacheStats",
+    "ColumnarReader",
+    "ResultCache",
+    "SegmentStore",
+    "StoreStats",
+    "write_parquet",
+]
@@ -0,0 +1,385 @@
+"""
+Columnar Parquet storage for corpora of parsed signs.
+
+``write_parquet`` flattens signs into four normalized tables per part
+directory: ``signs``, ``policies``, ``rules`` and ``time_spans``. Child rows
+reference their parent by a corpus-wide index column (``sign``,
+``policy``), strings such as the activity are dictionary-encoded, and time
+spans are stored as a 7-bit ``day_mask`` with start/end minutes of the day.
+Values the compact encoding can't hold exactly (see ``CompactCorpus``) are
+written alongside, so reading back is lossless.
+
+``ColumnarReader`` memory-maps the files, exposes the tables for analytics,
+and rebuilds ``SignData`` only for the records that are accessed.
+
+Requires ``pyarrow`` (``pip install curb-sign-parser[arrow]``).
+"""
+
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from ..models.compact import (
+    HAS_MAX_STAY,
+    HAS_PRIORITY,
+    HAS_RATE,
+    IRREGULAR_SPAN,
+    NO_TIME_SPANS,
+    NONE_CODE,
+    POLICY_DTYPE,
+    RULE_DTYPE,
+    SIGN_DTYPE,
+    SPAN_DTYPE,
+    UUID_CODE,
+    CompactCorpus,
+    Interner,
+    uuid_bytes,
+)
+from ..models.data_models import RateUnitPeriod, SignData, TimeSpan
+from ..utils.exceptions import ConfigurationError
+
+TABLES = ('signs', 'policies', 'rules', 'time_spans')
+_PART_PREFIX = 'part-'
+_PERIODS = [period.value for period in RateUnitPeriod]
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ConfigurationError(
+            "Columnar storage requires the pyarrow package. "
+            "Install with: pip install curb-sign-parser[arrow]"
+        )
+    return pa, pq
+
+def _part_dirs(path: Path) -> List[Path]:
+    return sorted(p for p in path.glob(f"{_PART_PREFIX}*") if p.is_dir())
+
+def _dictionary(pa, codes: np.ndarray, strings: List[str]):
+    """Dictionary array of the strings ``codes`` refer to, NONE_CODE as null."""
+    used, indices = np.unique(codes, return_inverse=True)
+    missing = codes == NONE_CODE
+    if len(used) and used[0] == NONE_CODE:
+        used, indices = used[1:], indices - 1
+    return pa.DictionaryArray.from_arrays(
+        pa.array(indices.astype(np.int32), mask=missing),
+        pa.array([strings[code] for code in used.tolist()], type=pa.string())
+    )
+
+def _nullable(pa, values: np.ndarray, present: np.ndarray):
+    return pa.array(values, mask=~present)
+
+def _string_lists(pa, codes: np.ndarray, tuples: List[tuple]):
+    return pa.array(
+        [list(tuples[code]) if code != NONE_CODE else None for code in codes.tolist()],
+        type=pa.list_(pa.string())
+    )
+
+def _corpus_tables(pa, corpus: CompactCorpus, first_sign: int, first_policy: int) -> Dict[str, Any]:
+    """Arrow tables of one corpus; parent columns are offset to corpus-wide indices."""
+    strings, tuples = corpus.strings, corpus.string_tuples
+    signs, policies, rules, spans = corpus.signs, corpus.policies, corpus.rules, corpus.spans
+
+    fallback = [None] * len(corpus)
+    for index, sign in corpus.fallback.items():
+        fallback[index] = sign.model_dump_json()
+    sign_table = pa.table({
+        **{name: _dictionary(pa, signs[name], strings)
+           for name in ('version', 'time_zone', 'currency', 'author', 'license_url', 'location_type')},
+        'last_updated': signs['last_updated'],
+        'lon': _nullable(pa, signs['lon'], ~np.isnan(signs['lon'])),
+        'lat': _nullable(pa, signs['lat'], ~np.isnan(signs['lat'])),
+        'fallback_json': pa.array(fallback, type=pa.string()),
+    })
+
+    policy_ids = [
+        strings[code] if code != UUID_CODE else str(uuid.UUID(bytes=raw.ljust(16, b'\0')))
+        for code, raw in zip(policies['policy_id'].tolist(), policies['uuid'].tolist())
+    ]
+    flags = policies['flags']
+    policy_table = pa.table({
+        'sign': np.repeat(np.arange(len(corpus)), np.diff(corpus.policy_offsets)) + first_sign,
+        'curb_policy_id': pa.array(policy_ids, type=pa.string()),
+        'published_date': policies['published_date'],
+        'priority': _nullable(pa, policies['priority'], (flags & HAS_PRIORITY) != 0),
+        'has_time_spans': (flags & NO_TIME_SPANS) == 0,
+        'data_source_operator_id': _string_lists(pa, policies['operator_ids'], tuples),
+    })
+
+    rule_flags = rules['flags']
+    has_rate = (rule_flags & HAS_RATE) != 0
+    rule_table = pa.table({
+        'policy': np.repeat(np.arange(len(policies)), np.diff(corpus.rule_offsets)) + first_policy,
+        'activity': _dictionary(pa, rules['activity'], strings),
+        'max_stay': _nullable(pa, rules['max_stay'], (rule_flags & HAS_MAX_STAY) != 0),
+        'user_classes': _string_lists(pa, rules['user_classes'], tuples),
+        'rate': _nullable(pa, rules['rate'], has_rate),
+        'rate_unit': _dictionary(pa, rules['rate_unit'], strings),
+        'rate_unit_period': pa.array(
+            [_PERIODS[period] if rate else None
+             for period, rate in zip(rules['rate_unit_period'].tolist(), has_rate.tolist())],
+            type=pa.string()
+        ).dictionary_encode(),
+    })
+
+    regular = spans['day_mask'] != IRREGULAR_SPAN
+    irregular = [corpus.irregular_spans.get(row) for row in range(len(spans))]
+    span_table = pa.table({
+        'policy': np.repeat(np.arange(len(policies)), np.diff(corpus.span_offsets)) + first_policy,
+        'day_mask': _nullable(pa, spans['day_mask'], regular),
+        'start_minute': _nullable(pa, spans['start'], regular),
+        'end_minute': _nullable(pa, spans['end'], regular),
+        'days_of_week': pa.array(
+            [span.days_of_week if span is not None else None for span in irregular], type=pa.list_(pa.string())
+        ),
+        'time_of_day_start': pa.array(
+            [span.time_of_day_start if span is not None else None for span in irregular], type=pa.string()
+        ),
+        'time_of_day_end': pa.array(
+            [span.time_of_day_end if span is not None else None for span in irregular], type=pa.string()
+        ),
+    })
+
+    return {'signs': sign_table, 'policies': policy_table, 'rules': rule_table, 'time_spans': span_table}
+
+def write_parquet(
+    signs: Union[CompactCorpus, Iterable[SignData]],
+    path: Union[str, Path],
+    signs_per_part: int = 100_000,
+    compression: str = 'zstd'
+) -> List[Path]:
+    """
+    Write signs as partitioned Parquet tables.
+
+    Each part is a ``part-NNNNN`` directory holding one Parquet file per
+    table. Writing to a directory that already has parts appends new ones,
+    continuing the corpus-wide sign and policy indices.
+
+    Args:
+        signs: Packed corpus, or parsed signs (consumed ``signs_per_part`` at a time)
+        path: Dataset directory
+        signs_per_part: Maximum signs per part directory
+        compression: Parquet compression codec
+
+    Returns:
+        List[Path]: Part directories written
+    """
+    pa, pq = _require_pyarrow()
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    existing = _part_dirs(path)
+    first_sign = first_policy = 0
+    for part in existing:
+        first_sign += pq.ParquetFile(part / 'signs.parquet').metadata.num_rows
+        first_policy += pq.ParquetFile(part / 'policies.parquet').metadata.num_rows
+    next_part = int(existing[-1].name[len(_PART_PREFIX):]) + 1 if existing else 0
+
+    def corpora() -> Iterator[CompactCorpus]:
+        if isinstance(signs, CompactCorpus):
+            yield signs
+            return
+        batch: List[SignData] = []
+        for sign in signs:
+            batch.append(sign)
+            if len(batch) == signs_per_part:
+                yield CompactCorpus.from_sign_data(batch)
+                batch = []
+        if batch:
+            yield CompactCorpus.from_sign_data(batch)
+
+    written = []
+    for corpus in corpora():
+        part = path / f"{_PART_PREFIX}{next_part:05d}"
+        part.mkdir()
+        for name, table in _corpus_tables(pa, corpus, first_sign, first_policy).items():
+            pq.write_table(table, part / f"{name}.parquet", compression=compression)
+        written.append(part)
+        next_part += 1
+        first_sign += len(corpus)
+        first_policy += len(corpus.policies)
+    return written
+
+class _Codes:
+    """Re-interns dictionary columns into one corpus string table."""
+
+    def __init__(self):
+        self.strings = Interner()
+
+    def __call__(self, column) -> np.ndarray:
+        column = column.combine_chunks()
+        if not len(column):
+            return np.zeros(0, dtype=np.int32)
+        if not hasattr(column, 'dictionary'):
+            column = column.dictionary_encode()
+        mapping = np.array(
+            [self.strings(value) for value in column.dictionary.to_pylist()] + [NONE_CODE], dtype=np.int32
+        )
+        indices = column.indices.fill_null(-1).to_numpy(zero_copy_only=False)
+        return mapping[indices]
+
+def _offsets(parents: np.ndarray, first: int, count: int) -> np.ndarray:
+    """CSR offsets of rows sorted by parent index."""
+    return np.searchsorted(parents, np.arange(first, first + count + 1)).astype(np.int64)
+
+def _numpy(column, fill: Any = 0) -> np.ndarray:
+    column = column.combine_chunks()
+    if column.null_count:
+        column = column.fill_null(fill)
+    return column.to_numpy(zero_copy_only=False)
+
+def _valid(column) -> np.ndarray:
+    return column.is_valid().to_numpy(zero_copy_only=False)
+
+class ColumnarReader:
+    """
+    Lazy, memory-mapped reader of a dataset written by ``write_parquet``.
+
+    ``table(name)`` returns the Arrow tables for analytics. Indexing returns
+    ``SignData``; each part is unpacked into a ``CompactCorpus`` the first
+    time one of its signs is accessed.
+    """
+
+    def __init__(self, path: Union[str, Path], memory_map: bool = True):
+        """
+        Open a dataset.
+
+        Args:
+            path: Dataset directory
+            memory_map: Memory-map the Parquet files instead of reading them
+        """
+        self._pa, self._pq = _require_pyarrow()
+        self.path = Path(path)
+        self.memory_map = memory_map
+        self.parts = _part_dirs(self.path)
+
+        counts = [self._pq.ParquetFile(part / 'signs.parquet').metadata.num_rows for part in self.parts]
+        policy_counts = [self._pq.ParquetFile(part / 'policies.parquet').metadata.num_rows for part in self.parts]
+        self._sign_starts = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+        self._policy_starts = np.concatenate([[0], np.cumsum(policy_counts, dtype=np.int64)])
+        self._corpora: Dict[int, CompactCorpus] = {}
+
+    def __len__(self) -> int:
+        return int(self._sign_starts[-1])
+
+    def __iter__(self) -> Iterator[SignData]:
+        for part in range(len(self.parts)):
+            yield from self.corpus(part)
+
+    def __getitem__(self, index: int) -> SignData:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Sign index out of range: {index}")
+        part = int(np.searchsorted(self._sign_starts, index, side='right')) - 1
+        return self.corpus(part)[index - int(self._sign_starts[part])]
+
+    def _read(self, part: int, name: str, columns: Optional[List[str]] = None):
+        return self._pq.read_table(self.parts[part] / f"{name}.parquet", columns=columns, memory_map=self.memory_map)
+
+    def table(self, name: str, columns: Optional[List[str]] = None):
+        """
+        One table across every part.
+
+        Args:
+            name: One of ``signs``, ``policies``, ``rules`` or ``time_spans``
+            columns: Columns to read (default: all)
+
+        Returns:
+            pyarrow.Table: Concatenated table; ``sign``/``policy`` columns are
+            row numbers in the ``signs``/``policies`` tables
+        """
+        if name not in TABLES:
+            raise ValueError(f"Unknown table: {name}")
+        return self._pa.concat_tables([self._read(part, name, columns) for part in range(len(self.parts))])
+
+    def corpus(self, part: int) -> CompactCorpus:
+        """Unpack one part into a ``CompactCorpus`` (cached)."""
+        corpus = self._corpora.get(part)
+        if corpus is None:
+            corpus = self._corpora[part] = self._unpack(part)
+        return corpus
+
+    def _unpack(self, part: int) -> CompactCorpus:
+        first_sign = int(self._sign_starts[part])
+        first_policy = int(self._policy_starts[part])
+        codes = _Codes()
+        tuples = Interner()
+        tables = {name: self._read(part, name) for name in TABLES}
+
+        sign_table = tables['signs']
+        signs = np.zeros(sign_table.num_rows, dtype=SIGN_DTYPE)
+        for name in ('version', 'time_zone', 'currency', 'author', 'license_url', 'location_type'):
+            signs[name] = codes(sign_table[name])
+        signs['last_updated'] = _numpy(sign_table['last_updated'])
+        signs['lon'] = _numpy(sign_table['lon'], np.nan)
+        signs['lat'] = _numpy(sign_table['lat'], np.nan)
+        fallback = {
+            index: SignData.model_validate_json(raw)
+            for index, raw in enumerate(sign_table['fallback_json'].to_pylist()) if raw is not None
+        }
+
+        policy_table = tables['policies']
+        policies = np.zeros(policy_table.num_rows, dtype=POLICY_DTYPE)
+        policy_ids, uuids = [], []
+        for policy_id in policy_table['curb_policy_id'].to_pylist():
+            raw = uuid_bytes(policy_id)
+            policy_ids.append(UUID_CODE if raw is not None else codes.strings(policy_id))
+            uuids.append(raw or b'')
+        policies['policy_id'] = policy_ids
+        policies['uuid'] = uuids
+        policies['published_date'] = _numpy(policy_table['published_date'])
+        policies['priority'] = _numpy(policy_table['priority'])
+        policies['operator_ids'] = [
+            tuples(tuple(ids)) if ids is not None else NONE_CODE
+            for ids in policy_table['data_source_operator_id'].to_pylist()
+        ]
+        policies['flags'] = np.where(_valid(policy_table['priority']), HAS_PRIORITY, 0) \
+            | np.where(_numpy(policy_table['has_time_spans'], True), 0, NO_TIME_SPANS)
+
+        rule_table = tables['rules']
+        rules = np.zeros(rule_table.num_rows, dtype=RULE_DTYPE)
+        rules['activity'] = codes(rule_table['activity'])
+        rules['max_stay'] = _numpy(rule_table['max_stay'])
+        rules['user_classes'] = [
+            tuples(tuple(classes)) if classes is not None else NONE_CODE
+            for classes in rule_table['user_classes'].to_pylist()
+        ]
+        rules['rate'] = _numpy(rule_table['rate'], np.nan)
+        rules['rate_unit'] = codes(rule_table['rate_unit'])
+        rules['rate_unit_period'] = [
+            _PERIODS.index(period) if period is not None else 0
+            for period in rule_table['rate_unit_period'].to_pylist()
+        ]
+        rules['flags'] = np.where(_valid(rule_table['max_stay']), HAS_MAX_STAY, 0) \
+            | np.where(_valid(rule_table['rate']), HAS_RATE, 0)
+
+        span_table = tables['time_spans']
+        spans = np.zeros(span_table.num_rows, dtype=SPAN_DTYPE)
+        spans['day_mask'] = _numpy(span_table['day_mask'], IRREGULAR_SPAN)
+        spans['start'] = _numpy(span_table['start_minute'])
+        spans['end'] = _numpy(span_table['end_minute'])
+        irregular_spans = {}
+        for row in np.flatnonzero(spans['day_mask'] == IRREGULAR_SPAN).tolist():
+            irregular_spans[row] = TimeSpan(
+                days_of_week=span_table['days_of_week'][row].as_py(),
+                time_of_day_start=span_table['time_of_day_start'][row].as_py(),
+                time_of_day_end=span_table['time_of_day_end'][row].as_py()
+            )
+
+        return CompactCorpus(
+            signs=signs,
+            policies=policies,
+            rules=rules,
+            spans=spans,
+            policy_offsets=_offsets(_numpy(policy_table['sign']), first_sign, len(signs)),
+            rule_offsets=_offsets(_numpy(rule_table['policy']), first_policy, len(policies)),
+            span_offsets=_offsets(_numpy(span_table['policy']), first_policy, len(policies)),
+            strings=codes.strings.values,
+            string_tuples=tuples.values,
+            irregular_spans=irregular_spans,
+            fallback=fallback
+        )
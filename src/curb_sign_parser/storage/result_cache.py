@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from ..providers.base import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+class CacheStats(BaseModel):
+    """Counters describing result cache usage."""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+class ResultCache:
+    """
+    Content-addressed, on-disk cache of raw LLM responses.
+
+    Entries are keyed on the processed image bytes together with the provider,
+    model and system prompt, so a cached response is only reused when the
+    exact same request would have been sent. Storage is a single SQLite file;
+    once the stored payloads exceed ``max_size_bytes`` the least recently used
+    entries are evicted.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            last_access REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_size_bytes: int = 1024 * 1024 * 1024
+    ):
+        """
+        Open (or create) a result cache.
+
+        Args:
+            path: Path to the SQLite database file
+            max_size_bytes: Total size of cached responses before LRU eviction
+        """
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+
+        row = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self._stats = CacheStats(entries=row[0], size_bytes=row[1])
+
+    @staticmethod
+    def make_key(image_data: bytes, provider: 'LLMProvider') -> str:
+        """
+        Build the cache key for a processed image and provider configuration.
+
+        Args:
+            image_data: Processed image bytes as sent to the provider
+            provider: Provider that would handle the request
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        provider_type = type(provider)
+        prompt_digest = hashlib.sha256(provider.system_prompt.encode('utf-8')).hexdigest()
+
+        h = hashlib.sha256()
+        h.update(hashlib.sha256(image_data).digest())
+        for part in (
+            f"{provider_type.__module__}.{provider_type.__qualname__}",
+            str(getattr(provider, 'model', '')),
+            prompt_digest,
+        ):
+            h.update(b"\0")
+            h.update(part.encode('utf-8'))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for ``key``, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+            self._stats.hits += 1
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a response and evict least recently used entries if over budget."""
+        size = len(value.encode('utf-8'))
+        if size > self.max_size_bytes:
+            logger.warning(f"Response of {size} bytes exceeds cache size limit; not caching")
+            return
+
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time())
+            )
+            if old is None:
+                self._stats.entries += 1
+            else:
+                self._stats.size_bytes -= old[0]
+            self._stats.size_bytes += size
+            self._stats.writes += 1
+
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the size budget is met."""
+        while self._stats.size_bytes > self.max_size_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._stats.size_bytes -= size
+                self._stats.entries -= 1
+                self._stats.evictions += 1
+                if self._stats.size_bytes <= self.max_size_bytes:
+                    break
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of hit/miss and size counters."""
+        with self._lock:
+            return self._stats.model_copy()
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._stats.entries = 0
+            self._stats.size_bytes = 0
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,489 @@
+"""
+Append-only, memory-mapped store of parse results keyed by image hash.
+
+Results are appended as records to numbered segment files
+(``segment-000000.log``, ...). Each record is a small header (payload
+length, CRC-32, key length, flags), the key, and the ``SignData`` as compact
+JSON, optionally zstd-compressed. Every write also appends a fixed-size
+entry to the ``index`` file, mapping a 16-byte digest of the key to the
+record's segment, offset and length; writing a key again or deleting it
+appends a newer entry, and the latest one wins.
+
+Readers memory-map the index and segments and keep a digest -> entry
+dictionary, so point lookups are O(1) and reading a record is a slice of
+the mapping. A single writer (guarded by a lock file) can append while any
+number of readers, in other threads or processes, call ``refresh`` to see
+the new records: segment data is always flushed before the index entries
+that point at it. ``compact`` rewrites the live records into fresh
+segments and atomically replaces the index; readers notice the new index
+on their next ``refresh``.
+
+Compression requires ``zstandard`` (``pip install curb-sign-parser[zstd]``).
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..models.data_models import SignData
+from ..utils.exceptions import ConfigurationError, ValidationError
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# One index entry per write; the latest entry of a digest wins
+INDEX_DTYPE = np.dtype([
+    ('digest', 'V16'),
+    ('segment', '<u4'),
+    ('flags', '<u4'),
+    ('offset', '<u8'),
+    ('length', '<u4'),
+])
+
+# Record flags
+COMPRESSED = 1
+TOMBSTONE = 2
+
+# Payload length, CRC-32 of key and payload, key length, flags
+_RECORD = struct.Struct('<IIHB')
+_SEGMENT = re.compile(r'^segment-(\d{6})\.log$')
+_INDEX_NAME = 'index'
+_LOCK_NAME = 'lock'
+
+_SIGN_SERIALIZER = SignData.__pydantic_serializer__
+_SIGN_VALIDATOR = SignData.__pydantic_validator__
+
+def _require_zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ConfigurationError(
+            "Compressed segment stores require the zstandard package. "
+            "Install with: pip install curb-sign-parser[zstd]"
+        )
+    return zstandard
+
+def key_digest(key: Union[str, bytes]) -> bytes:
+    """16-byte digest identifying ``key`` in the index."""
+    if isinstance(key, str):
+        key = key.encode('utf-8')
+    return hashlib.blake2b(key, digest_size=16).digest()
+
+class StoreStats(BaseModel):
+    """Size of a segment store and how much of it compaction would reclaim."""
+    records: int = 0
+    segments: int = 0
+    size_bytes: int = 0
+    live_bytes: int = 0
+
+class SegmentStore:
+    """
+    Append-only log of ``SignData`` results with an on-disk hash index.
+
+    Open one instance per process that writes (``readonly=False``, the
+    default) and any number with ``readonly=True`` to read concurrently.
+    Records written by another process become visible after ``refresh``;
+    lookups of unknown keys refresh automatically.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        readonly: bool = False,
+        compression: Optional[str] = None,
+        compression_level: int = 3,
+        segment_bytes: int = 256 * 1024 * 1024
+    ):
+        """
+        Open (or create) a segment store.
+
+        Args:
+            path: Directory holding the segments and index
+            readonly: Open for reading only, without taking the writer lock
+            compression: None, or 'zstd' to compress records as they're written
+            compression_level: zstd compression level
+            segment_bytes: Size at which the writer starts a new segment
+        """
+        if compression not in (None, 'zstd'):
+            raise ConfigurationError(f"Unsupported segment store compression: {compression!r}")
+
+        self.path = Path(path).expanduser()
+        self.readonly = readonly
+        self.segment_bytes = segment_bytes
+        self._compressor = None
+        if compression == 'zstd':
+            self._compressor = _require_zstandard().ZstdCompressor(level=compression_level)
+        self._decompressor = None
+
+        self._lock = threading.RLock()
+        self._keydir: Dict[bytes, int] = {}
+        self._count = 0
+        self._entries = np.zeros(0, dtype=INDEX_DTYPE)
+        self._index_id: Optional[Tuple[int, int]] = None
+        self._segments: Dict[int, mmap.mmap] = {}
+
+        self._lock_file = None
+        self._segment_file = None
+        self._index_file = None
+        self._pending: List[Tuple[bytes, int, int, int, int]] = []
+        if not readonly:
+            self._open_writer()
+        self.refresh()
+
+    @staticmethod
+    def make_key(image_data: bytes) -> str:
+        """Key for an image: the hex SHA-256 of its bytes."""
+        return hashlib.sha256(image_data).hexdigest()
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.path / f"segment-{segment:06d}.log"
+
+    def _segment_ids(self) -> List[int]:
+        return sorted(
+            int(match.group(1)) for match in map(_SEGMENT.match, os.listdir(self.path)) if match
+        )
+
+    def _open_writer(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock_file = open(self.path / _LOCK_NAME, 'a+b')
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._lock_file.close()
+                raise ConfigurationError(f"Segment store {self.path} is already open for writing")
+
+        # Drop a torn index entry, records written after the last complete
+        # entry, and segments left behind by an interrupted compaction
+        index_path = self.path / _INDEX_NAME
+        with open(index_path, 'a+b') as index_file:
+            size = index_file.seek(0, os.SEEK_END)
+            index_file.truncate(size - size % INDEX_DTYPE.itemsize)
+        entries = np.fromfile(index_path, dtype=INDEX_DTYPE)
+
+        referenced = set(np.unique(entries['segment']).tolist())
+        existing = self._segment_ids()
+        active = max(existing + list(referenced) + [0])
+        in_active = entries['segment'] == active
+        end = int((entries['offset'][in_active] + entries['length'][in_active]).max()) if in_active.any() else 0
+        for segment in existing:
+            if segment != active and segment not in referenced:
+                logger.warning(f"Removing unreferenced segment {segment} of {self.path}")
+                self._segment_path(segment).unlink()
+
+        self._segment = active
+        self._segment_file = open(self._segment_path(active), 'ab')
+        size = self._segment_file.seek(0, os.SEEK_END)
+        if size > end:
+            logger.warning(f"Discarding {size - end} unindexed bytes at the end of segment {active}")
+            self._segment_file.truncate(end)
+            self._segment_file.seek(end)
+        self._offset = end
+        self._index_file = open(index_path, 'ab')
+
+    def _check_writable(self) -> None:
+        if self._segment_file is None:
+            raise ConfigurationError(f"Segment store {self.path} is not open for writing")
+
+    def _append(self, key: str, sign: SignData) -> None:
+        key_bytes = key.encode('utf-8')
+        payload = _SIGN_SERIALIZER.to_json(sign, exclude_none=True)
+        flags = 0
+        if self._compressor is not None:
+            payload = self._compressor.compress(payload)
+            flags |= COMPRESSED
+
+        length = _RECORD.size + len(key_bytes) + len(payload)
+        if self._offset and self._offset + length > self.segment_bytes:
+            self._segment_file.close()
+            self._segment += 1
+            self._segment_file = open(self._segment_path(self._segment), 'ab')
+            self._offset = 0
+
+        crc = zlib.crc32(payload, zlib.crc32(key_bytes))
+        self._segment_file.write(_RECORD.pack(len(payload), crc, len(key_bytes), flags))
+        self._segment_file.write(key_bytes)
+        self._segment_file.write(payload)
+        self._pending.append((key_digest(key_bytes), self._segment, flags, self._offset, length))
+        self._offset += length
+
+    def put(self, key: str, sign: SignData) -> None:
+        """Append the result for ``key``, replacing any earlier one."""
+        with self._lock:
+            self._check_writable()
+            self._append(key, sign)
+            self.flush()
+
+    def put_many(self, items: Iterable[Tuple[str, SignData]]) -> int:
+        """
+        Append many results, flushing once at the end.
+
+        Args:
+            items: (key, SignData) pairs
+
+        Returns:
+            int: Number of records written
+        """
+        with self._lock:
+            self._check_writable()
+            written = 0
+            for key, sign in items:
+                self._append(key, sign)
+                written += 1
+            self.flush()
+            return written
+
+    def delete(self, key: str) -> bool:
+        """Delete the result for ``key``; returns False if there was none."""
+        with self._lock:
+            self._check_writable()
+            digest = key_digest(key)
+            if digest not in self._keydir:
+                return False
+            self._pending.append((digest, self._segment, TOMBSTONE, self._offset, 0))
+            self.flush()
+            return True
+
+    def flush(self) -> None:
+        """Make appended records visible to readers (segments first, then the index)."""
+        with self._lock:
+            if self._segment_file is None or not self._pending:
+                return
+            self._segment_file.flush()
+            entries = np.array(self._pending, dtype=INDEX_DTYPE)
+            self._index_file.write(entries.tobytes())
+            self._index_file.flush()
+            self._pending = []
+            self._apply(entries)
+
+    def _apply(self, entries: np.ndarray) -> None:
+        keydir = self._keydir
+        number = self._count
+        for digest, flags in zip(entries['digest'].tolist(), entries['flags'].tolist()):
+            if flags & TOMBSTONE:
+                keydir.pop(digest, None)
+            else:
+                keydir[digest] = number
+            number += 1
+        self._count = number
+
+    def refresh(self) -> None:
+        """Pick up records appended, or a compaction finished, by another process."""
+        with self._lock:
+            try:
+                index_file = open(self.path / _INDEX_NAME, 'rb')
+            except FileNotFoundError:
+                return
+            with index_file:
+                stat = os.fstat(index_file.fileno())
+                index_id = (stat.st_dev, stat.st_ino)
+                replaced = index_id != self._index_id
+                if replaced:
+                    self._keydir = {}
+                    self._count = 0
+                    self._segments = {}
+                    self._index_id = index_id
+
+                count = stat.st_size // INDEX_DTYPE.itemsize
+                if replaced or count > len(self._entries):
+                    self._entries = np.zeros(0, dtype=INDEX_DTYPE)
+                    if count:
+                        # The mapping stays alive as long as the entries view does
+                        mapping = mmap.mmap(index_file.fileno(), count * INDEX_DTYPE.itemsize, access=mmap.ACCESS_READ)
+                        self._entries = np.frombuffer(mapping, dtype=INDEX_DTYPE, count=count)
+            if count > self._count:
+                self._apply(self._entries[self._count:count])
+
+    def _entry(self, number: int) -> Tuple[int, int, int]:
+        if number >= len(self._entries):
+            self.refresh()
+        entry = self._entries[number]
+        return int(entry['segment']), int(entry['offset']), int(entry['length'])
+
+    def _view(self, segment: int, end: int) -> mmap.mmap:
+        """Mapping of a segment covering at least its first ``end`` bytes."""
+        view = self._segments.get(segment)
+        if view is None or len(view) < end:
+            with open(self._segment_path(segment), 'rb') as segment_file:
+                view = self._segments[segment] = mmap.mmap(segment_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return view
+
+    def _read(self, segment: int, offset: int, length: int) -> bytes:
+        return self._view(segment, offset + length)[offset:offset + length]
+
+    def _decode(self, record: bytes) -> Tuple[bytes, SignData]:
+        size, crc, key_size, flags = _RECORD.unpack_from(record)
+        key = record[_RECORD.size:_RECORD.size + key_size]
+        payload = record[_RECORD.size + key_size:]
+        if len(payload) != size or zlib.crc32(payload, zlib.crc32(key)) != crc:
+            raise ValidationError(f"Corrupt record for key {key!r} in {self.path}")
+        if flags & COMPRESSED:
+            if self._decompressor is None:
+                self._decompressor = _require_zstandard().ZstdDecompressor()
+            payload = self._decompressor.decompress(payload)
+        return key, _SIGN_VALIDATOR.validate_json(payload)
+
+    def _lookup(self, key: str) -> Optional[int]:
+        digest = key_digest(key)
+        number = self._keydir.get(digest)
+        if number is None:
+            self.refresh()
+            number = self._keydir.get(digest)
+        return number
+
+    def get(self, key: str) -> Optional[SignData]:
+        """Return the stored result for ``key``, or None if there is none."""
+        with self._lock:
+            number = self._lookup(key)
+            if number is None:
+                return None
+            try:
+                record = self._read(*self._entry(number))
+            except FileNotFoundError:
+                # Compacted away by another process since the last refresh
+                self.refresh()
+                number = self._keydir.get(key_digest(key))
+                if number is None:
+                    return None
+                record = self._read(*self._entry(number))
+            return self._decode(record)[1]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.refresh()
+            return len(self._keydir)
+
+    def _live_entries(self) -> np.ndarray:
+        """Index entries of live records, in write order."""
+        self.refresh()
+        return self._entries[np.sort(np.fromiter(self._keydir.values(), dtype=np.int64, count=len(self._keydir)))]
+
+    def items(self) -> Iterator[Tuple[str, SignData]]:
+        """
+        Iterate over all live results in write order.
+
+        Records are read sequentially from each segment mapping, so this is
+        the fast way to process the whole store.
+
+        Yields:
+            Tuple[str, SignData]: Key and result
+        """
+        with self._lock:
+            entries = self._live_entries()
+            ends = entries['offset'] + entries['length']
+            views = {
+                segment: self._view(segment, int(ends[entries['segment'] == segment].max()))
+                for segment in np.unique(entries['segment']).tolist()
+            }
+        for segment, offset, end in zip(entries['segment'].tolist(), entries['offset'].tolist(), ends.tolist()):
+            key, sign = self._decode(views[segment][offset:end])
+            yield key.decode('utf-8'), sign
+
+    def __iter__(self) -> Iterator[SignData]:
+        for _, sign in self.items():
+            yield sign
+
+    @property
+    def stats(self) -> StoreStats:
+        """Record count, segment count, and total and live record bytes."""
+        with self._lock:
+            entries = self._live_entries()
+            segments = self._segment_ids()
+            return StoreStats(
+                records=len(entries),
+                segments=len(segments),
+                size_bytes=sum(self._segment_path(segment).stat().st_size for segment in segments),
+                live_bytes=int(entries['length'].sum()),
+            )
+
+    def compact(self) -> int:
+        """
+        Rewrite live records into new segments and drop everything else.
+
+        Replaced and deleted results are discarded. Records are copied
+        byte for byte, so compressed records stay compressed. Readers keep
+        working on the old segments until their next ``refresh``.
+
+        Returns:
+            int: Bytes reclaimed
+        """
+        with self._lock:
+            self._check_writable()
+            self.flush()
+            before = self.stats.size_bytes
+            live = self._live_entries()
+            old_segments = self._segment_ids()
+
+            self._segment_file.close()
+            self._segment += 1
+            self._segment_file = open(self._segment_path(self._segment), 'ab')
+            self._offset = 0
+            for digest, segment, flags, offset, length in live.tolist():
+                if self._offset and self._offset + length > self.segment_bytes:
+                    self._segment_file.close()
+                    self._segment += 1
+                    self._segment_file = open(self._segment_path(self._segment), 'ab')
+                    self._offset = 0
+                self._segment_file.write(self._read(segment, offset, length))
+                self._pending.append((digest, self._segment, flags, self._offset, length))
+                self._offset += length
+            self._segment_file.flush()
+            os.fsync(self._segment_file.fileno())
+
+            index_path = self.path / _INDEX_NAME
+            temp_path = self.path / f"{_INDEX_NAME}.tmp"
+            with open(temp_path, 'wb') as temp_file:
+                temp_file.write(np.array(self._pending, dtype=INDEX_DTYPE).tobytes())
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            self._pending = []
+            self._index_file.close()
+            os.replace(temp_path, index_path)
+            self._index_file = open(index_path, 'ab')
+
+            for segment in old_segments:
+                self._segment_path(segment).unlink()
+            self.refresh()
+            reclaimed = before - self.stats.size_bytes
+            logger.info(f"Compacted {self.path}: {len(live)} records kept, {reclaimed} bytes reclaimed")
+            return reclaimed
+
+    def close(self) -> None:
+        """Flush and release files, mappings and the writer lock."""
+        with self._lock:
+            if self._segment_file is not None:
+                self.flush()
+                os.fsync(self._segment_file.fileno())
+                os.fsync(self._index_file.fileno())
+                self._segment_file.close()
+                self._index_file.close()
+                self._segment_file = self._index_file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+            self._segments = {}
+            self._entries = np.zeros(0, dtype=INDEX_DTYPE)
+
+    def __enter__(self) -> "SegmentStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,27 @@
+"""
+Local fakes and load testing tools for the Curb Sign Parser.
+"""
+
+from .fake_server import (
+    DEFAULT_RESPONSE,
+    FakeProviderServer,
+    constant_latency,
+    load_recordings,
+    lognormal_latency,
+    record_response,
+    uniform_latency,
+)
+from .loadtest import LoadTestReport, run_load_test, run_load_test_async
+
+__all__ = [
+    "DEFAULT_RESPONSE",
+    "FakeProviderServer",
+    "LoadTestReport",
+    "constant_latency",
+    "load_recordings",
+    "lognormal_latency",
+    "record_response",
+    "run_load_test",
+    "run_load_test_async",
+    "uniform_latency",
+]
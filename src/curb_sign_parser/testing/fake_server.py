@@ -0,0 +1,410 @@
+"""
+Local stand-in for the Anthropic Messages and OpenAI Chat Completions APIs.
+
+Point ``ClaudeProvider(base_url=server.url)`` or
+``GPT4VisionProvider(base_url=server.openai_url)`` at a running
+``FakeProviderServer`` to exercise the real client stack (connection pooling,
+retries, rate limiting) with configurable latency, injected 429/5xx failures
+and replayed responses, without network access or API spend.
+"""
+
+import base64
+import hashlib
+import itertools
+import json
+import logging
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+LatencyModel = Callable[[random.Random], float]
+ResponseSource = Union[str, Sequence[str], Mapping[str, str], Callable[[bytes], str]]
+
+DEFAULT_RESPONSE = json.dumps({
+    "policies": [{
+        "time_spans": [{"days": ["MON", "TUE", "WED", "THU", "FRI"], "start_time": "09:00", "end_time": "18:00"}],
+        "rules": [{"activity": "parking", "max_stay": 120}]
+    }]
+})
+
+def constant_latency(seconds: float) -> LatencyModel:
+    """Every request takes ``seconds``."""
+    return lambda rng: seconds
+
+def uniform_latency(low: float, high: float) -> LatencyModel:
+    """Latency drawn uniformly from ``[low, high]``."""
+    return lambda rng: rng.uniform(low, high)
+
+def lognormal_latency(median: float, sigma: float = 0.5) -> LatencyModel:
+    """
+    Heavy-tailed latency, the usual shape of LLM completion times.
+
+    Args:
+        median: Median latency in seconds
+        sigma: Shape; 0.5 puts p99 at roughly 3.2x the median
+    """
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+def image_digest(image_data: bytes) -> str:
+    """Key used to match recorded responses to images."""
+    return hashlib.sha256(image_data).hexdigest()
+
+def load_recordings(path: Union[str, Path]) -> Dict[str, str]:
+    """
+    Load recorded responses written by ``record_response``.
+
+    Returns:
+        Dict[str, str]: Response text keyed by image digest
+    """
+    recordings = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                recordings[record["image_sha256"]] = record["response"]
+    return recordings
+
+def record_response(path: Union[str, Path], image_data: bytes, response: str) -> None:
+    """Append one real provider response to a JSONL recordings file."""
+    with open(path, "a") as f:
+        f.write(json.dumps({"image_sha256": image_digest(image_data), "response": response}) + "\n")
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 4096
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so pooled client connections are reused as against the real APIs
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_events(self, events: List[str]) -> None:
+        """Send server-sent events with chunked encoding, pacing them like token output."""
+        fake: FakeProviderServer = self.server.fake
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for event in events:
+                data = event.encode("utf-8")
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+                if fake.stream_interval:
+                    time.sleep(fake.stream_interval)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client closed the stream early, aborting "generation"
+            fake._count("aborted")
+            self.close_connection = True
+
+    def do_HEAD(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self) -> None:
+        fake: FakeProviderServer = self.server.fake
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        path = self.path.split("?", 1)[0]
+
+        if path == "/v1/messages":
+            api = "anthropic"
+        elif path == "/v1/chat/completions":
+            api = "openai"
+        else:
+            self._send_json(404, {"error": {"message": f"Unknown path {path}"}})
+            return
+
+        request = json.loads(body)
+        status, payload, headers = fake.handle(api, request)
+        if isinstance(payload, list):
+            self._send_events(payload)
+        else:
+            self._send_json(status, payload, headers)
+
+class FakeProviderServer:
+    """
+    Threaded HTTP server imitating the provider endpoints the parser calls.
+
+    Each request first draws a fault: a 429 (returned immediately with
+    ``Retry-After``) with probability ``rate_limit_rate``, or a 5xx with
+    probability ``error_rate`` (returned after the drawn latency). Otherwise
+    it sleeps for the drawn latency and returns a completion whose text
+    comes from ``responses``; streaming requests get it as server-sent
+    events, ``stream_chunk_chars`` characters at a time.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Optional[LatencyModel] = None,
+        responses: Optional[ResponseSource] = None,
+        rate_limit_rate: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = (500, 503, 529),
+        retry_after: float = 1.0,
+        input_tokens: int = 1800,
+        output_tokens: int = 200,
+        stream_chunk_chars: int = 16,
+        stream_interval: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the server (call ``start`` or use it as a context manager).
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            latency: Latency model; see ``constant_latency``,
+                ``uniform_latency`` and ``lognormal_latency`` (default: none)
+            responses: Completion text: a fixed string, a sequence cycled
+                through, recordings keyed by image digest (unknown images get
+                ``DEFAULT_RESPONSE``), or a callable given the image bytes
+            rate_limit_rate: Fraction of requests answered with 429
+            error_rate: Fraction of requests answered with a 5xx status
+            error_statuses: Statuses used for injected server errors
+            retry_after: ``Retry-After`` seconds sent with 429 responses
+            input_tokens: Input token count reported in usage
+            output_tokens: Output token count reported in usage
+            stream_chunk_chars: Characters per streamed text delta
+            stream_interval: Seconds between streamed events
+            seed: Seed for latency and fault draws
+        """
+        if rate_limit_rate + error_rate > 1:
+            raise ValueError("rate_limit_rate + error_rate must not exceed 1")
+        self.latency = latency or constant_latency(0.0)
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.retry_after = retry_after
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.stream_chunk_chars = stream_chunk_chars
+        self.stream_interval = stream_interval
+        self._responses = responses if responses is not None else DEFAULT_RESPONSE
+        self._cycle = None
+        if not isinstance(self._responses, (str, Mapping)) and not callable(self._responses):
+            self._cycle = itertools.cycle(list(self._responses))
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counter = itertools.count(1)
+        self._stats: Dict[str, int] = {}
+
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL for ``ClaudeProvider(base_url=...)``."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_url(self) -> str:
+        """Base URL for ``GPT4VisionProvider(base_url=...)``."""
+        return f"{self.url}/v1"
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Requests received and responses sent, by status code."""
+        with self._lock:
+            return dict(self._stats)
+
+    def start(self) -> "FakeProviderServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Fake provider server listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeProviderServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] = self._stats.get(key, 0) + 1
+
+    def _draw(self) -> Tuple[float, float]:
+        with self._lock:
+            return self._rng.random(), self.latency(self._rng)
+
+    def _response_text(self, image_data: Callable[[], bytes]) -> str:
+        responses = self._responses
+        if isinstance(responses, str):
+            return responses
+        if self._cycle is not None:
+            with self._lock:
+                return next(self._cycle)
+        if isinstance(responses, Mapping):
+            return responses.get(image_digest(image_data()), DEFAULT_RESPONSE)
+        return responses(image_data())
+
+    @staticmethod
+    def _image_data(api: str, request: Dict[str, Any]) -> bytes:
+        """Decode the first image in a request body."""
+        for message in request.get("messages", []):
+            content = message.get("content")
+            if not isinstance(content, list):
+                continue
+            for block in content:
+                if api == "anthropic" and block.get("type") == "image":
+                    return base64.b64decode(block["source"]["data"])
+                if api == "openai" and block.get("type") == "image_url":
+                    return base64.b64decode(block["image_url"]["url"].split(",", 1)[1])
+        return b""
+
+    def handle(
+        self,
+        api: str,
+        request: Dict[str, Any]
+    ) -> Tuple[int, Union[Dict[str, Any], List[str]], Dict[str, str]]:
+        """
+        Produce the status, body and headers for one request.
+
+        Args:
+            api: ``"anthropic"`` or ``"openai"``
+            request: Decoded request body
+
+        Returns:
+            Tuple[int, dict | list, dict]: Status code, JSON response body (or
+            server-sent events for streaming requests) and extra headers
+        """
+        self._count("requests")
+        fault, latency = self._draw()
+
+        if fault < self.rate_limit_rate:
+            self._count("429")
+            return 429, self._error_body(api, 429), {"retry-after": str(self.retry_after)}
+
+        time.sleep(latency)
+
+        if fault < self.rate_limit_rate + self.error_rate:
+            status = self.error_statuses[int(fault * 1e6) % len(self.error_statuses)]
+            self._count(str(status))
+            return status, self._error_body(api, status), {}
+
+        text = self._response_text(lambda: self._image_data(api, request))
+        self._count("200")
+        if request.get("stream"):
+            return 200, self._completion_events(api, request.get("model", "fake"), text), {}
+        return 200, self._completion_body(api, request.get("model", "fake"), text), {}
+
+    def _error_body(self, api: str, status: int) -> Dict[str, Any]:
+        kind = {429: "rate_limit_error", 529: "overloaded_error"}.get(status, "api_error")
+        message = f"Injected {status} from fake provider server"
+        if api == "anthropic":
+            return {"type": "error", "error": {"type": kind, "message": message}}
+        return {"error": {"type": kind, "message": message, "code": str(status)}}
+
+    def _completion_body(self, api: str, model: str, text: str) -> Dict[str, Any]:
+        n = next(self._counter)
+        if api == "anthropic":
+            return {
+                "id": f"msg_fake_{n}",
+                "type": "message",
+                "role": "assistant",
+                "model": model,
+                "content": [{"type": "text", "text": text}],
+                "stop_reason": "end_turn",
+                "stop_sequence": None,
+                "usage": {"input_tokens": self.input_tokens, "output_tokens": self.output_tokens}
+            }
+        return {
+            "id": f"chatcmpl-fake-{n}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": self.input_tokens,
+                "completion_tokens": self.output_tokens,
+                "total_tokens": self.input_tokens + self.output_tokens
+            }
+        }
+
+    def _completion_events(self, api: str, model: str, text: str) -> List[str]:
+        n = next(self._counter)
+        size = max(1, self.stream_chunk_chars)
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+
+        def sse(data: Dict[str, Any], event: Optional[str] = None) -> str:
+            prefix = f"event: {event}\n" if event else ""
+            return f"{prefix}data: {json.dumps(data)}\n\n"
+
+        if api == "anthropic":
+            events = [
+                sse({"type": "message_start", "message": {
+                    "id": f"msg_fake_{n}", "type": "message", "role": "assistant", "model": model,
+                    "content": [], "stop_reason": None, "stop_sequence": None,
+                    "usage": {"input_tokens": self.input_tokens, "output_tokens": 1}
+                }}, "message_start"),
+                sse({"type": "content_block_start", "index": 0,
+                     "content_block": {"type": "text", "text": ""}}, "content_block_start"),
+            ]
+            events += [
+                sse({"type": "content_block_delta", "index": 0,
+                     "delta": {"type": "text_delta", "text": piece}}, "content_block_delta")
+                for piece in pieces
+            ]
+            events += [
+                sse({"type": "content_block_stop", "index": 0}, "content_block_stop"),
+                sse({"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                     "usage": {"output_tokens": self.output_tokens}}, "message_delta"),
+                sse({"type": "message_stop"}, "message_stop"),
+            ]
+            return events
+
+        base = {"id": f"chatcmpl-fake-{n}", "object": "chat.completion.chunk",
+                "created": int(time.time()), "model": model}
+        events = [sse({**base, "choices": [
+            {"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}
+        ]})]
+        events += [
+            sse({**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+            for piece in pieces
+        ]
+        events += [
+            sse({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}),
+            sse({**base, "choices": [], "usage": {
+                "prompt_tokens": self.input_tokens,
+                "completion_tokens": self.output_tokens,
+                "total_tokens": self.input_tokens + self.output_tokens
+            }}),
+            "data: [DONE]\n\n",
+        ]
+        return events
@@ -0,0 +1,234 @@
+"""
+End-to-end load testing against the fake provider server.
+
+``run_load_test`` (threads) and ``run_load_test_async`` (asyncio) drive a
+configured parser through a fixed number of parses and report throughput,
+latency percentiles and error rates. The command line entry point starts a
+``FakeProviderServer`` and points a real provider at it:
+
+    python -m curb_sign_parser.testing.loadtest --requests 2000 --concurrency 64 \\
+        --latency-median 0.8 --rate-limit-rate 0.02 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from ..processors.image_processor import ImageInput
+from ..providers.registry import available_providers
+from .fake_server import (
+    FakeProviderServer,
+    constant_latency,
+    load_recordings,
+    lognormal_latency,
+)
+
+if TYPE_CHECKING:
+    from ..async_parser import AsyncCurbSignParser
+    from ..parser import CurbSignParser
+
+class LoadTestReport(BaseModel):
+    """Outcome of a load test run."""
+    requests: int
+    succeeded: int
+    failed: int
+    duration_seconds: float
+    throughput: float
+    latency_p50: float
+    latency_p95: float
+    latency_p99: float
+    latency_max: float
+    error_rate: float
+    errors: Dict[str, int] = {}
+    server: Optional[Dict[str, int]] = None
+
+def build_report(
+    outcomes: Sequence[Tuple[float, Optional[str]]],
+    duration: float,
+    server: Optional[FakeProviderServer] = None
+) -> LoadTestReport:
+    """
+    Summarize per-parse outcomes.
+
+    Args:
+        outcomes: ``(latency_seconds, error_type_or_None)`` per parse
+        duration: Wall-clock seconds for the whole run
+        server: Fake server whose status counts are included
+
+    Returns:
+        LoadTestReport: Throughput counts successful parses only; latency
+        percentiles cover every parse, including retries and failures
+    """
+    latencies = np.array([latency for latency, _ in outcomes], dtype=np.float64)
+    errors = Counter(error for _, error in outcomes if error is not None)
+    failed = sum(errors.values())
+    total = len(outcomes)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if total else (0.0, 0.0, 0.0)
+
+    return LoadTestReport(
+        requests=total,
+        succeeded=total - failed,
+        failed=failed,
+        duration_seconds=duration,
+        throughput=(total - failed) / duration if duration > 0 else 0.0,
+        latency_p50=float(p50),
+        latency_p95=float(p95),
+        latency_p99=float(p99),
+        latency_max=float(latencies.max()) if total else 0.0,
+        error_rate=failed / total if total else 0.0,
+        errors=dict(errors),
+        server=server.stats if server is not None else None
+    )
+
+def run_load_test(
+    parser: 'CurbSignParser',
+    images: Sequence[ImageInput],
+    requests: int,
+    concurrency: int = 8,
+    server: Optional[FakeProviderServer] = None
+) -> LoadTestReport:
+    """
+    Run ``requests`` parses on ``concurrency`` threads.
+
+    Args:
+        parser: Parser under test (its provider configuration is what is measured)
+        images: Images cycled through for the parses
+        requests: Total number of parses
+        concurrency: Number of parses in flight at once
+        server: Fake server backing the parser, for its status counts
+
+    Returns:
+        LoadTestReport: Throughput, latency percentiles and error rates
+    """
+    def one(idx: int) -> Tuple[float, Optional[str]]:
+        start = time.perf_counter()
+        try:
+            parser.parse_sign(images[idx % len(images)])
+            error = None
+        except Exception as e:
+            error = type(e).__name__
+        return time.perf_counter() - start, error
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, range(requests)))
+    return build_report(outcomes, time.perf_counter() - start, server)
+
+async def run_load_test_async(
+    parser: 'AsyncCurbSignParser',
+    images: Sequence[ImageInput],
+    requests: int,
+    concurrency: int = 64,
+    server: Optional[FakeProviderServer] = None
+) -> LoadTestReport:
+    """Async counterpart of ``run_load_test``, for thousands of concurrent parses."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(idx: int) -> Tuple[float, Optional[str]]:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await parser.parse_sign(images[idx % len(images)])
+                error = None
+            except Exception as e:
+                error = type(e).__name__
+            return time.perf_counter() - start, error
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(one(idx) for idx in range(requests)))
+    return build_report(outcomes, time.perf_counter() - start, server)
+
+def _sample_images() -> List[bytes]:
+    """A small synthetic sign photo, for runs without input images."""
+    from PIL import Image, ImageDraw
+
+    img = Image.new('RGB', (1024, 768), 'gray')
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([256, 150, 768, 618], fill='white', outline='red', width=8)
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=90)
+    return [buffer.getvalue()]
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m curb_sign_parser.testing.loadtest',
+        description="Load test a parser configuration against a local fake provider server."
+    )
+    parser.add_argument('images', nargs='?', help="Directory, glob or manifest of images (default: synthetic)")
+    parser.add_argument('--provider', default='claude', choices=available_providers())
+    parser.add_argument('--requests', type=int, default=500, help="Total parses")
+    parser.add_argument('--concurrency', type=int, default=32, help="Parses in flight at once")
+    parser.add_argument('--async', dest='use_async', action='store_true', help="Use AsyncCurbSignParser")
+    parser.add_argument('--stream', action='store_true', help="Stream responses and parse them incrementally")
+    parser.add_argument('--latency-median', type=float, default=0.5, help="Median server latency in seconds")
+    parser.add_argument('--latency-sigma', type=float, default=0.5, help="Lognormal shape (0 for constant latency)")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of 5xx responses")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument('--recordings', help="JSONL recorded responses to replay")
+    parser.add_argument('--max-attempts', type=int, default=4, help="Provider retry attempts")
+    parser.add_argument('--seed', type=int, help="Seed for server latency and fault draws")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ..parser import CurbSignParser
+    from ..providers.base import RetryPolicy
+    from ..providers.transport import TransportConfig
+
+    args = build_arg_parser().parse_args(argv)
+
+    if args.images:
+        from ..cli import iter_sources
+        images = list(iter_sources(args.images))
+    else:
+        images = _sample_images()
+
+    if args.latency_sigma > 0:
+        latency = lognormal_latency(args.latency_median, args.latency_sigma)
+    else:
+        latency = constant_latency(args.latency_median)
+
+    server = FakeProviderServer(
+        latency=latency,
+        responses=load_recordings(args.recordings) if args.recordings else None,
+        rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+
+    provider_kwargs = {
+        # The fake server speaks the Anthropic API, plus the OpenAI API for gpt4
+        'base_url': server.openai_url if args.provider == 'gpt4' else server.url,
+        'transport': TransportConfig.for_concurrency(args.concurrency),
+        'retry_policy': RetryPolicy(max_attempts=args.max_attempts),
+        'stream': args.stream,
+    }
+
+    with server:
+        if args.use_async:
+            from ..async_parser import AsyncCurbSignParser
+
+            async def run() -> LoadTestReport:
+                async with AsyncCurbSignParser('fake-key', provider=args.provider, **provider_kwargs) as parser:
+                    return await run_load_test_async(parser, images, args.requests, args.concurrency, server)
+
+            report = asyncio.run(run())
+        else:
+            parser = CurbSignParser('fake-key', provider=args.provider, **provider_kwargs)
+            report = run_load_test(parser, images, args.requests, args.concurrency, server)
+
+    print(json.dumps(report.model_dump(), indent=2))
+    return 0 if report.failed == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
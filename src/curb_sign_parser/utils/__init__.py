@@ -12,7 +12,13 @@ from .exceptions import (
     ConfigurationError,
     ParsingError,
 )
-from .validators import Validators
+
+def __getattr__(name: str):
+    # Validators depends on the pydantic models; load it only when used
+    if name == "Validators":
+        from .validators import Validators
+        return Validators
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "CurbSignParserError",
@@ -16,10 +16,17 @@ class ValidationError(CurbSignParserError):
 
 class APIError(CurbSignParserError):
     """Raised when there's an error communicating with an API."""
-    def __init__(self, message: str, status_code: int = None, response: str = None):
+    def __init__(
+        self,
+        message: str,
+        status_code: int = None,
+        response: str = None,
+        retry_after: float = None
+    ):
         super().__init__(message)
         self.status_code = status_code
         self.response = response
+        self.retry_after = retry_after
 
 class UnsupportedFormatError(CurbSignParserError):
     """Raised when an unsupported image format is encountered."""
@@ -0,0 +1,263 @@
+"""
+Timing spans for the stages of parsing a sign image.
+
+The parser, image processor and providers wrap each stage in
+``instrumentation.span(name)``. Stages reported:
+
+    parse_sign   whole call, from source to SignData
+    read         reading the source into memory
+    exif         extracting location metadata
+    decode       decoding pixels (at reduced size when possible)
+    resize       resizing to the provider's maximum dimension
+    encode       JPEG encoding
+    base64       encoding the image for the request body
+    network      one provider request attempt
+    json_parse   parsing the LLM response
+    normalize    mapping the response onto the CDS structure
+    validate     constructing the pydantic models
+
+The default ``Instrumentation`` discards spans without timing anything.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .exceptions import ConfigurationError
+
+SpanCallback = Callable[[str, float, Dict[str, Any], Optional[BaseException]], None]
+
+class _NullSpan:
+    """Context manager used when instrumentation is disabled."""
+
+    def __enter__(self) -> Dict[str, Any]:
+        return {}
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _TimedSpan:
+    """Times a block and reports it to ``Instrumentation.on_span``."""
+
+    __slots__ = ('_owner', '_name', '_attributes', '_start')
+
+    def __init__(self, owner: "Instrumentation", name: str, attributes: Dict[str, Any]):
+        self._owner = owner
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self) -> Dict[str, Any]:
+        self._start = time.perf_counter()
+        return self._attributes
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self._start
+        self._owner.on_span(self._name, duration, self._attributes, exc)
+        return False
+
+class Instrumentation:
+    """
+    Receives timed spans from the parser.
+
+    Subclasses set ``enabled = True`` and override ``on_span``. The base class
+    is a no-op, so uninstrumented parsers pay only for a method call per stage.
+    """
+
+    enabled = False
+
+    def span(self, name: str, **attributes: Any):
+        """
+        Time a stage.
+
+        Used as ``with instrumentation.span("decode") as attributes:``; the
+        yielded dict can be updated with attributes known only after the
+        stage has run.
+
+        Args:
+            name: Stage name
+            **attributes: Attributes recorded with the span
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _TimedSpan(self, name, attributes)
+
+    def on_span(
+        self,
+        name: str,
+        duration: float,
+        attributes: Dict[str, Any],
+        error: Optional[BaseException]
+    ) -> None:
+        """
+        Handle a finished span.
+
+        Args:
+            name: Stage name
+            duration: Wall-clock seconds spent in the stage
+            attributes: Span attributes
+            error: Exception raised inside the stage, if any
+        """
+        pass
+
+NULL_INSTRUMENTATION = Instrumentation()
+
+class CallbackInstrumentation(Instrumentation):
+    """Pass every finished span to a callback."""
+
+    enabled = True
+
+    def __init__(self, callback: SpanCallback):
+        """
+        Initialize the hook.
+
+        Args:
+            callback: Called as ``callback(name, duration, attributes, error)``
+                from whichever thread ran the stage
+        """
+        self.callback = callback
+
+    def on_span(self, name, duration, attributes, error) -> None:
+        self.callback(name, duration, attributes, error)
+
+class MetricsInstrumentation(Instrumentation):
+    """
+    Per-stage counters and latency histograms in Prometheus text format.
+
+    ``render()`` returns the exposition text for a ``/metrics`` endpoint;
+    ``snapshot()`` returns the same numbers as plain Python data.
+    """
+
+    enabled = True
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "curb_sign_parser"):
+        """
+        Initialize the metrics.
+
+        Args:
+            buckets: Histogram upper bounds in seconds
+            namespace: Prefix for metric names
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        # stage -> [bucket counts..., +Inf count], sum of durations, error count
+        self._counts: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+        self._errors: Dict[str, int] = {}
+
+    def on_span(self, name, duration, attributes, error) -> None:
+        index = bisect_left(self.buckets, duration)
+        with self._lock:
+            counts = self._counts.get(name)
+            if counts is None:
+                counts = self._counts[name] = [0] * (len(self.buckets) + 1)
+                self._sums[name] = 0.0
+                self._errors[name] = 0
+            counts[index] += 1
+            self._sums[name] += duration
+            if error is not None:
+                self._errors[name] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Current values per stage.
+
+        Returns:
+            Dict[str, dict]: ``count``, ``sum`` (seconds), ``errors`` and
+            cumulative ``buckets`` as ``(upper_bound, count)`` pairs, keyed by stage
+        """
+        with self._lock:
+            stages = {
+                name: (list(counts), self._sums[name], self._errors[name])
+                for name, counts in self._counts.items()
+            }
+
+        result = {}
+        for name, (counts, total, errors) in stages.items():
+            cumulative: List[Tuple[float, int]] = []
+            running = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                running += count
+                cumulative.append((bound, running))
+            result[name] = {"count": running, "sum": total, "errors": errors, "buckets": cumulative}
+        return result
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        seconds = f"{self.namespace}_stage_seconds"
+        errors = f"{self.namespace}_stage_errors_total"
+        snapshot = self.snapshot()
+
+        lines = [
+            f"# HELP {seconds} Time spent in each parsing stage.",
+            f"# TYPE {seconds} histogram",
+        ]
+        for name, stage in sorted(snapshot.items()):
+            for bound, count in stage["buckets"]:
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                lines.append(f'{seconds}_bucket{{stage="{name}",le="{le}"}} {count}')
+            lines.append(f'{seconds}_sum{{stage="{name}"}} {stage["sum"]}')
+            lines.append(f'{seconds}_count{{stage="{name}"}} {stage["count"]}')
+
+        lines += [
+            f"# HELP {errors} Stages that raised an exception.",
+            f"# TYPE {errors} counter",
+        ]
+        for name, stage in sorted(snapshot.items()):
+            lines.append(f'{errors}{{stage="{name}"}} {stage["errors"]}')
+
+        return "\n".join(lines) + "\n"
+
+class _OpenTelemetrySpan:
+    """Wraps ``tracer.start_as_current_span`` so spans nest under the caller's trace."""
+
+    __slots__ = ('_tracer', '_name', '_attributes', '_context', '_span')
+
+    def __init__(self, tracer: Any, name: str, attributes: Dict[str, Any]):
+        self._tracer = tracer
+        self._name = name
+        self._attributes = attributes
+
+    def __enter__(self) -> Dict[str, Any]:
+        self._context = self._tracer.start_as_current_span(f"curb_sign_parser.{self._name}")
+        self._span = self._context.__enter__()
+        return self._attributes
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        for key, value in self._attributes.items():
+            if isinstance(value, (str, bool, int, float)):
+                self._span.set_attribute(key, value)
+        # The OpenTelemetry context manager records the exception and error status
+        return self._context.__exit__(exc_type, exc, tb)
+
+class OpenTelemetryInstrumentation(Instrumentation):
+    """Report stages as OpenTelemetry spans (requires ``opentelemetry-api``)."""
+
+    enabled = True
+
+    def __init__(self, tracer: Any = None):
+        """
+        Initialize the hook.
+
+        Args:
+            tracer: OpenTelemetry tracer (defaults to the global tracer provider's
+                ``curb_sign_parser`` tracer)
+        """
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError:
+                raise ConfigurationError(
+                    "OpenTelemetry support requires the opentelemetry-api package. "
+                    "Install with: pip install curb-sign-parser[otel]"
+                )
+            tracer = trace.get_tracer("curb_sign_parser")
+        self.tracer = tracer
+
+    def span(self, name: str, **attributes: Any):
+        return _OpenTelemetrySpan(self.tracer, name, attributes)
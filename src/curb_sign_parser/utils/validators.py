@@ -46,23 +46,20 @@ class Validators:
         """
         Validate a TimeSpan object.
         
+        Overnight spans, whose end is at or before their start (e.g.
+        22:00-06:00), are valid and continue into the next day.
+        
         Args:
             time_span: TimeSpan to validate
             
         Returns:
             bool: True if valid
         """
-        if not Validators.validate_days(time_span.days):
-            return False
-            
-        if not (Validators.validate_time_format(time_span.start_time) and 
-                Validators.validate_time_format(time_span.end_time)):
+        if not Validators.validate_days(time_span.days_of_week):
             return False
             
-        # Validate time order
-        start = datetime.strptime(time_span.start_time, "%H:%M")
-        end = datetime.strptime(time_span.end_time, "%H:%M")
-        return start <= end
+        return (Validators.validate_time_format(time_span.time_of_day_start) and 
+                Validators.validate_time_format(time_span.time_of_day_end))
 
     @staticmethod
     def validate_duration(minutes: int) -> bool:
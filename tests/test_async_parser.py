@@ -0,0 +1,60 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from curb_sign_parser import AsyncCurbSignParser
+from curb_sign_parser.models.data_models import SignData
+from curb_sign_parser.providers.gpt4 import GPT4VisionProvider
+
+
+@pytest.fixture
+def async_parser(mock_claude_provider):
+    """Create an AsyncCurbSignParser with a mocked async provider."""
+    parser = AsyncCurbSignParser(api_key="test-key", provider="claude")
+    mock_claude_provider.process_image_async = AsyncMock(
+        return_value=mock_claude_provider.process_image.return_value
+    )
+    parser.provider = mock_claude_provider
+    return parser
+
+def test_async_parse_sign(async_parser, test_image_path):
+    """Test async sign parsing uses the provider's async path."""
+    result = asyncio.run(async_parser.parse_sign(test_image_path))
+
+    assert isinstance(result, SignData)
+    assert len(result.policies) == 1
+    async_parser.provider.process_image_async.assert_awaited_once()
+    async_parser.provider.process_image.assert_not_called()
+
+def test_async_parse_batch_isolates_failures(async_parser, test_image_path, tmp_path):
+    """Test that one bad image does not abort an async batch."""
+    missing = str(tmp_path / "missing.jpg")
+    results = asyncio.run(
+        async_parser.parse_batch([test_image_path, missing, test_image_path], max_concurrency=2)
+    )
+
+    assert isinstance(results[0], SignData)
+    assert isinstance(results[1], FileNotFoundError)
+    assert isinstance(results[2], SignData)
+
+def test_gpt4_process_image_async():
+    """Test GPT-4 Vision async image processing."""
+    def handler(request):
+        assert request.headers["Authorization"] == "Bearer test-key"
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": json.dumps({"policies": []})}}]
+        })
+
+    provider = GPT4VisionProvider(api_key="test-key")
+    provider._async_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def run():
+        try:
+            return await provider.process_image_async(b"test_image")
+        finally:
+            await provider.aclose()
+
+    assert json.loads(asyncio.run(run())) == {"policies": []}
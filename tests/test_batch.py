@@ -0,0 +1,121 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+import pytest
+
+from curb_sign_parser import CurbSignParser
+from curb_sign_parser.models.batch import BatchJob
+from curb_sign_parser.models.data_models import SignData
+from curb_sign_parser.utils.exceptions import APIError, ImageProcessingError
+
+SIGN_RESPONSE = json.dumps({
+    "policies": [{
+        "rules": [{"activity": "parking", "max_stay": 60}],
+        "time_spans": [{"days": ["MON"], "start_time": "08:00", "end_time": "18:00"}]
+    }]
+})
+
+
+class FakeBatchHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for the Anthropic and OpenAI batch endpoints."""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body, content_type="application/json"):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):
+        state = self.server.state
+        path = urlparse(self.path).path
+        body = self._body()
+
+        if path == "/v1/messages/batches":
+            state["custom_ids"] = [r["custom_id"] for r in json.loads(body)["requests"]]
+            self._send({"id": "msgbatch_1", "type": "message_batch", "processing_status": "in_progress"})
+        elif path == "/v1/files":
+            lines = [line for line in body.decode().splitlines() if line.startswith('{"custom_id"')]
+            state["custom_ids"] = [json.loads(line)["custom_id"] for line in lines]
+            self._send({"id": "file-in", "object": "file"})
+        elif path == "/v1/batches":
+            assert json.loads(body)["input_file_id"] == "file-in"
+            self._send({"id": "batch_1", "status": "validating"})
+        else:
+            self.send_error(404)
+
+    def do_GET(self):
+        state = self.server.state
+        path = urlparse(self.path).path
+        state["polls"] = state.get("polls", 0) + 1
+        done = state["polls"] > 1
+        first, *rest = state["custom_ids"]
+
+        if path == "/v1/messages/batches/msgbatch_1":
+            host = f"http://{self.server.server_address[0]}:{self.server.server_address[1]}"
+            self._send({
+                "id": "msgbatch_1",
+                "type": "message_batch",
+                "processing_status": "ended" if done else "in_progress",
+                "results_url": f"{host}/v1/messages/batches/msgbatch_1/results" if done else None
+            })
+        elif path == "/v1/messages/batches/msgbatch_1/results":
+            lines = [{"custom_id": first, "result": {"type": "succeeded", "message": {
+                "id": "msg_1", "type": "message", "role": "assistant", "model": "claude",
+                "content": [{"type": "text", "text": SIGN_RESPONSE}],
+                "stop_reason": "end_turn", "usage": {"input_tokens": 1, "output_tokens": 1}
+            }}}]
+            lines += [{"custom_id": cid, "result": {"type": "expired"}} for cid in rest]
+            self._send("\n".join(json.dumps(line) for line in lines).encode(), "application/binary")
+        elif path == "/v1/batches/batch_1":
+            self._send({
+                "id": "batch_1",
+                "status": "completed" if done else "in_progress",
+                "output_file_id": "file-out" if done else None
+            })
+        elif path == "/v1/files/file-out/content":
+            lines = [{"custom_id": first, "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": SIGN_RESPONSE}}]
+            }}}]
+            lines += [{"custom_id": cid, "response": {"status_code": 400, "body": {}}} for cid in rest]
+            self._send("\n".join(json.dumps(line) for line in lines).encode(), "application/jsonl")
+        else:
+            self.send_error(404)
+
+
+@pytest.fixture
+def fake_batch_server():
+    """Run the fake batch API on a local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBatchHandler)
+    server.state = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("provider,path", [("claude", ""), ("gpt4", "/v1")])
+def test_batch_round_trip(provider, path, fake_batch_server, test_image_path, tmp_path):
+    """Test submit_batch/collect_batch against a local fake batch endpoint."""
+    parser = CurbSignParser(api_key="test-key", provider=provider, base_url=fake_batch_server + path)
+    missing = str(tmp_path / "missing.jpg")
+
+    job = parser.submit_batch([test_image_path, missing, test_image_path])
+    job = BatchJob.model_validate_json(job.model_dump_json())
+    results = parser.collect_batch(job, poll_interval=0)
+
+    assert [source for source, _ in results] == [test_image_path, missing, test_image_path]
+    assert isinstance(results[0][1], SignData)
+    assert results[0][1].policies[0].rules[0].max_stay == 60
+    assert isinstance(results[1][1], ImageProcessingError)
+    assert isinstance(results[2][1], APIError)
@@ -0,0 +1,70 @@
+import io
+import json
+
+from curb_sign_parser.cli import Checkpoint, build_arg_parser, iter_sources, run, truncate_partial_line
+from curb_sign_parser.providers.registry import register_provider
+
+
+def test_iter_sources_manifests(tmp_path, test_image_bytes):
+    """Test directory, glob, CSV and JSONL inputs."""
+    images = tmp_path / "images"
+    images.mkdir()
+    for name in ("b.jpg", "a.JPG", "notes.txt"):
+        (images / name).write_bytes(test_image_bytes)
+
+    expected = [str(images / "a.JPG"), str(images / "b.jpg")]
+    assert list(iter_sources(str(images))) == expected
+    assert sorted(iter_sources(str(images / "*.jpg"))) == [str(images / "b.jpg")]
+
+    csv_manifest = tmp_path / "manifest.csv"
+    csv_manifest.write_text("id,path\n1,images/a.JPG\n2,images/b.jpg\n")
+    assert list(iter_sources(str(csv_manifest))) == expected
+
+    jsonl_manifest = tmp_path / "manifest.jsonl"
+    jsonl_manifest.write_text('{"path": "images/a.JPG"}\n\n{"path": "images/b.jpg"}\n')
+    assert list(iter_sources(str(jsonl_manifest))) == expected
+
+def test_run_streams_ndjson_and_resumes(parser_with_claude, test_image_path, tmp_path):
+    """Test NDJSON output and that checkpointed images are skipped on resume."""
+    missing = str(tmp_path / "missing.jpg")
+    checkpoint = Checkpoint(tmp_path / "checkpoint.txt")
+    output = io.StringIO()
+
+    failures = run(parser_with_claude, [test_image_path, missing], output, checkpoint=checkpoint)
+    checkpoint.close()
+
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert failures == 1
+    assert {r["source"] for r in records} == {test_image_path, missing}
+    assert next(r for r in records if r["source"] == missing)["error"]["type"] == "FileNotFoundError"
+    assert next(r for r in records if r["source"] == test_image_path)["sign_data"]["policies"]
+
+    resumed = Checkpoint(tmp_path / "checkpoint.txt")
+    assert test_image_path in resumed
+    assert missing not in resumed
+
+    output = io.StringIO()
+    run(parser_with_claude, [test_image_path, missing], output, checkpoint=resumed)
+    resumed.close()
+
+    assert [json.loads(line)["source"] for line in output.getvalue().splitlines()] == [missing]
+    assert parser_with_claude.provider.process_image.call_count == 1
+
+
+def test_truncate_partial_line(tmp_path):
+    """Test a record cut off by a killed run is dropped before appending."""
+    output = tmp_path / "out.ndjson"
+    output.write_bytes(b'{"source":"a"}\n{"source":"b","sign_d')
+    assert truncate_partial_line(output) == len(b'{"source":"b","sign_d')
+    assert output.read_bytes() == b'{"source":"a"}\n'
+    assert truncate_partial_line(output) == 0
+
+    output.write_bytes(b"no newline at all")
+    truncate_partial_line(output)
+    assert output.read_bytes() == b""
+
+
+def test_provider_choices_include_registered_providers():
+    register_provider("cli-test-provider", "curb_sign_parser.providers.claude:ClaudeProvider")
+    args = build_arg_parser().parse_args(["images/", "--provider", "cli-test-provider"])
+    assert args.provider == "cli-test-provider"
@@ -0,0 +1,80 @@
+import uuid
+
+import pytest
+
+from curb_sign_parser.models.compact import CompactCorpus
+from curb_sign_parser.models.data_models import SignData, TimeSpan
+
+pytest.importorskip("pyarrow")
+
+from curb_sign_parser.storage.columnar import ColumnarReader, write_parquet  # noqa: E402
+
+
+def _signs(count, start=0):
+    signs = []
+    for i in range(start, start + count):
+        signs.append(SignData(
+            last_updated=1700000000000 + i,
+            location={"coordinates": [-73.98 + i * 1e-4, 40.75]} if i % 5 else None,
+            author="survey" if i % 2 else None,
+            policies=[{
+                "curb_policy_id": str(uuid.UUID(int=i)) if i % 3 else f"policy-{i}",
+                "published_date": 1700000000000,
+                "priority": i % 4 or None,
+                "time_spans": [{"days_of_week": ["mon", "tue"], "time_of_day_start": "08:00", "time_of_day_end": "18:00"}],
+                "rules": [{"activity": "paid_parking", "max_stay": 60 + i,
+                           "rate": {"rate": 1.5, "rate_unit": "hour", "rate_unit_period": "calendar"}}],
+            }, {
+                "time_spans": None,
+                "rules": [{"activity": "loading", "user_classes": ["commercial"]}],
+                "data_source_operator_id": ["dot"],
+            }],
+        ))
+    return signs
+
+
+def test_round_trip(tmp_path):
+    """Test every record reads back exactly, across parts and appends."""
+    signs = _signs(25)
+    signs[3].policies[0].time_spans.append(
+        TimeSpan(days_of_week=["holidays"], time_of_day_start="9am", time_of_day_end="noon")
+    )
+    signs.append(SignData(location={"coordinates": [1.0, 2.0, 3.0]}, policies=[]))
+
+    assert len(write_parquet(signs, tmp_path, signs_per_part=10)) == 3
+    more = _signs(5, start=100)
+    write_parquet(CompactCorpus.from_sign_data(more), tmp_path)
+
+    reader = ColumnarReader(tmp_path)
+    assert len(reader) == 31
+    assert list(reader) == signs + more
+    assert reader[-1] == more[-1]
+    with pytest.raises(IndexError):
+        reader[31]
+
+
+def test_lazy_access(tmp_path):
+    write_parquet(_signs(30), tmp_path, signs_per_part=10)
+    reader = ColumnarReader(tmp_path)
+
+    assert reader[15].policies[0].rules[0].max_stay == 75
+    assert list(reader._corpora) == [1]
+
+
+def test_analytics_tables(tmp_path):
+    """Test tables are normalized and parent columns index corpus-wide rows."""
+    import pyarrow as pa
+
+    write_parquet(_signs(20), tmp_path, signs_per_part=8)
+    reader = ColumnarReader(tmp_path)
+
+    rules = reader.table("rules")
+    policies = reader.table("policies", columns=["sign"])
+    spans = reader.table("time_spans")
+    assert pa.types.is_dictionary(rules.schema.field("activity").type)
+    assert rules["policy"].to_pylist() == list(range(40))
+    assert policies["sign"].to_pylist() == [i // 2 for i in range(40)]
+    assert set(spans["day_mask"].to_pylist()) == {0b11}
+    assert reader.table("signs")["lon"].null_count == 4
+    with pytest.raises(ValueError):
+        reader.table("unknown")
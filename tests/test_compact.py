@@ -0,0 +1,110 @@
+import tracemalloc
+import uuid
+
+import pytest
+
+from curb_sign_parser.models.compact import (
+    IRREGULAR_SPAN,
+    CompactCorpus,
+    days_to_mask,
+    mask_to_days,
+    minutes_to_time,
+    time_to_minutes,
+)
+from curb_sign_parser.models.data_models import SignData, TimeSpan
+
+
+def _sign(**overrides):
+    data = {
+        "last_updated": 1700000000000,
+        "location": {"type": "Point", "coordinates": [-73.985, 40.758]},
+        "policies": [{
+            "curb_policy_id": str(uuid.uuid4()),
+            "published_date": 1700000000000,
+            "priority": 2,
+            "time_spans": [
+                {"days_of_week": ["mon", "tue", "wed", "thu", "fri"],
+                 "time_of_day_start": "08:00", "time_of_day_end": "18:00"},
+            ],
+            "rules": [
+                {"activity": "paid_parking", "max_stay": 120,
+                 "rate": {"rate": 2.5, "rate_unit": "hour", "rate_unit_period": "calendar"}},
+                {"activity": "loading", "user_classes": ["commercial"]},
+            ],
+            "data_source_operator_id": ["dot"],
+        }, {
+            "curb_policy_id": "0",
+            "time_spans": None,
+            "rules": [{"activity": "no_parking"}],
+        }],
+    }
+    data.update(overrides)
+    return SignData(**data)
+
+
+def test_day_mask_round_trip():
+    assert days_to_mask(["mon", "wed", "sun"]) == 0b1000101
+    assert mask_to_days(0b1000101) == ["mon", "wed", "sun"]
+    assert days_to_mask([]) == 0
+
+
+@pytest.mark.parametrize("days", [["sat", "mon"], ["mon", "mon"], ["holidays"]])
+def test_day_mask_rejects_lossy_lists(days):
+    """Test lists the mask can't restore exactly are not encoded."""
+    assert days_to_mask(days) is None
+
+
+def test_minutes_round_trip():
+    assert time_to_minutes("18:30") == 1110
+    assert minutes_to_time(1110) == "18:30"
+    assert time_to_minutes("9:00") is None
+    assert time_to_minutes("24:00") is None
+
+
+def test_corpus_round_trip():
+    """Test every record is rebuilt exactly, including optional fields."""
+    signs = [_sign(), _sign(location=None, author="survey", time_zone="America/New_York"), _sign(policies=[])]
+    corpus = CompactCorpus.from_sign_data(signs)
+
+    assert len(corpus) == 3
+    assert list(corpus) == signs
+    assert corpus[-1] == signs[-1]
+    assert corpus.policies["uuid"][0] == uuid.UUID(signs[0].policies[0].curb_policy_id).bytes
+    assert corpus.spans["day_mask"][0] == 0b0011111
+    with pytest.raises(IndexError):
+        corpus[3]
+
+
+def test_irregular_spans_kept_exactly():
+    sign = _sign()
+    sign.policies[0].time_spans.append(
+        TimeSpan(days_of_week=["sat", "holidays"], time_of_day_start="9am", time_of_day_end="24:00")
+    )
+    corpus = CompactCorpus.from_sign_data([sign])
+
+    assert corpus.spans["day_mask"][1] == IRREGULAR_SPAN
+    assert corpus[0] == sign
+
+
+def test_out_of_range_values_fall_back():
+    """Test signs that don't fit the columns are stored whole."""
+    odd = _sign(location={"coordinates": [1.0, 2.0, 3.0]})
+    huge = _sign(last_updated=2 ** 70)
+    corpus = CompactCorpus.from_sign_data([odd, _sign(), huge])
+
+    assert set(corpus.fallback) == {0, 2}
+    assert list(corpus) == [odd, corpus[1], huge]
+
+
+def test_corpus_is_compact():
+    """Test the corpus takes at least 10x less memory than the models."""
+    tracemalloc.start()
+    try:
+        signs = [_sign() for _ in range(500)]
+        models_size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    corpus = CompactCorpus.from_sign_data(signs)
+
+    assert corpus.nbytes * 10 < models_size
+    assert corpus.span_offsets[-1] == len(corpus.spans) == 500
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import pytest
+
+from curb_sign_parser import AsyncCurbSignParser, CurbSignParser
+from curb_sign_parser.providers.base import RetryPolicy
+from curb_sign_parser.testing import (
+    FakeProviderServer,
+    load_recordings,
+    record_response,
+    run_load_test,
+    run_load_test_async,
+)
+from curb_sign_parser.testing.loadtest import main
+
+FAST_RETRIES = RetryPolicy(max_attempts=3, base_delay=0.01, respect_retry_after=False)
+
+
+@pytest.fixture
+def server():
+    with FakeProviderServer(seed=0) as server:
+        yield server
+
+
+@pytest.mark.parametrize("provider", ["claude", "gpt4"])
+def test_parse_against_fake_server(server, provider, test_image_path):
+    """Test both real providers parse a canned completion from the fake server."""
+    base_url = server.url if provider == "claude" else server.openai_url
+    parser = CurbSignParser(api_key="fake-key", provider=provider, base_url=base_url)
+
+    sign_data = parser.parse_sign(test_image_path)
+
+    assert sign_data.policies[0].rules[0].max_stay == 120
+    assert parser.provider.usage.input_tokens == 1800
+    assert server.stats == {"requests": 1, "200": 1}
+
+
+def test_replays_recorded_responses(tmp_path, test_image_path):
+    """Test recordings are matched to the processed image sent to the provider."""
+    recorded = json.dumps({"policies": [{"rules": [{"activity": "loading", "max_stay": 15}]}]})
+    parser = CurbSignParser(api_key="fake-key", provider="claude")
+    image_bytes, _ = parser.image_processor.process_image(test_image_path)
+    record_response(tmp_path / "recordings.jsonl", image_bytes, recorded)
+
+    with FakeProviderServer(responses=load_recordings(tmp_path / "recordings.jsonl")) as server:
+        parser = CurbSignParser(api_key="fake-key", provider="claude", base_url=server.url)
+        sign_data = parser.parse_sign(test_image_path)
+
+    assert sign_data.policies[0].rules[0].activity == "loading"
+
+
+def test_injected_faults_are_retried(test_image_path):
+    """Test 429s and 5xxs reach the retry policy and are counted by the server."""
+    with FakeProviderServer(rate_limit_rate=0.2, error_rate=0.2, seed=1) as server:
+        parser = CurbSignParser(
+            api_key="fake-key", provider="gpt4", base_url=server.openai_url, retry_policy=FAST_RETRIES
+        )
+        report = run_load_test(parser, [test_image_path], requests=40, concurrency=4, server=server)
+
+    stats = report.server
+    assert stats["429"] > 0
+    assert stats["requests"] == stats["200"] + stats["429"] + stats.get("500", 0) \
+        + stats.get("503", 0) + stats.get("529", 0)
+    assert report.requests == 40
+    assert report.succeeded == stats["200"]
+    assert report.failed == sum(report.errors.values())
+    assert report.latency_p50 <= report.latency_p95 <= report.latency_p99 <= report.latency_max
+
+
+def test_async_load_test(server, test_image_path):
+    """Test the async runner reports every parse."""
+    async def run():
+        async with AsyncCurbSignParser(api_key="fake-key", base_url=server.url) as parser:
+            return await run_load_test_async(parser, [test_image_path], requests=20, concurrency=10)
+
+    report = asyncio.run(run())
+
+    assert report.succeeded == 20
+    assert report.error_rate == 0
+    assert report.throughput > 0
+
+
+def test_loadtest_cli(capsys):
+    """Test the CLI starts a server and prints a JSON report."""
+    assert main(["--requests", "6", "--concurrency", "3", "--latency-median", "0.01", "--seed", "0"]) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["succeeded"] == 6
+    assert report["server"]["200"] == 6
@@ -0,0 +1,135 @@
+import json
+import uuid
+
+from curb_sign_parser import feed
+from curb_sign_parser.feed import POLICY_NAMESPACE, FeedBuilder, canonical_policy, policy_id
+from curb_sign_parser.models.data_models import CurbPolicy, SignData
+from curb_sign_parser.normalization import build_sign_data, to_cds
+
+PAID = {
+    "priority": 2,
+    "time_spans": [{"days": ["Mon-Fri"], "start_time": "8am", "end_time": "6pm"}],
+    "rules": [{"activity": "paid_parking", "max_stay": "2 hours", "rate": {"rate": "$2.50"}}],
+}
+NO_PARKING = {"time_spans": [{"days": ["Sat"]}], "rules": [{"activity": "no parking"}]}
+
+
+def _sign(policies, coordinates=(-73.985, 40.758)):
+    return build_sign_data(to_cds({"policies": policies}, {"type": "Point", "coordinates": list(coordinates)}))
+
+
+def test_identical_policies_share_ids_across_signs():
+    """Test IDs depend on content only, not position, sign or publication time."""
+    first = _sign([PAID, NO_PARKING])
+    second = _sign([NO_PARKING, PAID], coordinates=(-73.9, 40.7))
+
+    assert first.policies[0].curb_policy_id == second.policies[1].curb_policy_id
+    assert first.policies[1].curb_policy_id == second.policies[0].curb_policy_id
+    assert first.policies[0].curb_policy_id != first.policies[1].curb_policy_id
+    assert uuid.UUID(first.policies[0].curb_policy_id).version == 5
+
+
+def test_policy_id_ignores_meaningless_order():
+    """Test day, span, user class and operator order don't change the ID."""
+    policy = {
+        "time_spans": [
+            {"days_of_week": ["tue", "mon"], "time_of_day_start": "08:00", "time_of_day_end": "10:00"},
+            {"days_of_week": ["sat"], "time_of_day_start": "00:00", "time_of_day_end": "23:59"},
+        ],
+        "rules": [{"activity": "loading", "user_classes": ["truck", "van"], "rate": {"rate": 2}}],
+        "data_source_operator_id": ["b", "a"],
+    }
+    reordered = {
+        "data_source_operator_id": ["a", "b"],
+        "rules": [{"activity": "loading", "user_classes": ["van", "truck"], "rate": {"rate": 2.0}}],
+        "time_spans": [
+            {"days_of_week": ["sat"], "time_of_day_start": "00:00", "time_of_day_end": "23:59"},
+            {"days_of_week": ["mon", "tue"], "time_of_day_start": "08:00", "time_of_day_end": "10:00"},
+        ],
+    }
+
+    assert canonical_policy(policy) == canonical_policy(reordered)
+    assert policy_id(policy) == policy_id(reordered)
+    assert policy_id(dict(policy, priority=1)) != policy_id(policy)
+
+
+def test_policy_id_memo_keeps_extra_rule_fields():
+    """Test rules differing only in a non-CDS field still get different IDs."""
+    plain = {"rules": [{"activity": "loading"}]}
+    extra = {"rules": [{"activity": "loading", "note": "trucks only"}]}
+
+    assert policy_id(plain) == policy_id(plain)
+    assert policy_id(extra) != policy_id(plain)
+    assert policy_id(extra) == str(uuid.uuid5(POLICY_NAMESPACE, json.dumps(
+        canonical_policy(extra), sort_keys=True, separators=(",", ":"))))
+
+
+def test_policy_id_memo_is_type_strict():
+    """Test memoized IDs match unmemoized ones for values equal only in Python."""
+    span = {"days_of_week": ["mon"], "time_of_day_start": "08:00", "time_of_day_end": "10:00"}
+    pairs = [
+        ({"rules": [{"activity": "parking", "max_stay": 60}]},
+         {"rules": [{"activity": "parking", "max_stay": 60.0}]}),
+        ({"time_spans": [dict(span, foo=1)]}, {"time_spans": [dict(span, foo=2)]}),
+    ]
+    for first, second in pairs:
+        policy_id(first)
+        warm = policy_id(second)
+        feed._ID_MEMO.clear()
+        assert warm == policy_id(second)
+        assert policy_id(first) != policy_id(second)
+
+
+def test_model_and_dict_ids_match():
+    sign = _sign([PAID])
+    policy = sign.policies[0]
+
+    assert policy_id(policy) == policy.curb_policy_id
+    assert policy_id(policy.model_dump()) == policy.curb_policy_id
+    assert policy_id(CurbPolicy(**policy.model_dump(exclude={"curb_policy_id"}), curb_policy_id="0")) \
+        == policy.curb_policy_id
+
+
+def test_feed_lists_each_policy_once():
+    """Test many signs with the same regulations yield one shared policy each."""
+    signs = [_sign([PAID, NO_PARKING], coordinates=(-73.98 + i * 1e-4, 40.75)) for i in range(50)]
+    feed = FeedBuilder(time_zone="America/New_York")
+    for sign in signs:
+        feed.add(sign)
+
+    policies = feed.policies_feed(last_updated=1)
+    assert policies["time_zone"] == "America/New_York"
+    assert len(policies["data"]["policies"]) == 2
+    assert {p["curb_policy_id"] for p in policies["data"]["policies"]} == {
+        p.curb_policy_id for p in signs[0].policies
+    }
+
+    zones = feed.curbs_feed(last_updated=1)["data"]["zones"]
+    assert len(zones) == 50
+    assert len({zone["curb_zone_id"] for zone in zones}) == 50
+    assert all(zone["curb_policy_ids"] == zones[0]["curb_policy_ids"] for zone in zones)
+
+
+def test_feed_rewrites_ids_and_shares_spans():
+    """Test policies keyed by position get content IDs and interned spans."""
+    legacy = SignData(policies=[
+        {"curb_policy_id": "0", "published_date": 1, "time_spans": [
+            {"days_of_week": ["sat"], "time_of_day_start": "00:00", "time_of_day_end": "23:59"}],
+         "rules": [{"activity": "no_parking"}]},
+        {"curb_policy_id": "1", "published_date": 1, "priority": 1, "time_spans": [
+            {"days_of_week": ["sat"], "time_of_day_start": "00:00", "time_of_day_end": "23:59"}],
+         "rules": [{"activity": "loading"}]},
+    ])
+    feed = FeedBuilder()
+    zone = feed.add(legacy)
+
+    first, second = (feed.policies[key] for key in zone["curb_policy_ids"])
+    assert first.curb_policy_id == policy_id(legacy.policies[0])
+    assert first.time_spans[0] is second.time_spans[0]
+    assert legacy.policies[0].curb_policy_id == "0"
+
+
+def test_zone_ids_are_deterministic():
+    sign = _sign([PAID])
+    assert FeedBuilder().add(sign)["curb_zone_id"] == FeedBuilder().add(sign)["curb_zone_id"]
+    assert FeedBuilder().add(sign, zone_id="z1")["curb_zone_id"] == "z1"
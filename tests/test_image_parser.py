@@ -2,7 +2,12 @@ import pytest
 from PIL import Image
 import io
 
-from curb_sign_parser.processors.image_processor import ImageProcessor
+from curb_sign_parser.processors.image_processor import (
+    ImageProcessor,
+    PerceptualHashIndex,
+    compute_dhash,
+    hamming_distance,
+)
 from curb_sign_parser.utils.exceptions import ImageProcessingError
 
 def create_test_image():
@@ -25,4 +30,151 @@ def test_process_image_size_limit():
     processor = ImageProcessor(max_size=100)  # Very small limit
     
     with pytest.raises(ImageProcessingError):
-        processor.process_image(create_test_image())
\ No newline at end of file
+        processor.process_image(create_test_image())
+def _sign_image():
+    """Helper to create a sign-like test image."""
+    from PIL import ImageDraw
+
+    img = Image.new('RGB', (256, 256), color='white')
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((40, 20, 216, 236), fill='red')
+    draw.rectangle((60, 60, 196, 120), fill='white')
+    draw.ellipse((90, 150, 170, 220), fill='black')
+    return img
+
+def test_compute_dhash_near_duplicates():
+    """Test dHash is stable under re-encoding and distinguishes different images."""
+    img = _sign_image()
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=60)
+
+    original = compute_dhash(img)
+    assert hamming_distance(original, compute_dhash(buffer.getvalue())) <= 6
+    assert hamming_distance(original, compute_dhash(img.transpose(Image.Transpose.ROTATE_90))) > 6
+
+def test_perceptual_hash_index_matches_brute_force():
+    """Test multi-index lookups agree with a linear scan."""
+    import random
+
+    rng = random.Random(0)
+    hashes = [rng.getrandbits(64) for _ in range(2000)]
+    index = PerceptualHashIndex(max_distance=6)
+    for i, h in enumerate(hashes):
+        index.add(h, i)
+
+    for i in range(0, 2000, 50):
+        # Flip up to 6 random bits so every query has a true match
+        query = hashes[i]
+        for bit in rng.sample(range(64), rng.randint(0, 6)):
+            query ^= 1 << bit
+        expected = min(hamming_distance(query, h) for h in hashes)
+        value, distance = index.query(query)
+        assert distance == expected
+        assert hamming_distance(query, hashes[value]) == distance
+
+def test_perceptual_hash_index_gps_filter():
+    """Test matches are restricted by distance when coordinates are known."""
+    index = PerceptualHashIndex(max_distance=4, max_meters=25)
+    index.add(0b1011, "sign", [-73.9857, 40.7484])
+
+    assert index.query(0b1011, [-73.9858, 40.7484])[0] == "sign"
+    assert index.query(0b1011, [-73.9957, 40.7484]) is None
+    assert index.query(0b1011) is not None
+
+def _gps_jpeg_bytes():
+    """Helper to create a JPEG with GPS EXIF tags."""
+    import piexif
+
+    gps = {
+        1: b'N', 2: ((40, 1), (44, 1), (5424, 100)),
+        3: b'W', 4: ((73, 1), (59, 1), (860, 100)),
+    }
+    buffer = io.BytesIO()
+    Image.new('RGB', (64, 64), color='white').save(
+        buffer, format='JPEG', exif=piexif.dump({"GPS": gps})
+    )
+    return buffer.getvalue()
+
+@pytest.mark.parametrize("wrap", [
+    bytes,
+    memoryview,
+    io.BytesIO,
+    lambda data: Image.open(io.BytesIO(data)),
+])
+def test_process_image_in_memory_sources(wrap):
+    """Test bytes, memoryview, file objects and PIL images are accepted."""
+    processor = ImageProcessor()
+    processed, location = processor.process_image(wrap(_gps_jpeg_bytes()))
+
+    assert processed[:2] == b'\xff\xd8'
+    assert location["coordinates"] == pytest.approx([-73.985722, 40.748400], abs=1e-5)
+
+def test_process_image_reads_file_once(tmp_path, monkeypatch):
+    """Test a path source is read from disk a single time."""
+    from pathlib import Path
+
+    image_path = tmp_path / "sign.jpg"
+    image_path.write_bytes(_gps_jpeg_bytes())
+
+    reads = []
+    original = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self) or original(self))
+
+    _, location = ImageProcessor().process_image(str(image_path))
+    assert len(reads) == 1
+    assert location is not None
+
+def test_process_image_missing_file(tmp_path):
+    """Test missing files raise FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        ImageProcessor().process_image(tmp_path / "missing.jpg")
+
+def test_process_image_large_jpeg_uses_reduced_decode():
+    """Test large JPEGs are downscaled to fit the maximum dimension."""
+    buffer = io.BytesIO()
+    Image.new('RGB', (8400, 4200), color='blue').save(buffer, format='JPEG')
+
+    processed, _ = ImageProcessor(max_size=20 * 1024 * 1024).process_image(buffer.getvalue())
+
+    with Image.open(io.BytesIO(processed)) as img:
+        assert img.size == (2048, 1024)
+
+def test_process_image_leaves_caller_image_untouched():
+    """Test a PIL image passed in keeps its full decoded resolution."""
+    buffer = io.BytesIO()
+    Image.new('RGB', (8400, 4200), color='blue').save(buffer, format='JPEG')
+
+    with Image.open(io.BytesIO(buffer.getvalue())) as img:
+        processed, _ = ImageProcessor(max_size=20 * 1024 * 1024).process_image(img)
+        img.load()
+        assert img.size == (8400, 4200)
+
+    with Image.open(io.BytesIO(processed)) as result:
+        assert result.size == (2048, 1024)
+
+def test_adaptive_encoding_fits_budget():
+    """Test adaptive encoding meets a budget that fixed quality exceeds."""
+    buffer = io.BytesIO()
+    Image.effect_noise((800, 600), 60).convert('RGB').save(buffer, format='PNG')
+    source = buffer.getvalue()
+
+    with pytest.raises(ImageProcessingError):
+        ImageProcessor(max_size=60 * 1024).process_image(source)
+
+    processor = ImageProcessor(max_size=60 * 1024, adaptive=True)
+    processed, _ = processor.process_image(source)
+
+    assert len(processed) <= 60 * 1024
+    assert processor._quality_cache
+
+def test_adaptive_encoding_downscales_when_needed():
+    """Test adaptive encoding shrinks the image if minimum quality is too large."""
+    buffer = io.BytesIO()
+    Image.effect_noise((1200, 1200), 120).convert('RGB').save(buffer, format='PNG')
+
+    processor = ImageProcessor(max_size=40 * 1024, adaptive=True, min_quality=80, max_downscales=8)
+    processed, _ = processor.process_image(buffer.getvalue())
+
+    assert len(processed) <= 40 * 1024
+    with Image.open(io.BytesIO(processed)) as img:
+        assert img.size[0] < 1200
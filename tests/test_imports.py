@@ -0,0 +1,85 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import curb_sign_parser
+
+# Cumulative time allowed for ``import curb_sign_parser`` (measured ~2ms; eager
+# imports of the provider SDKs and Pillow took ~650ms)
+IMPORT_BUDGET_US = 50_000
+
+HEAVY_MODULES = ("anthropic", "requests", "httpx", "PIL", "pillow_heif", "numpy", "pydantic")
+
+
+def _run(code, *args):
+    """Run ``code`` in a fresh interpreter that imports this checkout."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(Path(curb_sign_parser.__file__).parents[1])
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        env=env, capture_output=True, text=True, check=True
+    )
+
+
+def _loaded(statement):
+    code = f"import sys\n{statement}\nprint(' '.join(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))"
+    return set(_run(code).stdout.split())
+
+
+def test_package_import_is_lazy():
+    """Test importing the package loads no heavy dependencies."""
+    assert _loaded("import curb_sign_parser") == set()
+    assert _loaded("from curb_sign_parser import ImageProcessingError") == set()
+
+
+def test_package_import_time_budget():
+    """Test the measured cumulative import time stays within budget."""
+    stderr = _run("import curb_sign_parser", "-X", "importtime").stderr
+    match = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| curb_sign_parser$", stderr, re.MULTILINE)
+    assert match is not None
+    assert int(match.group(1)) < IMPORT_BUDGET_US
+
+
+def test_provider_imports_only_what_it_uses():
+    """Test a Claude parser doesn't load requests or pillow-heif."""
+    loaded = _loaded("from curb_sign_parser import CurbSignParser\nCurbSignParser(api_key='test-key')")
+    assert "anthropic" in loaded
+    assert "requests" not in loaded
+    assert "pillow_heif" not in loaded
+
+
+def test_heif_registered_on_first_use(tmp_path):
+    """Test pillow-heif is only loaded once a HEIC image is processed."""
+    import pillow_heif
+    from PIL import Image
+
+    pillow_heif.register_heif_opener()
+    heic_path = tmp_path / "sign.heic"
+    Image.new("RGB", (64, 64), "red").save(heic_path, format="HEIF")
+    jpeg_path = tmp_path / "sign.jpg"
+    Image.new("RGB", (64, 64), "red").save(jpeg_path, format="JPEG")
+
+    code = (
+        "import sys\n"
+        "from curb_sign_parser.processors.image_processor import ImageProcessor\n"
+        "processor = ImageProcessor()\n"
+        f"processor.process_image({str(jpeg_path)!r})\n"
+        "print('pillow_heif' in sys.modules)\n"
+        f"data, _ = processor.process_image({str(heic_path)!r})\n"
+        "print('pillow_heif' in sys.modules, data[:2] == b'\\xff\\xd8')\n"
+    )
+    assert _run(code).stdout.split() == ["False", "True", "True"]
+
+
+def test_lazy_attributes():
+    """Test lazily exported names resolve and unknown names raise AttributeError."""
+    from curb_sign_parser.parser import CurbSignParser
+
+    assert curb_sign_parser.CurbSignParser is CurbSignParser
+    assert "SignData" in dir(curb_sign_parser)
+    with pytest.raises(AttributeError):
+        curb_sign_parser.DoesNotExist
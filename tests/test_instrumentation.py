@@ -0,0 +1,128 @@
+import json
+import logging
+import pickle
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+
+from curb_sign_parser import CurbSignParser
+from curb_sign_parser.processors.image_processor import ImageProcessor
+from curb_sign_parser.utils.instrumentation import (
+    CallbackInstrumentation,
+    Instrumentation,
+    MetricsInstrumentation,
+    OpenTelemetryInstrumentation,
+)
+
+SIGN_RESPONSE = json.dumps({
+    "policies": [{
+        "rules": [{"activity": "parking", "max_stay": 60}],
+        "time_spans": [{"days": ["MON"], "start_time": "08:00", "end_time": "18:00"}]
+    }]
+})
+
+ALL_STAGES = {
+    "parse_sign", "read", "exif", "decode", "resize", "encode",
+    "base64", "network", "json_parse", "normalize", "validate",
+}
+
+
+@pytest.fixture
+def mock_completion():
+    with patch("requests.Session.post") as mock_post:
+        mock_post.return_value.json.return_value = {
+            "choices": [{"message": {"content": SIGN_RESPONSE}}]
+        }
+        yield mock_post
+
+
+def test_parse_sign_reports_every_stage(mock_completion, test_image_path):
+    """Test parse_sign emits one span per stage to the callback."""
+    spans = []
+    instrumentation = CallbackInstrumentation(lambda name, duration, attributes, error: spans.append(name))
+    parser = CurbSignParser(api_key="test-key", provider="gpt4", instrumentation=instrumentation)
+
+    parser.parse_sign(test_image_path)
+
+    assert set(spans) == ALL_STAGES
+    assert spans[-1] == "parse_sign"
+
+
+def test_metrics_render_prometheus_text(mock_completion, test_image_path, tmp_path):
+    """Test histograms and error counters are rendered in exposition format."""
+    metrics = MetricsInstrumentation()
+    parser = CurbSignParser(api_key="test-key", provider="gpt4", instrumentation=metrics)
+
+    parser.parse_sign(test_image_path)
+    with pytest.raises(FileNotFoundError):
+        parser.parse_sign(str(tmp_path / "missing.jpg"))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["decode"]["count"] == 1
+    assert snapshot["read"]["count"] == 2
+    assert snapshot["read"]["errors"] == 1
+    assert snapshot["read"]["buckets"][-1] == (float("inf"), 2)
+
+    text = metrics.render()
+    assert "# TYPE curb_sign_parser_stage_seconds histogram" in text
+    assert 'curb_sign_parser_stage_seconds_count{stage="network"} 1' in text
+    assert 'curb_sign_parser_stage_seconds_bucket{stage="read",le="+Inf"} 2' in text
+    assert 'curb_sign_parser_stage_errors_total{stage="read"} 1' in text
+
+
+def test_opentelemetry_spans():
+    """Test stages become tracer spans carrying their attributes."""
+    recorded = []
+
+    class FakeSpan:
+        def __init__(self, name):
+            self.name = name
+            self.attributes = {}
+
+        def set_attribute(self, key, value):
+            self.attributes[key] = value
+
+    class FakeTracer:
+        @contextmanager
+        def start_as_current_span(self, name):
+            span = FakeSpan(name)
+            recorded.append(span)
+            yield span
+
+    instrumentation = OpenTelemetryInstrumentation(tracer=FakeTracer())
+    with instrumentation.span("encode", quality=90) as attributes:
+        attributes["bytes"] = 1234
+
+    assert recorded[0].name == "curb_sign_parser.encode"
+    assert recorded[0].attributes == {"quality": 90, "bytes": 1234}
+
+
+def test_disabled_instrumentation_is_noop():
+    """Test the default hook times nothing."""
+    instrumentation = Instrumentation()
+    with patch.object(instrumentation, "on_span") as on_span:
+        with instrumentation.span("decode") as attributes:
+            attributes["width"] = 10
+    on_span.assert_not_called()
+
+
+def test_processor_pickles_without_hooks():
+    """Test processors sent to worker processes drop the parent's hooks."""
+    processor = ImageProcessor(instrumentation=MetricsInstrumentation())
+    clone = pickle.loads(pickle.dumps(processor))
+    assert clone.instrumentation.enabled is False
+
+
+def test_debug_payload_serialized_only_when_enabled(caplog):
+    """Test JSON debug dumps are skipped unless DEBUG logging is on."""
+    parser = CurbSignParser(api_key="test-key", provider="gpt4")
+
+    with patch("curb_sign_parser.parser.json.dumps", wraps=json.dumps) as dumps:
+        with caplog.at_level(logging.INFO, logger="curb_sign_parser.parser"):
+            parser._build_sign_data(SIGN_RESPONSE, None)
+        assert dumps.call_count == 0
+
+        with caplog.at_level(logging.DEBUG, logger="curb_sign_parser.parser"):
+            parser._build_sign_data(SIGN_RESPONSE, None)
+        assert dumps.call_count == 2
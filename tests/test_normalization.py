@@ -0,0 +1,109 @@
+import pytest
+
+from curb_sign_parser.models.data_models import SignData
+from curb_sign_parser.normalization import (
+    build_sign_data,
+    normalize_activity,
+    normalize_days,
+    normalize_rule,
+    normalize_time,
+    normalize_time_spans,
+    to_cds,
+)
+
+
+@pytest.mark.parametrize("days,expected", [
+    (["Monday", "TUE", "wed"], ["mon", "tue", "wed"]),
+    (["Mon-Fri"], ["mon", "tue", "wed", "thu", "fri"]),
+    (["friday through monday"], ["fri", "sat", "sun", "mon"]),
+    ("MON-WED, SAT", ["mon", "tue", "wed", "sat"]),
+    (["weekends", "Sun"], ["sat", "sun"]),
+    ([], ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]),
+    (["holidays"], ["holidays"]),
+])
+def test_normalize_days(days, expected):
+    """Test day names, ranges and groups map onto CDS abbreviations."""
+    assert normalize_days(days) == expected
+
+
+def test_normalize_days_returns_fresh_lists():
+    """Test memoized results can't be mutated through a returned list."""
+    first = normalize_days(["Mon-Fri"])
+    first.append("sun")
+    assert normalize_days(["Mon-Fri"]) == ["mon", "tue", "wed", "thu", "fri"]
+
+
+@pytest.mark.parametrize("value,expected", [
+    ("9:00", "09:00"),
+    ("09:30", "09:30"),
+    ("9am", "09:00"),
+    ("6:30 p.m.", "18:30"),
+    ("12pm", "12:00"),
+    ("noon", "12:00"),
+    ("unknown", "unknown"),
+    (None, "00:00"),
+])
+def test_normalize_time(value, expected):
+    assert normalize_time(value, "00:00") == expected
+
+
+def test_midnight_end_time_means_end_of_day():
+    assert normalize_time("midnight", "23:59", end=True) == "23:59"
+    assert normalize_time("midnight", "00:00") == "00:00"
+
+
+@pytest.mark.parametrize("activity,expected", [
+    ("parking", "parking"),
+    ("No Parking", "no_parking"),
+    ("metered", "paid_parking"),
+    ("Loading Zone", "loading"),
+    (None, "parking"),
+])
+def test_normalize_activity(activity, expected):
+    assert normalize_activity(activity) == expected
+
+
+def test_normalize_rule_parses_strings():
+    """Test prices and durations written as text are converted."""
+    rule = normalize_rule({
+        "activity": "paid_parking",
+        "max_stay": "2 hours",
+        "rate": {"rate": "$2.50", "rate_unit": "per hour"},
+    })
+
+    assert rule["max_stay"] == 120
+    assert rule["rate"] == {"rate": 2.5, "rate_unit": "hour", "rate_unit_period": "rolling"}
+
+
+def test_normalize_rule_drops_unparseable_values():
+    rule = normalize_rule({"activity": "parking", "max_stay": "a while", "payment": {"rate": "free"}})
+    assert rule == {"activity": "parking"}
+
+
+def test_time_spans_accept_cds_keys():
+    """Test spans in the layout the system prompt asks for are kept."""
+    spans = normalize_time_spans([
+        {"days_of_week": ["sat"], "time_of_day_start": "8am", "time_of_day_end": "6pm"},
+        "not a span",
+    ])
+
+    assert spans == [{"days_of_week": ["sat"], "time_of_day_start": "08:00", "time_of_day_end": "18:00"}]
+
+
+def test_to_cds_shares_timestamp_and_content_ids():
+    cds_data = to_cds({"policies": [{"rules": [{"activity": "parking"}]}] * 3})
+
+    timestamps = {policy["published_date"] for policy in cds_data["policies"]}
+    assert timestamps == {cds_data["last_updated"]}
+    assert len({policy["curb_policy_id"] for policy in cds_data["policies"]}) == 1
+
+
+def test_build_sign_data_matches_model():
+    """Test the fast construction path builds the same model as SignData(**data)."""
+    cds_data = to_cds(
+        {"regulations": [{"activity": "no parking", "time_spans": [{"days": ["Mon-Fri"]}]}],
+         "policies": [{"rules": [{"activity": "paid_parking", "rate": {"rate": 2}}]}]},
+        {"type": "Point", "coordinates": [-73.9, 40.7]},
+    )
+
+    assert build_sign_data(cds_data) == SignData(**cds_data)
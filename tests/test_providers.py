@@ -1,7 +1,15 @@
+import io
 import json
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from curb_sign_parser.providers.base import RetryPolicy, parse_retry_after
 from curb_sign_parser.providers.claude import ClaudeProvider
 from curb_sign_parser.providers.gpt4 import GPT4VisionProvider
+from curb_sign_parser.providers.rate_limit import AdaptiveConcurrency, TokenBucket
+from curb_sign_parser.providers.transport import TransportConfig
+from curb_sign_parser.utils.exceptions import APIError, ParsingError
 
 
 def test_claude_provider():
@@ -16,7 +24,7 @@ def test_gpt4_provider():
     assert provider.max_image_size == 20 * 1024 * 1024
     assert provider.api_key == "test-key"
 
-@patch("requests.post")
+@patch("requests.Session.post")
 def test_gpt4_process_image(mock_post):
     """Test GPT-4 Vision image processing."""
     mock_post.return_value.json.return_value = {
@@ -31,4 +39,247 @@ def test_gpt4_process_image(mock_post):
     result = provider.process_image(b"test_image")
     
     assert isinstance(result, str)
-    mock_post.assert_called_once()
\ No newline at end of file
+    mock_post.assert_called_once()
+
+def test_transport_config_flows_to_clients():
+    """Test pool size and timeouts reach both providers' HTTP clients."""
+    transport = TransportConfig(pool_size=32, connect_timeout=2.0, read_timeout=45.0)
+
+    gpt4 = GPT4VisionProvider(api_key="test-key", transport=transport)
+    adapter = gpt4.session.get_adapter("https://api.openai.com")
+    assert adapter._pool_maxsize == 32
+    assert transport.requests_timeout == (2.0, 45.0)
+
+    claude = ClaudeProvider(api_key="test-key", transport=transport)
+    assert claude.client._client is claude._http_client
+    assert claude.client.timeout.connect == 2.0
+    assert claude.client.timeout.read == 45.0
+
+@patch("requests.Session.head")
+def test_gpt4_warmup(mock_head):
+    """Test warmup opens the requested number of connections."""
+    provider = GPT4VisionProvider(api_key="test-key", transport=TransportConfig(pool_size=4))
+
+    assert provider.warmup(connections=8) == 4
+    assert mock_head.call_count == 4
+
+def _response(status, body=None, headers=None):
+    """Helper to build a real requests.Response."""
+    import requests
+
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body or {}).encode()
+    response.headers.update(headers or {})
+    return response
+
+@patch("curb_sign_parser.providers.base.time.sleep")
+@patch("requests.Session.post")
+def test_gpt4_retries_rate_limit(mock_post, mock_sleep):
+    """Test 429 responses are retried after the server's Retry-After delay."""
+    ok = {"choices": [{"message": {"content": "{}"}}]}
+    mock_post.side_effect = [_response(429, headers={"Retry-After": "2"}), _response(200, ok)]
+
+    provider = GPT4VisionProvider(api_key="test-key")
+    assert provider.process_image(b"test_image") == "{}"
+    assert mock_post.call_count == 2
+    assert mock_sleep.call_args[0][0] >= 2
+
+@patch("curb_sign_parser.providers.base.time.sleep")
+@patch("requests.Session.post")
+def test_gpt4_raises_api_error(mock_post, mock_sleep):
+    """Test exhausted retries and non-retryable statuses raise APIError."""
+    mock_post.return_value = _response(503)
+    provider = GPT4VisionProvider(api_key="test-key", retry_policy=RetryPolicy(max_attempts=3))
+    with pytest.raises(APIError) as exc_info:
+        provider.process_image(b"test_image")
+    assert exc_info.value.status_code == 503
+    assert mock_post.call_count == 3
+
+    mock_post.reset_mock()
+    mock_post.return_value = _response(401)
+    with pytest.raises(APIError) as exc_info:
+        provider.process_image(b"test_image")
+    assert exc_info.value.status_code == 401
+    assert mock_post.call_count == 1
+
+@patch("curb_sign_parser.providers.base.time.sleep")
+@patch("requests.Session.post")
+def test_gpt4_stream_closes_error_responses(mock_post, mock_sleep):
+    """Test a retried 429 on a streamed request releases its connection."""
+    throttled = _response(429, headers={"Retry-After": "1"})
+    throttled.raw = MagicMock()
+    ok = _response(200)
+    ok.raw = io.BytesIO(b'data: {"choices": [{"delta": {"content": "{}"}}]}\n\ndata: [DONE]\n')
+    ok._content = False
+    mock_post.side_effect = [throttled, ok]
+
+    provider = GPT4VisionProvider(api_key="test-key")
+    assert "".join(provider.stream_image(b"test_image")) == "{}"
+    throttled.raw.release_conn.assert_called_once()
+    assert mock_post.call_count == 2
+
+def test_gpt4_stream_rejects_malformed_events():
+    """Test a corrupt stream event raises ParsingError instead of a JSON error."""
+    read = GPT4VisionProvider._read_stream_line
+    assert read(b'data: {"choices": []}') == {"choices": []}
+    assert read("data: [DONE]") is None
+    assert read(": keep-alive") is None
+
+    for line in ('data: {"choices": [', b"data: 42", b"data: \xff"):
+        with pytest.raises(ParsingError):
+            read(line)
+
+def test_parse_retry_after_headers():
+    """Test supported retry header formats."""
+    assert parse_retry_after({"Retry-After": "3"}) == 3
+    assert parse_retry_after({"retry-after-ms": "250"}) == 0.25
+    assert parse_retry_after({"x-ratelimit-reset-requests": "1m30s"}, rate_limited=True) == 90
+    assert parse_retry_after({"x-ratelimit-reset-requests": "1m30s"}) is None
+    assert parse_retry_after({}) is None
+
+def test_token_bucket_rate():
+    """Test the bucket allows a burst and then paces requests."""
+    now = [0.0]
+    bucket = TokenBucket(per_minute=60, capacity=2, clock=lambda: now[0])
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(1.0)
+    now[0] = 5.0
+    assert bucket.reserve() == 0
+
+def test_adaptive_concurrency_aimd():
+    """Test additive increase and multiplicative decrease of the limit."""
+    limiter = AdaptiveConcurrency(initial=4, minimum=1, maximum=8)
+    for _ in range(5):
+        limiter.on_success()
+    assert limiter.limit == 5
+
+    limiter.on_throttle()
+    assert limiter.limit == 2
+
+    assert limiter.try_acquire() and limiter.try_acquire()
+    assert not limiter.try_acquire()
+    limiter.release()
+    assert limiter.try_acquire()
+
+def test_adaptive_concurrency_backs_off_once_per_burst():
+    """Test throttles of requests sent before the last decrease don't shrink the limit again."""
+    limiter = AdaptiveConcurrency(initial=16, minimum=1, maximum=16)
+    tickets = [limiter.acquire() for _ in range(16)]
+    for ticket in tickets:
+        limiter.on_throttle(ticket)
+    assert limiter.limit == 8
+
+    for ticket in tickets:
+        limiter.release()
+    limiter.on_throttle(limiter.acquire())
+    assert limiter.limit == 4
+
+
+def test_adaptive_concurrency_async_waiters_in_order():
+    """Test waiting coroutines get released slots in arrival order, without polling."""
+    import asyncio
+
+    async def scenario():
+        limiter = AdaptiveConcurrency(initial=1, minimum=1, maximum=1)
+        await limiter.acquire_async()
+        order = []
+
+        async def worker(i):
+            await limiter.acquire_async()
+            order.append(i)
+            await asyncio.sleep(0)
+            limiter.release()
+
+        tasks = [asyncio.ensure_future(worker(i)) for i in range(20)]
+        await asyncio.sleep(0)
+        # A cancelled waiter must not take (or leak) a slot
+        tasks[3].cancel()
+        limiter.release()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return order, limiter.in_flight
+
+    order, in_flight = asyncio.run(scenario())
+    assert order == [i for i in range(20) if i != 3]
+    assert in_flight == 0
+
+def test_claude_prompt_caching_reports_usage():
+    """Test the static prefix is marked cacheable and cache token counts are reported."""
+    import httpx
+
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(json.loads(request.content))
+        return httpx.Response(200, json={
+            "id": "msg_1", "type": "message", "role": "assistant", "model": "claude",
+            "content": [{"type": "text", "text": "{}"}],
+            "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {
+                "input_tokens": 1500, "output_tokens": 200,
+                "cache_creation_input_tokens": 0, "cache_read_input_tokens": 1100
+            }
+        })
+
+    reported = []
+    provider = ClaudeProvider(api_key="test-key", prompt_caching=True, usage_callback=reported.append)
+    provider.client._client = httpx.Client(transport=httpx.MockTransport(handler))
+
+    assert provider.process_image(b"test_image") == "{}"
+    assert provider.process_image(b"test_image") == "{}"
+
+    content = requests_seen[0]["messages"][0]["content"]
+    assert content[0]["cache_control"] == {"type": "ephemeral"}
+    assert content[1]["type"] == "image"
+    assert reported[0].cache_read_input_tokens == 1100
+    assert provider.usage.requests == 2
+    assert provider.usage.cache_read_input_tokens == 2200
+
+    uncached = ClaudeProvider(api_key="test-key")._build_request(b"test_image")
+    assert "cache_control" not in json.dumps(uncached)
+
+@patch("requests.Session.post")
+def test_gpt4_prompt_caching_reports_usage(mock_post):
+    """Test the prompt is sent as a leading system message and cached tokens are reported."""
+    mock_post.return_value = _response(200, {
+        "choices": [{"message": {"content": "{}"}}],
+        "usage": {
+            "prompt_tokens": 1800, "completion_tokens": 150,
+            "prompt_tokens_details": {"cached_tokens": 1024}
+        }
+    })
+
+    provider = GPT4VisionProvider(api_key="test-key", prompt_caching=True)
+    assert provider.process_image(b"test_image") == "{}"
+
+    messages = mock_post.call_args.kwargs["json"]["messages"]
+    assert messages[0] == {"role": "system", "content": provider.system_prompt}
+    assert [block["type"] for block in messages[1]["content"]] == ["image_url"]
+    assert provider.usage.cache_read_input_tokens == 1024
+    assert provider.usage.input_tokens == 776
+    assert provider.usage.output_tokens == 150
+
+def test_provider_registry():
+    """Test built-in providers resolve by name and custom providers can be registered."""
+    from curb_sign_parser import CurbSignParser
+    from curb_sign_parser.providers.registry import (
+        available_providers,
+        get_provider_class,
+        register_provider,
+    )
+
+    assert {"claude", "gpt4"} <= set(available_providers())
+    assert get_provider_class("gpt4") is GPT4VisionProvider
+
+    class EchoProvider(GPT4VisionProvider):
+        pass
+
+    register_provider("echo", EchoProvider)
+    register_provider("echo-lazy", "curb_sign_parser.providers.claude:ClaudeProvider")
+    assert isinstance(CurbSignParser(api_key="test-key", provider="echo").provider, EchoProvider)
+    assert get_provider_class("echo-lazy") is ClaudeProvider
+
+    with pytest.raises(ValueError, match="Unsupported provider"):
+        get_provider_class("missing")
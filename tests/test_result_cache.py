@@ -0,0 +1,61 @@
+from curb_sign_parser import CurbSignParser
+from curb_sign_parser.models.data_models import SignData
+from curb_sign_parser.providers.claude import ClaudeProvider
+from curb_sign_parser.storage.result_cache import ResultCache
+
+
+def test_cache_key_depends_on_request():
+    """Test cache keys change with image bytes, model and prompt."""
+    provider = ClaudeProvider(api_key="test-key")
+    key = ResultCache.make_key(b"image", provider)
+
+    assert key == ResultCache.make_key(b"image", provider)
+    assert key != ResultCache.make_key(b"other", provider)
+
+    other_model = ClaudeProvider(api_key="test-key", model="claude-3-haiku-20240307")
+    assert key != ResultCache.make_key(b"image", other_model)
+
+def test_cache_hit_miss_and_persistence(tmp_path):
+    """Test cache counters and that entries survive reopening."""
+    path = tmp_path / "cache.sqlite"
+    with ResultCache(path) as cache:
+        assert cache.get("k") is None
+        cache.put("k", '{"policies": []}')
+        assert cache.get("k") == '{"policies": []}'
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    with ResultCache(path) as cache:
+        assert cache.get("k") == '{"policies": []}'
+        assert cache.stats.entries == 1
+
+def test_cache_lru_eviction(tmp_path):
+    """Test least recently used entries are evicted over the size budget."""
+    with ResultCache(tmp_path / "cache.sqlite", max_size_bytes=20) as cache:
+        cache.put("a", "x" * 8)
+        cache.put("b", "y" * 8)
+        cache.get("a")
+        cache.put("c", "z" * 8)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "x" * 8
+        assert cache.get("c") == "z" * 8
+        assert cache.stats.evictions == 1
+        assert cache.stats.size_bytes == 16
+
+def test_parse_sign_uses_cache(tmp_path, mock_claude_provider, test_image_path):
+    """Test repeated parses of the same image skip the provider."""
+    mock_claude_provider.system_prompt = "prompt"
+    mock_claude_provider.model = "model"
+
+    with ResultCache(tmp_path / "cache.sqlite") as cache:
+        parser = CurbSignParser(api_key="test-key", cache=cache)
+        parser.provider = mock_claude_provider
+
+        first = parser.parse_sign(test_image_path)
+        second = parser.parse_sign(test_image_path)
+
+        assert isinstance(second, SignData)
+        assert second.policies[0].rules == first.policies[0].rules
+        assert mock_claude_provider.process_image.call_count == 1
+        assert cache.stats.hits == 1
@@ -0,0 +1,129 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from curb_sign_parser.models.data_models import SignData
+from curb_sign_parser.query.schedule import (
+    MINUTES_PER_WEEK,
+    ScheduleEvaluator,
+    minute_of_week,
+    span_intervals,
+)
+
+MON, FRI, SAT, SUN = 0, 4, 5, 6
+
+
+def _at(day, hour, minute=0):
+    return day * 24 * 60 + hour * 60 + minute
+
+
+def _policy(days, start, end, activity, priority=None, **rule):
+    return {
+        "priority": priority,
+        "time_spans": [{"days_of_week": days, "time_of_day_start": start, "time_of_day_end": end}],
+        "rules": [{"activity": activity, **rule}],
+    }
+
+
+@pytest.fixture
+def evaluator():
+    signs = [
+        SignData(policies=[
+            _policy(["mon", "tue", "wed", "thu", "fri"], "08:00", "18:00", "paid_parking", priority=2,
+                    max_stay=120, rate={"rate": 2.5, "rate_unit": "hour", "rate_unit_period": "rolling"}),
+            _policy(["mon", "tue", "wed", "thu", "fri"], "07:00", "09:00", "no_parking", priority=1),
+            {"rules": [{"activity": "parking"}]},
+        ]),
+        # Overnight, and running past Sunday midnight
+        SignData(policies=[_policy(["fri", "sun"], "22:00", "06:00", "no_parking")]),
+        SignData(policies=[]),
+    ]
+    return ScheduleEvaluator.from_sign_data(signs)
+
+
+def test_minute_of_week():
+    assert minute_of_week(datetime(2024, 5, 13, 0, 0)) == 0  # a Monday
+    assert minute_of_week(datetime(2024, 5, 19, 23, 59)) == MINUTES_PER_WEEK - 1
+    times = np.array(["2024-05-13T00:00", "2024-05-15T12:30", "1970-01-01T00:00"], dtype="datetime64[m]")
+    assert minute_of_week(times).tolist() == [0, _at(2, 12, 30), _at(3, 0)]
+
+
+def test_span_intervals_overnight_and_wrap():
+    spans, start, end = span_intervals(np.array([1 << SUN, 1 << MON]), np.array([22 * 60, 480]), np.array([360, 1439]))
+
+    intervals = sorted(zip(spans.tolist(), start.tolist(), end.tolist()))
+    assert intervals == [
+        (0, 0, 360),
+        (0, _at(SUN, 22), MINUTES_PER_WEEK),
+        (1, 480, 24 * 60),
+    ]
+
+
+def test_priority_and_fallback(evaluator):
+    """Test the lowest priority number wins and unscheduled policies fill gaps."""
+    slots = evaluator.evaluate([_at(MON, 7, 30), _at(MON, 8, 30), _at(MON, 12), _at(SAT, 12)], signs=[0])
+
+    assert slots.activity_names()[0].tolist() == ["no_parking", "no_parking", "paid_parking", "parking"]
+    assert slots.max_stay[0].tolist() == [-1, -1, 120, -1]
+    assert slots.rate[0, 2] == 2.5
+    assert np.isnan(slots.rate[0, 3])
+
+
+def test_overnight_spans(evaluator):
+    minutes = [_at(FRI, 23), _at(SAT, 5, 59), _at(SAT, 6), _at(SUN, 23), _at(MON, 3), _at(MON, 12)]
+    slots = evaluator.evaluate(minutes, signs=[1, 2])
+
+    assert slots.activity_names()[0].tolist() == ["no_parking"] * 2 + [None] + ["no_parking"] * 2 + [None]
+    assert (slots.policy[1] == -1).all()
+
+
+def test_heatmap_matches_scalar_evaluation():
+    """Test vectorized results against a per-slot brute-force evaluation."""
+    rng = np.random.default_rng(0)
+    days = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+    signs = []
+    for _ in range(50):
+        policies = []
+        for priority in rng.permutation(3)[: rng.integers(1, 4)]:
+            start, end = rng.integers(0, 24, 2) * 60
+            policies.append(_policy(
+                [d for d in days if rng.random() < 0.5] or ["mon"],
+                f"{start // 60:02d}:00", f"{end // 60:02d}:00", f"activity_{priority}", int(priority),
+            ))
+        signs.append(SignData(policies=policies))
+
+    slots = ScheduleEvaluator.from_sign_data(signs).heatmap()
+    names = slots.activity_names()
+
+    for sign_index, sign in enumerate(signs):
+        for slot in range(168):
+            day, hour = divmod(slot, 24)
+            winner = None
+            for policy in sorted(sign.policies, key=lambda p: p.priority):
+                span = policy.time_spans[0]
+                start, end = int(span.time_of_day_start[:2]), int(span.time_of_day_end[:2])
+                if end > start:
+                    on = days[day] in span.days_of_week and start <= hour < end
+                else:
+                    on = (days[day] in span.days_of_week and hour >= start) \
+                        or (days[day - 1] in span.days_of_week and hour < end)
+                if on:
+                    winner = policy.rules[0].activity
+                    break
+            assert names[sign_index, slot] == winner, (sign_index, slot)
+
+
+def test_unpacked_signs_are_flagged(caplog):
+    """Test signs stored whole are reported as skipped rather than silently unregulated."""
+    signs = [
+        SignData(policies=[_policy(["mon"], "08:00", "18:00", "no_parking")]),
+        SignData(last_updated=2 ** 70, policies=[_policy(["mon"], "08:00", "18:00", "no_parking")]),
+    ]
+    evaluator = ScheduleEvaluator.from_sign_data(signs)
+
+    assert evaluator.skipped.tolist() == [False, True]
+    assert "1 of 2 signs" in caplog.text
+    slots = evaluator.evaluate([_at(MON, 12)], signs=[1, 0])
+    assert slots.skipped.tolist() == [True, False]
+    assert slots.activity_names()[:, 0].tolist() == [None, "no_parking"]
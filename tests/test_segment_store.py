@@ -0,0 +1,133 @@
+import os
+
+import pytest
+
+from curb_sign_parser.models.data_models import SignData
+from curb_sign_parser.storage.segment_store import INDEX_DTYPE, SegmentStore
+from curb_sign_parser.utils.exceptions import ConfigurationError, ValidationError
+
+
+def _sign(i):
+    return SignData(
+        last_updated=1700000000000 + i,
+        location={"type": "Point", "coordinates": [-73.985 + i * 1e-5, 40.758]},
+        policies=[{
+            "curb_policy_id": f"policy-{i}",
+            "published_date": 1700000000000,
+            "priority": i % 3,
+            "time_spans": [{"days_of_week": ["mon", "fri"], "time_of_day_start": "08:00", "time_of_day_end": "18:00"}],
+            "rules": [{"activity": "paid_parking", "max_stay": 120,
+                       "rate": {"rate": 2.5, "rate_unit": "hour", "rate_unit_period": "rolling"}}],
+        }],
+    )
+
+
+def test_put_get_roundtrip(tmp_path):
+    with SegmentStore(tmp_path / "store") as store:
+        assert store.put_many((f"key-{i}", _sign(i)) for i in range(100)) == 100
+        assert store.get("key-42") == _sign(42)
+        assert store.get("missing") is None
+        assert "key-7" in store and "missing" not in store
+        assert len(store) == 100
+
+    # Reopening reads everything back from disk
+    with SegmentStore(tmp_path / "store", readonly=True) as store:
+        assert store.get("key-99") == _sign(99)
+        assert list(store.items()) == [(f"key-{i}", _sign(i)) for i in range(100)]
+
+
+def test_overwrite_and_delete(tmp_path):
+    with SegmentStore(tmp_path) as store:
+        store.put("a", _sign(1))
+        store.put("b", _sign(2))
+        store.put("a", _sign(3))
+        assert store.delete("b")
+        assert not store.delete("b")
+
+        assert store.get("a") == _sign(3)
+        assert store.get("b") is None
+        assert [key for key, _ in store.items()] == ["a"]
+
+
+def test_reader_sees_appends_and_compaction(tmp_path):
+    """Test a reader opened alongside the writer follows appends and compaction."""
+    writer = SegmentStore(tmp_path, segment_bytes=4096)
+    reader = SegmentStore(tmp_path, readonly=True)
+    assert len(reader) == 0
+
+    writer.put_many((f"key-{i % 20}", _sign(i)) for i in range(200))
+    assert reader.get("key-5") == _sign(185)
+    assert writer.stats.segments > 1
+
+    stats = writer.stats
+    reclaimed = writer.compact()
+    assert reclaimed > 0
+    assert writer.stats.size_bytes == stats.live_bytes == writer.stats.live_bytes
+    assert not (tmp_path / "segment-000000.log").exists()
+
+    writer.put("key-new", _sign(1000))
+    reader.refresh()
+    assert len(reader) == 21
+    assert reader.get("key-19") == _sign(199)
+    assert reader.get("key-new") == _sign(1000)
+
+    with pytest.raises(ConfigurationError):
+        reader.put("key", _sign(0))
+    writer.close()
+    reader.close()
+
+
+def test_single_writer(tmp_path):
+    with SegmentStore(tmp_path):
+        with pytest.raises(ConfigurationError):
+            SegmentStore(tmp_path)
+
+
+def test_recovers_from_torn_writes(tmp_path):
+    """Test a partial index entry and unindexed record bytes are dropped on open."""
+    with SegmentStore(tmp_path) as store:
+        store.put("a", _sign(1))
+    with open(tmp_path / "segment-000000.log", "ab") as segment:
+        segment.write(b"partial record")
+    with open(tmp_path / "index", "ab") as index:
+        index.write(b"\0" * (INDEX_DTYPE.itemsize // 2))
+
+    with SegmentStore(tmp_path) as store:
+        store.put("b", _sign(2))
+        assert store.get("a") == _sign(1)
+        assert store.get("b") == _sign(2)
+    assert os.path.getsize(tmp_path / "index") == 2 * INDEX_DTYPE.itemsize
+
+
+def test_detects_corruption(tmp_path):
+    with SegmentStore(tmp_path) as store:
+        store.put("a", _sign(1))
+    path = tmp_path / "segment-000000.log"
+    data = bytearray(path.read_bytes())
+    data[-5] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with SegmentStore(tmp_path, readonly=True) as store:
+        with pytest.raises(ValidationError):
+            store.get("a")
+
+
+def test_zstd_compression(tmp_path):
+    pytest.importorskip("zstandard")
+    with SegmentStore(tmp_path / "plain") as plain, \
+            SegmentStore(tmp_path / "zstd", compression="zstd") as compressed:
+        for store in (plain, compressed):
+            store.put_many((f"key-{i}", _sign(i)) for i in range(50))
+        assert compressed.get("key-3") == _sign(3)
+        assert compressed.stats.size_bytes < plain.stats.size_bytes
+
+        # Compressed records are copied as-is by compaction
+        compressed.put("key-3", _sign(300))
+        compressed.compact()
+        assert compressed.get("key-3") == _sign(300)
+        assert len(list(compressed)) == 50
+
+
+def test_unknown_compression(tmp_path):
+    with pytest.raises(ConfigurationError):
+        SegmentStore(tmp_path, compression="lz4")
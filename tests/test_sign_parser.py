@@ -1,6 +1,10 @@
 import pytest
+import asyncio
 import json
-from curb_sign_parser import CurbSignParser
+import time
+from curb_sign_parser import AsyncCurbSignParser, CurbSignParser, ParsingError
+from curb_sign_parser.parser import IncrementalPolicyParser
+from curb_sign_parser.testing import FakeProviderServer
 from curb_sign_parser.models.data_models import SignData
 from curb_sign_parser.providers.claude import ClaudeProvider
 from curb_sign_parser.providers.gpt4 import GPT4VisionProvider
@@ -44,4 +48,163 @@ def test_parse_sign_success(mock_provider, mock_processor):
     result = parser.parse_sign("test.jpg")
     
     assert isinstance(result, SignData)
-    assert len(result.policies) == 1
\ No newline at end of file
+    assert len(result.policies) == 1
+def test_parse_batch_isolates_failures(parser_with_claude, test_image_path, tmp_path):
+    """Test that one bad image does not abort a batch."""
+    missing = str(tmp_path / "missing.jpg")
+    results = parser_with_claude.parse_batch([test_image_path, missing, test_image_path], max_workers=2)
+
+    assert len(results) == 3
+    assert isinstance(results[0], SignData)
+    assert isinstance(results[1], FileNotFoundError)
+    assert isinstance(results[2], SignData)
+
+def test_parse_iter_bounds_in_flight(parser_with_claude, test_image_path):
+    """Test that parse_iter never exceeds max_in_flight submitted jobs."""
+    import threading
+    import time
+
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+    response = parser_with_claude.provider.process_image.return_value
+
+    def slow_process(image_data):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.01)
+        with lock:
+            state["active"] -= 1
+        return response
+
+    parser_with_claude.provider.process_image.side_effect = slow_process
+    results = list(parser_with_claude.parse_iter([test_image_path] * 10, max_workers=4, max_in_flight=3))
+
+    assert len(results) == 10
+    assert all(path == test_image_path and isinstance(r, SignData) for path, r in results)
+    assert state["peak"] <= 3
+
+def test_parse_iter_rejects_empty_window(parser_with_claude, test_image_path):
+    """Test an explicit max_in_flight of 0 is rejected rather than defaulted."""
+    with pytest.raises(ValueError):
+        list(parser_with_claude.parse_iter([test_image_path], max_in_flight=0))
+
+def test_parse_sign_reuses_near_duplicates(parser_with_claude, test_image_path):
+    """Test near-duplicate images skip the provider."""
+    from curb_sign_parser.processors.image_processor import PerceptualHashIndex
+
+    parser_with_claude.duplicate_index = PerceptualHashIndex(max_distance=6)
+    first = parser_with_claude.parse_sign(test_image_path)
+    second = parser_with_claude.parse_sign(test_image_path)
+
+    assert parser_with_claude.provider.process_image.call_count == 1
+    assert second.policies[0].rules == first.policies[0].rules
+    assert second is not first
+
+def test_parse_pipelined(parser_with_claude, test_image_path, test_image_bytes, tmp_path):
+    """Test process-pool preprocessing feeds provider calls and isolates failures."""
+    missing = str(tmp_path / "missing.jpg")
+    sources = [test_image_path, missing, test_image_bytes]
+
+    results = list(parser_with_claude.parse_pipelined(sources, processes=2, max_workers=2, queue_size=1))
+
+    assert len(results) == 3
+    by_source = {id(source): result for source, result in results}
+    assert isinstance(by_source[id(test_image_path)], SignData)
+    assert isinstance(by_source[id(test_image_bytes)], SignData)
+    assert isinstance(by_source[id(missing)], FileNotFoundError)
+    assert parser_with_claude.provider.process_image.call_count == 2
+
+POLICIES_RESPONSE = json.dumps({
+    "version": "1.0",
+    "policies": [
+        {"rules": [{"activity": "parking", "max_stay": 60}],
+         "time_spans": [{"days": ["MON"], "start_time": "08:00", "end_time": "18:00"}]},
+        {"activity": "no_parking", "note": "brace } and quote \" in a string"}
+    ]
+})
+
+def test_incremental_parser_emits_policies_as_they_close():
+    """Test each policy is returned by the chunk that closes it, whatever the chunking."""
+    for size in (1, 3, 7, len(POLICIES_RESPONSE)):
+        decoder = IncrementalPolicyParser()
+        emitted = []
+        for start in range(0, len(POLICIES_RESPONSE), size):
+            for policy in decoder.feed(POLICIES_RESPONSE[start:start + size]):
+                emitted.append((start + size, policy))
+        emitted += [(None, policy) for policy in decoder.close()]
+
+        assert [policy for _, policy in emitted] == json.loads(POLICIES_RESPONSE)["policies"]
+        # The first policy is returned by the chunk holding its closing brace
+        first_close = POLICIES_RESPONSE.index('}, {"activity": "no_parking"') + 1
+        assert first_close <= emitted[0][0] < first_close + size
+
+@pytest.mark.parametrize("text", [
+    "Here is the JSON you asked for",
+    "```json\n{}",
+    '{"policies": [}',
+    '{"policies" "x"}',
+    '{} trailing',
+    '{"max_stay": 12abc}',
+])
+def test_incremental_parser_rejects_invalid_json_early(text):
+    """Test invalid text fails as soon as it arrives, not at the end of the stream."""
+    decoder = IncrementalPolicyParser()
+    with pytest.raises(ParsingError):
+        decoder.feed(text)
+        decoder.feed(" ")
+
+def test_incremental_parser_rejects_truncated_response():
+    """Test a response cut off mid-document fails on close."""
+    decoder = IncrementalPolicyParser()
+    assert decoder.feed('{"policies": [{"activity": "parking"}, {"activ') == [{"activity": "parking"}]
+    with pytest.raises(ParsingError):
+        decoder.close()
+
+@pytest.mark.parametrize("provider", ["claude", "gpt4"])
+def test_streaming_parse(provider, test_image_path):
+    """Test streamed parses match non-streamed ones and yield policies incrementally."""
+    with FakeProviderServer(responses=POLICIES_RESPONSE, stream_chunk_chars=5) as server:
+        base_url = server.url if provider == "claude" else server.openai_url
+        parser = CurbSignParser(api_key="test-key", provider=provider, base_url=base_url, stream=True)
+
+        policies = list(parser.iter_policies(test_image_path))
+        sign_data = parser.parse_sign(test_image_path)
+
+    assert [p.rules[0].activity for p in policies] == ["parking", "no_parking"]
+    assert [p.curb_policy_id for p in sign_data.policies] == [p.curb_policy_id for p in policies]
+    assert sign_data.policies[0].rules[0].max_stay == 60
+    assert parser.provider.usage.requests == 2
+    assert parser.provider.usage.output_tokens == 400
+
+@pytest.mark.parametrize("provider", ["claude", "gpt4"])
+def test_streaming_aborts_invalid_response(provider, test_image_path):
+    """Test generation is abandoned once the stream cannot be JSON."""
+    garbage = "I'm sorry, I can't read this sign. " * 200
+    with FakeProviderServer(responses=garbage, stream_interval=0.001) as server:
+        base_url = server.url if provider == "claude" else server.openai_url
+        parser = CurbSignParser(api_key="test-key", provider=provider, base_url=base_url, stream=True)
+
+        with pytest.raises(ParsingError):
+            list(parser.iter_policies(test_image_path))
+        sign_data = parser.parse_sign(test_image_path)
+        time.sleep(0.2)
+        stats = server.stats
+
+    assert sign_data.policies == []
+    assert stats["aborted"] == 2
+
+def test_async_streaming_parse(test_image_path):
+    """Test the async parser streams policies from the provider."""
+    async def run():
+        async with AsyncCurbSignParser(
+            api_key="test-key", base_url=server.url, stream=True
+        ) as parser:
+            policies = [policy async for policy in parser.iter_policies(test_image_path)]
+            return policies, await parser.parse_sign(test_image_path)
+
+    with FakeProviderServer(responses=POLICIES_RESPONSE, stream_chunk_chars=5) as server:
+        policies, sign_data = asyncio.run(run())
+
+    assert len(policies) == 2
+    assert sign_data.policies[1].rules[0].activity == "no_parking"
@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from curb_sign_parser.models.data_models import SignData
+from curb_sign_parser.query import RegulationIndex
+from curb_sign_parser.query.spatial_index import haversine_m
+
+# A Wednesday
+WEDNESDAY_NOON = datetime(2024, 5, 15, 12, 0)
+ORIGIN = (-73.985, 40.758)
+
+
+def _sign(lon, lat, policies):
+    return SignData(location={"coordinates": [lon, lat]}, policies=policies)
+
+
+def _policy(days, start, end, activity, priority=None, **rule):
+    return {
+        "priority": priority,
+        "time_spans": [{"days_of_week": days, "time_of_day_start": start, "time_of_day_end": end}],
+        "rules": [{"activity": activity, **rule}],
+    }
+
+
+@pytest.fixture
+def index():
+    lon, lat = ORIGIN
+    weekdays = ["mon", "tue", "wed", "thu", "fri"]
+    signs = [
+        _sign(lon, lat, [
+            _policy(weekdays, "08:00", "18:00", "paid_parking", priority=2, max_stay=120),
+            _policy(weekdays, "07:00", "09:00", "no_parking", priority=1),
+        ]),
+        # ~30 m north
+        _sign(lon, lat + 0.00027, [{"rules": [{"activity": "loading", "max_stay": 15}]}]),
+        # ~1 km east
+        _sign(lon + 0.0119, lat, [_policy(weekdays, "00:00", "23:59", "no_stopping")]),
+        SignData(policies=[{"rules": [{"activity": "parking"}]}]),
+    ]
+    return RegulationIndex.from_sign_data(signs, cell_meters=100)
+
+
+def test_nearby_within_radius(index):
+    signs, distances = index.nearby(*ORIGIN, radius_m=50)
+
+    assert signs.tolist() == [0, 1]
+    assert distances[0] == pytest.approx(0, abs=1e-6)
+    assert distances[1] == pytest.approx(30, abs=1)
+    assert len(index) == 3
+
+
+def test_query_time_and_priority(index):
+    """Test only policies in effect are returned, nearest sign first."""
+    matches = index.query(*ORIGIN, radius_m=50, at=WEDNESDAY_NOON)
+
+    assert [(m.sign_index, m.rule.activity) for m in matches] == [(0, "paid_parking"), (1, "loading")]
+    assert matches[0].rule.max_stay == 120
+
+
+def test_query_orders_policies_by_priority(index):
+    matches = index.query(*ORIGIN, radius_m=10, at=WEDNESDAY_NOON.replace(hour=8, minute=30))
+    assert [m.rule.activity for m in matches] == ["no_parking", "paid_parking"]
+
+
+def test_query_filters_activity(index):
+    assert index.query(*ORIGIN, radius_m=50, at=WEDNESDAY_NOON, activity="loading")[0].sign_index == 1
+    assert index.query(*ORIGIN, radius_m=50, at=WEDNESDAY_NOON, activity="unknown") == []
+
+
+def test_end_of_day_span_covers_last_minute(index):
+    east = (ORIGIN[0] + 0.0119, ORIGIN[1])
+    assert index.query(*east, radius_m=10, at=WEDNESDAY_NOON.replace(hour=23, minute=59))
+    assert index.query(*east, radius_m=10, at=datetime(2024, 5, 18, 12, 0)) == []
+
+
+def test_nearby_matches_linear_scan():
+    """Test the grid finds exactly the signs a brute-force scan finds."""
+    rng = np.random.default_rng(0)
+    lons = ORIGIN[0] + rng.uniform(-0.05, 0.05, 2000)
+    lats = ORIGIN[1] + rng.uniform(-0.05, 0.05, 2000)
+    index = RegulationIndex.from_sign_data(
+        [_sign(lon, lat, [{"rules": [{"activity": "parking"}]}]) for lon, lat in zip(lons, lats)],
+        cell_meters=200,
+    )
+
+    for lon, lat, radius in [(*ORIGIN, 300), (ORIGIN[0] + 0.03, ORIGIN[1] - 0.02, 1000), (0.0, 0.0, 500)]:
+        expected = np.flatnonzero(haversine_m(lon, lat, lons, lats) <= radius)
+        signs, _ = index.nearby(lon, lat, radius)
+        assert sorted(signs.tolist()) == expected.tolist()
@@ -1,4 +1,4 @@
-from curb_sign_parser.models.data_models import Location
+from curb_sign_parser.models.data_models import Location, TimeSpan
 from curb_sign_parser.utils.validators import Validators
 
 
@@ -14,6 +14,21 @@ def test_validate_days():
     assert Validators.validate_days(["MON", "TUE"]) is True
     assert Validators.validate_days(["INVALID"]) is False
 
+def test_validate_time_span():
+    """Test time span validation, including overnight spans."""
+    assert Validators.validate_time_span(TimeSpan(
+        days_of_week=["mon", "tue"], time_of_day_start="09:00", time_of_day_end="17:00"
+    )) is True
+    assert Validators.validate_time_span(TimeSpan(
+        days_of_week=["fri"], time_of_day_start="22:00", time_of_day_end="06:00"
+    )) is True
+    assert Validators.validate_time_span(TimeSpan(
+        days_of_week=["someday"], time_of_day_start="09:00", time_of_day_end="17:00"
+    )) is False
+    assert Validators.validate_time_span(TimeSpan(
+        days_of_week=["mon"], time_of_day_start="noon", time_of_day_end="17:00"
+    )) is False
+
 def test_validate_location():
     """Test location coordinate validation."""
     valid_location = Location(type="Point", coordinates=[-73.9857, 40.7484])